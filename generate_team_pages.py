@@ -96,6 +96,7 @@ HTML_TEMPLATE = """<!DOCTYPE html>
         window.TARGET_TEAM_NAME = "{team_name}";
     </script>
 
+    <script src="../../scripts/player_core.js"></script>
     <script src="../../mlb_starting_lineup.js"></script>
 </body>
 </html>
@@ -140,7 +140,7 @@ document.addEventListener("DOMContentLoaded", async () => {
     try {
         const res = await fetch(`/data/daily_files/games_${todayStr}.json?v=${new Date().getTime()}`);
         if (!res.ok) throw new Error("Daily slate JSON not found.");
-        dailySlateData = await res.json();
+        dailySlateData = await expandDeepStats(await res.json(), "/data/daily_files/");
     } catch (err) {
         console.warn("Could not load local JSON slate:", err);
     }
@@ -317,7 +317,7 @@ async function renderTeamPage() {
         try {
             const res = await fetch(`/data/daily_files/games_${tmrwStr}.json?v=${new Date().getTime()}`);
             if (res.ok) {
-                const tmrwData = await res.json();
+                const tmrwData = await expandDeepStats(await res.json(), "/data/daily_files/");
                 result = findGameInSlate(tmrwData, currentTargetId);
                 if (result.targetGame) {
                     isFutureGame = true;
@@ -333,7 +333,7 @@ async function renderTeamPage() {
         try {
             const res = await fetch(`/data/daily_files/games_${nextDayStr}.json?v=${new Date().getTime()}`);
             if (res.ok) {
-                const nextData = await res.json();
+                const nextData = await expandDeepStats(await res.json(), "/data/daily_files/");
                 result = findGameInSlate(nextData, currentTargetId);
                 if (result.targetGame) {
                     isFutureGame = true;
@@ -183,7 +183,7 @@ async function init(dateToFetch, isSilentRefresh = false) {
         const response = await fetch(`data/daily_files/games_${dateToFetch}.json?v=` + new Date().getTime());
         if (!response.ok) throw new Error("Local JSON not found");
         
-        const rawData = await response.json();
+        const rawData = await expandDeepStats(await response.json(), "data/daily_files/");
 
         if (Array.isArray(rawData)) {
             ALL_GAMES_DATA = rawData;
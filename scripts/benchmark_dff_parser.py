@@ -0,0 +1,160 @@
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+import requests
+from bs4 import BeautifulSoup
+
+import dff_stream_parser
+
+# ==========================================================
+# --- DFF PAGE PARSER MICRO-BENCHMARK ---
+# ==========================================================
+# Compares the old BeautifulSoup full-DOM parse (rows + slate discovery + the
+# page_source regex pass) against dff_stream_parser on saved projection pages.
+# Each fixture page is committed with a .expected.json of what the soup parse
+# extracted from it, so the streaming parser is checked even where bs4 is gone.
+#
+#   python scripts/benchmark_dff_parser.py --capture 2026-04-01   # save live pages (+ expected output) as fixtures
+#   python scripts/benchmark_dff_parser.py --synthetic            # offline stand-in pair shaped like DFF markup
+#   python scripts/benchmark_dff_parser.py                        # benchmark every saved fixture
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(SCRIPT_DIR, 'fixtures', 'dff')
+PLATFORMS = ['fanduel', 'draftkings']
+
+def capture_fixtures(date_str):
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    headers = {'User-Agent': 'Mozilla/5.0'}
+    for platform in PLATFORMS:
+        url = f"https://www.dailyfantasyfuel.com/mlb/projections/{platform}/{date_str}"
+        res = requests.get(url, headers=headers, timeout=15)
+        # A block page or an empty slate would make a fixture pair that checks nothing
+        if res.status_code != 200 or not parse_with_soup(res.text)[0]:
+            print(f"Skipped {url}: HTTP {res.status_code}, no projection rows")
+            continue
+        path = os.path.join(FIXTURES_DIR, f"{platform}_{date_str}.html")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(res.text)
+        write_expected(path, res.text)
+        print(f"Saved {path} ({len(res.text) / 1024:.0f} KB)")
+
+def expected_path(fixture_path):
+    return fixture_path[:-len('.html')] + '.expected.json'
+
+def write_expected(fixture_path, html_text):
+    """Records what the reference soup parse extracts from a fixture page."""
+    rows, slate_ids, labels = parse_with_soup(html_text)
+    sections = {"rows": rows, "slate_ids": sorted(slate_ids), "labels": [list(l) for l in labels]}
+    with open(expected_path(fixture_path), 'w', encoding='utf-8') as f:
+        # One row / id / label per line
+        f.write("{\n" + ",\n".join(f'"{key}": [\n' + ",\n".join(json.dumps(v) for v in values) + "\n]"
+                                   for key, values in sections.items()) + "\n}\n")
+
+def load_expected(fixture_path):
+    path = expected_path(fixture_path)
+    if not os.path.exists(path): return None
+    with open(path, 'r', encoding='utf-8') as f:
+        expected = json.load(f)
+    return expected["rows"], set(expected["slate_ids"]), [tuple(l) for l in expected["labels"]]
+
+def write_synthetic_fixture(rows=320, slates=8):
+    """Builds a page with the same row/slate markup as DFF plus filler chrome, for offline runs."""
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    teams = ['nyy', 'bos', 'lad', 'sf', 'atl', 'nym', 'hou', 'sea', 'chw', 'tor']
+    slate_ids = [f"s{i:04d}" for i in range(slates)]
+    parts = ["<html><head><script>var cfg = {url: '?slate=s0000'};</script><style>.slate-nav { color: red; }</style></head><body>"]
+    parts.append("<nav>" + "".join(f"<div class='menu'><a href='/mlb/{i}'>Link {i}</a></div>" for i in range(200)) + "</nav>")
+    parts.append("<select>" + "".join(f"<option value='{sid}'{' selected' if i == 0 else ''}>FD Slate {i} Main</option>" for i, sid in enumerate(slate_ids)) + "</select>")
+    parts.append("".join(f"<a href='?slate={sid}' data-slate='{sid}'><span>Slate</span> {i}</a>" for i, sid in enumerate(slate_ids)))
+    # Nested text frames: a slate card around its link and options, with a script inside the link
+    parts.append(f"<div data-slate='{slate_ids[1]}'><b>Card</b> <a href='?slate={slate_ids[1]}'>Open <script>track('slate=s9999')</script>now</a>"
+                 f"<select><option value='{slate_ids[2]}'>Late</option><option value='{slate_ids[3]}'>Turbo</option></select> end</div>")
+    parts.append("<table><tbody>")
+    for i in range(rows):
+        pos = 'P' if i % 9 == 0 else 'OF'
+        parts.append(
+            f"<tr class='projections-listing' data-team='{teams[i % len(teams)]}' data-name='Player {i} Name' "
+            f"data-salary='{2000 + i * 10}' data-ppg_proj='{i % 17}.4' data-value_proj='{i % 5}.12' data-pos='{pos}' data-pos_alt='' data-id='{i}'>"
+            + "".join(f"<td class='col-{c}'><span>{c * i}</span></td>" for c in range(14)) + "</tr>"
+        )
+    parts.append("</tbody></table></body></html>")
+    path = os.path.join(FIXTURES_DIR, "synthetic_projections.html")
+    html_text = "\n".join(parts)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(html_text)
+    write_expected(path, html_text)
+    print(f"Saved {path}")
+
+def parse_with_soup(html_text):
+    soup = BeautifulSoup(html_text, 'html.parser')
+    rows = [{k: v for k, v in row.attrs.items() if k.startswith('data-')} for row in soup.find_all('tr', class_='projections-listing')]
+    slate_ids = set()
+    labels = []
+    for opt in soup.find_all('option'):
+        slate_ids.add(opt.get('value', ''))
+        labels.append(('option', opt.get('value', ''), opt.get_text(separator=" ", strip=True)))
+    for el in soup.find_all(attrs={"data-slate": True}):
+        slate_ids.add(el.get("data-slate", ""))
+        labels.append(('data_slate', el.get("data-slate", ""), el.get_text(separator=" ", strip=True)))
+    for a in soup.find_all('a', href=True):
+        match = re.search(r'slate=([a-zA-Z0-9]{5})', a['href'])
+        if match:
+            slate_ids.add(match.group(1))
+            labels.append(('link', match.group(1), a.get_text(separator=" ", strip=True)))
+    slate_ids.update(re.findall(r'slate=["\']?([a-zA-Z0-9]{5})', html_text))
+    return rows, {s for s in slate_ids if re.match(r'^[a-zA-Z0-9]{5}$', s)}, sorted(labels)
+
+def parse_with_stream(html_text):
+    page = dff_stream_parser.extract_projection_page(html_text)
+    slate_ids = {item[0] for key in ("option", "data_slate", "link", "slate_ref") for item in page[key]}
+    labels = sorted((key, item[0], item[1]) for key in ("option", "data_slate", "link") for item in page[key])
+    return page["rows"], {s for s in slate_ids if re.match(r'^[a-zA-Z0-9]{5}$', s)}, labels
+
+def measure(parser, html_text, repeats):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        result = parser(html_text)
+    elapsed_ms = (time.perf_counter() - started) / repeats * 1000
+
+    tracemalloc.start()
+    parser(html_text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed_ms, peak / 1024 / 1024
+
+def run_benchmark(repeats):
+    fixtures = sorted(f for f in os.listdir(FIXTURES_DIR) if f.endswith('.html')) if os.path.isdir(FIXTURES_DIR) else []
+    if not fixtures:
+        print(f"No fixtures in {FIXTURES_DIR}. Capture some first with --capture YYYY-MM-DD.")
+        return 1
+
+    print(f"{'fixture':<32}{'rows':>6}{'soup ms':>10}{'stream ms':>11}{'soup MB':>10}{'stream MB':>11}  match  expected")
+    status = 0
+    for name in fixtures:
+        path = os.path.join(FIXTURES_DIR, name)
+        with open(path, 'r', encoding='utf-8') as f:
+            html_text = f.read()
+        soup_result, soup_ms, soup_mb = measure(parse_with_soup, html_text, repeats)
+        stream_result, stream_ms, stream_mb = measure(parse_with_stream, html_text, repeats)
+        expected = load_expected(path)
+        match = "yes" if soup_result == stream_result else "NO"
+        matches_expected = "-" if expected is None else ("yes" if expected == stream_result else "NO")
+        if "NO" in (match, matches_expected): status = 1
+        print(f"{name:<32}{len(stream_result[0]):>6}{soup_ms:>10.1f}{stream_ms:>11.1f}{soup_mb:>10.1f}{stream_mb:>11.1f}  {match:<5}  {matches_expected}")
+    return status
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark DFF projection page parsing.")
+    parser.add_argument("--capture", metavar="DATE", help="save the live FanDuel/DraftKings projection pages for DATE as fixtures")
+    parser.add_argument("--synthetic", action="store_true", help="write an offline stand-in fixture")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.capture:
+        capture_fixtures(args.capture)
+    if args.synthetic:
+        write_synthetic_fixture()
+    sys.exit(run_benchmark(args.repeats))
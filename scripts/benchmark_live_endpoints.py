@@ -0,0 +1,195 @@
+import os
+import sys
+import gzip
+import json
+import time
+import random
+import argparse
+import requests
+
+import scrape_mlb_live
+import live_feed_store
+
+# ==========================================================
+# --- LIVE SCRAPER ENDPOINT COMPARISON ---
+# ==========================================================
+# Compares what scrape_mlb_live.py pays per game for the full /feed/live document
+# against the boxscore source (/boxscore + /linescore + the fields= filtered
+# current play). Reports raw and gzipped bytes, the fetch latency recorded at
+# capture time, and the decode + build_game_obj time. It also checks that both
+# sources build the same game object.
+#
+#   python scripts/benchmark_live_endpoints.py --capture 2026-07-24   # record every started game's responses
+#   python scripts/benchmark_live_endpoints.py --synthetic            # offline stand-in shaped like a 9-inning game
+#   python scripts/benchmark_live_endpoints.py                        # benchmark every recorded game
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(SCRIPT_DIR, 'fixtures', 'live')
+HEADERS = {'User-Agent': 'Mozilla/5.0'}
+
+LITE_PARTS = ["boxscore", "linescore", "play"]
+
+def _fixture_path(game_pk, part):
+    return os.path.join(FIXTURES_DIR, f"{game_pk}.{part}.json")
+
+def _save(game_pk, part, body):
+    with open(_fixture_path(game_pk, part), 'wb') as f:
+        f.write(body)
+
+def capture_fixtures(date_str):
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    for game_pk in live_feed_store.started_game_pks(date_str):
+        urls = {
+            "feed": live_feed_store.live_feed_url(game_pk),
+            "boxscore": scrape_mlb_live.boxscore_url(game_pk),
+            "linescore": scrape_mlb_live.linescore_url(game_pk),
+            "play": scrape_mlb_live.current_play_url(game_pk)
+        }
+        timing = {}
+        for part, url in urls.items():
+            started = time.perf_counter()
+            res = session.get(url, timeout=15)
+            timing[part] = round((time.perf_counter() - started) * 1000, 1)
+            _save(game_pk, part, res.content)
+        _save(game_pk, "timing", json.dumps(timing).encode('utf-8'))
+        print(f"Saved {game_pk} (feed {timing['feed']:.0f} ms, lite {sum(timing[p] for p in LITE_PARTS):.0f} ms)")
+
+def write_synthetic_fixture(game_pk="synthetic", plays=78, pitches_per_play=4, roster=26):
+    """A feed with the same nesting as a real 9-inning game (plays + pitch events + full box score)."""
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    rng = random.Random(7)
+
+    def pitch_event(i):
+        return {"details": {"call": {"code": "B", "description": "Ball"}, "description": "Ball", "code": "B", "isInPlay": False, "isStrike": False, "isBall": True, "type": {"code": "FF", "description": "Four-Seam Fastball"}},
+                "count": {"balls": i % 4, "strikes": i % 3, "outs": i % 3},
+                "pitchData": {"startSpeed": 94.1 + rng.random(), "endSpeed": 86.3, "strikeZoneTop": 3.3, "strikeZoneBottom": 1.6,
+                              "coordinates": {k: round(rng.uniform(-5, 200), 2) for k in ("aY", "aZ", "pfxX", "pfxZ", "pX", "pZ", "vX0", "vY0", "vZ0", "x", "y", "x0", "y0", "z0", "aX")},
+                              "breaks": {"breakAngle": 30.0, "breakLength": 6.0, "breakY": 24.0, "spinRate": 2300, "spinDirection": 210},
+                              "zone": 11, "typeConfidence": 0.9, "plateTime": 0.4, "extension": 6.5},
+                "index": i, "playId": f"{rng.getrandbits(64):016x}-{rng.getrandbits(32):08x}", "pitchNumber": i + 1,
+                "startTime": "2026-07-24T23:10:00.000Z", "endTime": "2026-07-24T23:10:05.000Z", "isPitch": True, "type": "pitch"}
+
+    def stat_block(kind):
+        keys = {"batting": ["gamesPlayed", "flyOuts", "groundOuts", "runs", "doubles", "triples", "homeRuns", "strikeOuts", "baseOnBalls", "intentionalWalks", "hits", "hitByPitch", "atBats", "caughtStealing", "stolenBases", "groundIntoDoublePlay", "plateAppearances", "totalBases", "rbi", "leftOnBase", "sacBunts", "sacFlies"],
+                "pitching": ["gamesPlayed", "gamesStarted", "runs", "doubles", "homeRuns", "strikeOuts", "baseOnBalls", "hits", "hitByPitch", "atBats", "numberOfPitches", "outs", "earnedRuns", "battersFaced", "wins", "losses", "balks", "wildPitches", "pickoffs", "inheritedRunners", "strikes", "balls"],
+                "fielding": ["gamesStarted", "assists", "putOuts", "errors", "chances", "fielding"]}[kind]
+        return {k: rng.randint(0, 4) for k in keys}
+
+    teams = {}
+    for side, abbr in (("away", "AWY"), ("home", "HOM")):
+        players = {}
+        for i in range(roster):
+            pid = 600000 + (0 if side == "away" else 1000) + i
+            pitched = i >= 21 and i % 2 == 0
+            batting = stat_block("batting") if i < 12 else {}
+            if batting: batting["plateAppearances"] = rng.randint(1, 5)
+            pitching = stat_block("pitching") if pitched else {}
+            if pitching: pitching["battersFaced"] = rng.randint(3, 25)
+            players[f"ID{pid}"] = {"person": {"id": pid, "fullName": f"{abbr} Player {i}", "link": f"/api/v1/people/{pid}"},
+                                   "jerseyNumber": str(i), "position": {"code": "8", "name": "Outfielder", "type": "Outfielder", "abbreviation": "CF"},
+                                   "status": {"code": "A", "description": "Active"}, "parentTeamId": 100,
+                                   "stats": {"batting": batting, "pitching": pitching, "fielding": stat_block("fielding")},
+                                   "seasonStats": {"batting": stat_block("batting"), "pitching": stat_block("pitching"), "fielding": stat_block("fielding")},
+                                   "gameStatus": {"isCurrentBatter": False, "isCurrentPitcher": False, "isOnBench": False, "isSubstitute": False}}
+        teams[side] = {"team": {"id": 100, "name": f"{abbr} Team", "abbreviation": abbr},
+                       "teamStats": {"batting": stat_block("batting"), "pitching": stat_block("pitching"), "fielding": stat_block("fielding")},
+                       "players": players, "batters": list(range(12)), "pitchers": list(range(5)), "bench": [], "bullpen": list(range(8)),
+                       "battingOrder": list(range(9)), "info": [{"title": "BATTING", "fieldList": [{"label": "2B", "value": "Player (1)."}]}], "note": []}
+    boxscore = {"copyright": "Copyright 2026 MLB Advanced Media, L.P.", "teams": teams, "officials": [{"official": {"id": 1, "fullName": "Ump"}, "officialType": "Home Plate"}],
+                "info": [{"label": "Weather", "value": "78 degrees, Clear."}], "pitchingNotes": []}
+    linescore = {"copyright": "Copyright 2026 MLB Advanced Media, L.P.", "currentInning": 7, "currentInningOrdinal": "7th", "inningState": "Top", "inningHalf": "Top",
+                 "isTopInning": True, "scheduledInnings": 9,
+                 "innings": [{"num": n, "ordinalNum": f"{n}th", "home": {"runs": n % 2, "hits": 1, "errors": 0, "leftOnBase": 1}, "away": {"runs": 0, "hits": 1, "errors": 0, "leftOnBase": 0}} for n in range(1, 8)],
+                 "teams": {"home": {"runs": 3, "hits": 7, "errors": 0, "leftOnBase": 5}, "away": {"runs": 2, "hits": 6, "errors": 1, "leftOnBase": 4}},
+                 "defense": {}, "offense": {"first": {"id": 600001}}, "balls": 1, "strikes": 2, "outs": 1}
+    all_plays = [{"result": {"type": "atBat", "event": "Single", "description": f"Player {i} singles on a line drive.", "rbi": 0, "awayScore": 2, "homeScore": 3},
+                  "about": {"atBatIndex": i, "halfInning": "top", "inning": 1 + i // 12, "isComplete": True},
+                  "count": {"balls": 1, "strikes": 2, "outs": 1},
+                  "matchup": {"batter": {"id": 600001, "fullName": "AWY Player 1"}, "pitcher": {"id": 601021, "fullName": "HOM Player 21"}, "batSide": {"code": "R"}, "pitchHand": {"code": "R"}},
+                  "playEvents": [pitch_event(j) for j in range(pitches_per_play)], "runners": [], "playEndTime": "2026-07-24T23:12:00.000Z", "atBatIndex": i}
+                 for i in range(plays)]
+    feed = {"copyright": "Copyright 2026 MLB Advanced Media, L.P.", "gamePk": 0, "metaData": {"timeStamp": "20260724_231200"},
+            "gameData": {"status": {"abstractGameState": "Live", "detailedState": "In Progress"},
+                         "teams": {"away": teams["away"]["team"], "home": teams["home"]["team"]},
+                         "players": {f"ID{p['person']['id']}": {**p["person"], "primaryPosition": p["position"], "batSide": {"code": "R"}, "pitchHand": {"code": "R"}}
+                                     for t in teams.values() for p in t["players"].values()}},
+            "liveData": {"plays": {"allPlays": all_plays, "currentPlay": all_plays[-1], "scoringPlays": [1, 5], "playsByInning": []},
+                         "linescore": linescore, "boxscore": boxscore, "decisions": {}, "leaders": {}}}
+    _save(game_pk, "feed", json.dumps(feed).encode('utf-8'))
+    _save(game_pk, "boxscore", json.dumps(boxscore).encode('utf-8'))
+    _save(game_pk, "linescore", json.dumps(linescore).encode('utf-8'))
+    _save(game_pk, "play", json.dumps({"liveData": {"plays": {"currentPlay": {"result": {"description": all_plays[-1]["result"]["description"]}}}}}).encode('utf-8'))
+    print(f"Saved synthetic game fixtures to {FIXTURES_DIR}")
+
+def schedule_entry(feed):
+    """The schedule fields build_game_obj reads, recovered from the feed's gameData."""
+    game_data = feed.get('gameData', {})
+    return {"status": game_data.get('status', {}),
+            "teams": {side: {"team": game_data.get('teams', {}).get(side, {})} for side in ('away', 'home')}}
+
+def build_full(bodies):
+    feed = json.loads(bodies["feed"])
+    return scrape_mlb_live.build_game_obj(schedule_entry(feed), feed)
+
+def build_lite(bodies, game):
+    live_res = {"liveData": {"boxscore": json.loads(bodies["boxscore"]), "linescore": json.loads(bodies["linescore"]),
+                             "plays": json.loads(bodies["play"]).get('liveData', {}).get('plays', {})}}
+    return scrape_mlb_live.build_game_obj(game, live_res)
+
+def measure(fn, repeats):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        result = fn()
+    return result, (time.perf_counter() - started) / repeats * 1000
+
+def run_benchmark(repeats):
+    game_pks = sorted({f.split('.')[0] for f in os.listdir(FIXTURES_DIR) if f.endswith('.feed.json')}) if os.path.isdir(FIXTURES_DIR) else []
+    if not game_pks:
+        print(f"No fixtures in {FIXTURES_DIR}. Capture some first with --capture YYYY-MM-DD (or --synthetic).")
+        return 1
+
+    print(f"{'game':<12}{'feed KB':>9}{'lite KB':>9}{'feed gz':>9}{'lite gz':>9}{'feed ms':>9}{'lite ms':>9}{'feed parse':>12}{'lite parse':>12}  match")
+    totals = {"feed": 0, "lite": 0, "feed_gz": 0, "lite_gz": 0}
+    for game_pk in game_pks:
+        bodies = {}
+        for part in ["feed"] + LITE_PARTS:
+            with open(_fixture_path(game_pk, part), 'rb') as f:
+                bodies[part] = f.read()
+        timing = {}
+        if os.path.exists(_fixture_path(game_pk, "timing")):
+            with open(_fixture_path(game_pk, "timing"), 'r') as f:
+                timing = json.load(f)
+
+        feed_bytes = len(bodies["feed"])
+        lite_bytes = sum(len(bodies[p]) for p in LITE_PARTS)
+        feed_gz = len(gzip.compress(bodies["feed"]))
+        lite_gz = sum(len(gzip.compress(bodies[p])) for p in LITE_PARTS)
+        for key, value in (("feed", feed_bytes), ("lite", lite_bytes), ("feed_gz", feed_gz), ("lite_gz", lite_gz)):
+            totals[key] += value
+
+        game = schedule_entry(json.loads(bodies["feed"]))
+        full_obj, full_ms = measure(lambda: build_full(bodies), repeats)
+        lite_obj, lite_ms = measure(lambda: build_lite(bodies, game), repeats)
+        feed_latency = f"{timing['feed']:.0f}" if "feed" in timing else "-"
+        lite_latency = f"{sum(timing[p] for p in LITE_PARTS):.0f}" if all(p in timing for p in LITE_PARTS) else "-"
+        print(f"{game_pk:<12}{feed_bytes / 1024:>9.0f}{lite_bytes / 1024:>9.0f}{feed_gz / 1024:>9.0f}{lite_gz / 1024:>9.0f}"
+              f"{feed_latency:>9}{lite_latency:>9}{full_ms:>10.1f}ms{lite_ms:>10.1f}ms  {'yes' if full_obj == lite_obj else 'NO'}")
+
+    print(f"\nTotal: feed {totals['feed'] / 1024:.0f} KB ({totals['feed_gz'] / 1024:.0f} KB gzipped) vs "
+          f"boxscore source {totals['lite'] / 1024:.0f} KB ({totals['lite_gz'] / 1024:.0f} KB gzipped), "
+          f"{totals['feed'] / max(totals['lite'], 1):.1f}x smaller")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the live scraper's full-feed and boxscore sources.")
+    parser.add_argument("--capture", metavar="DATE", help="record every started game's full feed and boxscore-source responses for DATE")
+    parser.add_argument("--synthetic", action="store_true", help="write an offline stand-in game")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.capture:
+        capture_fixtures(args.capture)
+    if args.synthetic:
+        write_synthetic_fixture()
+    sys.exit(run_benchmark(args.repeats))
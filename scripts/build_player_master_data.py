@@ -4,6 +4,9 @@ import time
 import requests
 from datetime import datetime, timedelta
 
+import statsapi_cache
+import split_ledger
+
 # --- SLUGIFICATION HELPERS ---
 def base_slugify(text):
     """Generates a clean base slug matching your standard format."""
@@ -50,14 +53,14 @@ def fetch_all_active_rosters(session):
     teams_url = "https://statsapi.mlb.com/api/v1/teams?sportId=1"
     
     try:
-        teams_res = session.get(teams_url, timeout=10).json()
+        teams_res = statsapi_cache.get_json(teams_url, lambda: session.get(teams_url, timeout=10).json())
         for team in teams_res.get('teams', []):
             team_id = team['id']
             team_name = team['name']
             
             # Fetch the 40-Man roster for each team
             roster_url = f"https://statsapi.mlb.com/api/v1/teams/{team_id}/roster/40Man"
-            roster_res = session.get(roster_url, timeout=10).json()
+            roster_res = statsapi_cache.get_json(roster_url, lambda: session.get(roster_url, timeout=10).json())
             
             for p in roster_res.get('roster', []):
                 pid = str(p['person']['id'])
@@ -90,7 +93,7 @@ def fetch_mlb_season_and_splits(session, player_id, group_type="hitting"):
     # 1. Fetch Year Totals (Current Year Only)
     season_url = f"https://statsapi.mlb.com/api/v1/people/{player_id}/stats?stats=season&group={group_type}&gameType=R&season={current_year}"
     try:
-        res = session.get(season_url, timeout=8).json()
+        res = statsapi_cache.get_json(season_url, lambda: session.get(season_url, timeout=8).json())
         splits = res.get('stats', [{}])[0].get('splits', [])
         if splits:
             stat = splits[0].get('stat', {})
@@ -118,31 +121,39 @@ def fetch_mlb_season_and_splits(session, player_id, group_type="hitting"):
         pass
 
     # 2. Fetch Handedness Platoon Splits (2-Year Rolling Sample)
-    years_to_fetch = [current_year - 1, current_year]
+    # Last season comes from the frozen ledger, so only the current year hits the API
+    def load_split(url):
+        return statsapi_cache.get_json(url, lambda: session.get(url, timeout=8).json())
     
     for sit_code, target_key in [('vl', 'split_vL'), ('vr', 'split_vR')]:
         totals = {"ab": 0, "h": 0, "2b": 0, "3b": 0, "hr": 0, "bb": 0, "hbp": 0, "sf": 0}
+        stat_lines = []
+        
+        try:
+            stat_lines.append(split_ledger.get_prior_season_split(player_id, sit_code, group_type, load_split))
+        except Exception:
+            pass
         
-        for year in years_to_fetch:
-            split_url = f"https://statsapi.mlb.com/api/v1/people/{player_id}/stats?stats=statSplits&sitCodes={sit_code}&group={group_type}&gameType=R&season={year}"
-            try:
-                res = session.get(split_url, timeout=8).json()
-                splits = res.get('stats', [{}])[0].get('splits', [])
-                if splits:
-                    stat = splits[0].get('stat', {})
-                    
-                    # Accumulate raw counting stats across both years
-                    totals["ab"] += stat.get('atBats' if group_type == "hitting" else 'battersFaced', 0)
-                    totals["h"] += stat.get('hits', 0)
-                    totals["2b"] += stat.get('doubles', 0)
-                    totals["3b"] += stat.get('triples', 0)
-                    totals["hr"] += stat.get('homeRuns', 0)
-                    totals["bb"] += stat.get('baseOnBalls', 0)
-                    totals["hbp"] += stat.get('hitByPitch', 0)
-                    totals["sf"] += stat.get('sacFlies', 0)
-            except Exception:
-                pass
-            time.sleep(0.05)
+        split_url = split_ledger.split_url(player_id, sit_code, group_type, current_year)
+        try:
+            res = load_split(split_url)
+            splits = res.get('stats', [{}])[0].get('splits', [])
+            if splits:
+                stat_lines.append(splits[0].get('stat', {}))
+        except Exception:
+            pass
+        time.sleep(0.05)
+        
+        # Accumulate raw counting stats across both years
+        for stat in stat_lines:
+            totals["ab"] += stat.get('atBats' if group_type == "hitting" else 'battersFaced', 0)
+            totals["h"] += stat.get('hits', 0)
+            totals["2b"] += stat.get('doubles', 0)
+            totals["3b"] += stat.get('triples', 0)
+            totals["hr"] += stat.get('homeRuns', 0)
+            totals["bb"] += stat.get('baseOnBalls', 0)
+            totals["hbp"] += stat.get('hitByPitch', 0)
+            totals["sf"] += stat.get('sacFlies', 0)
             
         # Calculate final accurate 2-year percentages
         ab = totals["ab"]
@@ -314,7 +325,12 @@ def main():
 
     print("\n" + "="*40)
     print(f"🏁 MASTER BUILD COMPLETE: {updated_players_count} Active Profiles Refreshed.")
+    statsapi_cache.print_cache_summary()
     print("="*40)
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        split_ledger.save_ledger()
+        statsapi_cache.close()
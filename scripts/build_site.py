@@ -5,6 +5,8 @@ import xml.etree.ElementTree as ET
 from xml.dom import minidom
 from datetime import datetime, timedelta
 import pytz
+from game_schema import expand_deep_stats
+import lineup_events
 
 # ==========================================
 # 1. EMBEDDED HTML TEMPLATE
@@ -489,7 +491,7 @@ def generate_games_schema(date_str):
     
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            raw_data = json.load(f)
+            raw_data = expand_deep_stats(json.load(f))
         games_list = raw_data if isinstance(raw_data, list) else raw_data.get('games', [])
     except Exception:
         return ""
@@ -754,7 +756,7 @@ def generate_games_html(date_str, player_db):
     
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            raw_data = json.load(f)
+            raw_data = expand_deep_stats(json.load(f))
         games_list = raw_data if isinstance(raw_data, list) else raw_data.get('games', [])
     except Exception:
         return f'<div class="col-12 text-center mt-5"><div class="alert alert-light border shadow-sm py-4"><h5 class="text-muted mb-0">Error reading data for {date_str}</h5></div></div>'
@@ -1001,6 +1003,15 @@ def main():
             player_db = json.load(f)
 
     yest, today, tom = get_3day_dates()
+
+    # The page only changes when one of its three daily files logged a lineup event
+    cursor = lineup_events.EventCursor("index_page", lineup_events.context_key(
+        [yest, today, tom], lineup_events.file_digest('data/player_master_data.json'), lineup_events.file_digest(__file__)))
+    events = cursor.pending()
+    if events is not None and not lineup_events.affected(events, {yest, today, tom})["games"]:
+        cursor.commit()
+        print(f"Build Skipped! No lineup events for {yest} / {today} / {tom} since the last build.")
+        return
     
     html_yest = generate_games_html(yest, player_db)
     html_today = generate_games_html(today, player_db)
@@ -1045,5 +1056,7 @@ def main():
     else:
         print(f"Build Complete! Target Dates -> Yesterday: {yest} | Today: {today} | Tomorrow: {tom} (No Changes Detected)")
 
+    cursor.commit()
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,273 @@
+import os
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+# ==========================================================
+# --- LOCAL BATTER-VS-PITCHER LEDGER ---
+# ==========================================================
+# Each (batter, pitcher) pair is seeded once from the statsapi vsPlayer history,
+# then kept current by replaying the plate appearances of every Final game.
+# Slate-time BvP lookups become dict reads.
+#
+# The site builder (fetch_matchups.py) is the ledger's only writer. Every run it
+# rescans the last INGEST_WINDOW_DAYS of Final games; each pair remembers which
+# of those games it has absorbed, so a rescan changes nothing and an ingest whose
+# commit lost a push race is simply redone by the next run.
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+LEDGER_FILE = os.path.join(SCRIPT_DIR, '..', 'data', 'bvp_ledger.json')
+
+# Pairs are stored as compact lists in this column order to keep the file small.
+# season / season_pa: the batter's season plate appearances in the seed response,
+# the baseline that says whether a game was already counted. games: {gamePk: date}
+# of the recent Final games replayed into the pair.
+PAIR_FIELDS = ['ab', 'h', '2b', '3b', 'hr', 'bb', 'hbp', 'sf', 'season', 'season_pa', 'seeded_at', 'games']
+COUNT_FIELDS = PAIR_FIELDS[:8]
+
+# R = Regular Season, D/L/W/F/P = the various postseason rounds
+VALID_GAME_TYPES = {'R', 'D', 'L', 'W', 'F', 'P'}
+
+HIT_EVENTS = {'single': None, 'double': '2b', 'triple': '3b', 'home_run': 'hr'}
+WALK_EVENTS = {'walk', 'intent_walk'}
+SAC_FLY_EVENTS = {'sac_fly', 'sac_fly_double_play'}
+# Plate appearances that are not official at-bats
+NON_AB_EVENTS = WALK_EVENTS | SAC_FLY_EVENTS | {'hit_by_pitch', 'sac_bunt', 'sac_bunt_double_play', 'catcher_interf'}
+# Plays that end on the bases without the batter completing a plate appearance
+RUNNER_EVENT_PREFIXES = ('caught_stealing', 'pickoff', 'stolen_base', 'wild_pitch', 'passed_ball', 'balk', 'other_advance', 'runner_double_play')
+
+# Matches live_feed_store's feed retention, so rescanned Final games are read from disk
+INGEST_WINDOW_DAYS = 2
+EMPTY_BVP = {"ab": 0, "hits": 0, "hr": 0, "avg": "-", "ops": "-"}
+
+_LEDGER_LOCK = threading.Lock()
+_LEDGER = None
+_DIRTY = False
+
+def _load():
+    global _LEDGER
+    if _LEDGER is None:
+        ledger = {}
+        if os.path.exists(LEDGER_FILE):
+            try:
+                with open(LEDGER_FILE, 'r') as f:
+                    ledger = json.load(f) or {}
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"⚠️ Warning: BvP ledger unreadable, reseeding pairs on demand. Error: {e}")
+                ledger = {}
+        ledger.setdefault('pairs', {})
+        _LEDGER = ledger
+    return _LEDGER
+
+def pair_key(batter_id, pitcher_id):
+    return f"{batter_id}_{pitcher_id}"
+
+def vs_player_url(batter_id, pitcher_id):
+    # The batter's season line rides along as the seed's baseline
+    return f"https://statsapi.mlb.com/api/v1/people/{batter_id}/stats?stats=vsPlayer,season&opposingPlayerId={pitcher_id}&group=hitting"
+
+def schedule_url(start_date, end_date):
+    return f"https://statsapi.mlb.com/api/v1/schedule?sportId=1&startDate={start_date}&endDate={end_date}"
+
+def _pair_totals(row):
+    """A stored row as a dict, or None for rows written in an older column layout (reseeded)."""
+    if not isinstance(row, list) or len(row) != len(PAIR_FIELDS): return None
+    return dict(zip(PAIR_FIELDS, row))
+
+def format_bvp(totals):
+    """Turns raw pair totals into the deepStats BvP block used across the site."""
+    total_ab = totals['ab']
+    if total_ab <= 0:
+        return dict(EMPTY_BVP)
+
+    total_hits, total_hr = totals['h'], totals['hr']
+    avg = total_hits / total_ab
+
+    obp_denom = total_ab + totals['bb'] + totals['hbp'] + totals['sf']
+    obp = (total_hits + totals['bb'] + totals['hbp']) / obp_denom if obp_denom > 0 else 0.0
+
+    singles = total_hits - (totals['2b'] + totals['3b'] + total_hr)
+    total_bases = singles + (2 * totals['2b']) + (3 * totals['3b']) + (4 * total_hr)
+    slg = total_bases / total_ab
+    ops = obp + slg
+
+    return {
+        "ab": total_ab,
+        "hits": total_hits,
+        "hr": total_hr,
+        "avg": f"{avg:.3f}".replace("0.", "."),
+        "ops": f"{ops:.3f}".replace("0.", ".")
+    }
+
+def _stats_entry(stats_list, display_name):
+    for entry in stats_list:
+        if entry.get('type', {}).get('displayName') == display_name: return entry
+    return None
+
+def _seed_totals(res):
+    totals = {k: 0 for k in COUNT_FIELDS}
+    stats_list = res.get('stats', [])
+    vs_entry = _stats_entry(stats_list, 'vsPlayer') or (stats_list[0] if stats_list else {})
+    for split in vs_entry.get('splits', []):
+        # Only add the stats to the total if it's a meaningful game
+        if split.get('gameType', '') not in VALID_GAME_TYPES: continue
+        stat = split.get('stat', {})
+        totals['ab'] += stat.get('atBats', 0)
+        totals['h'] += stat.get('hits', 0)
+        totals['2b'] += stat.get('doubles', 0)
+        totals['3b'] += stat.get('triples', 0)
+        totals['hr'] += stat.get('homeRuns', 0)
+        totals['bb'] += stat.get('baseOnBalls', 0)
+        totals['hbp'] += stat.get('hitByPitch', 0)
+        totals['sf'] += stat.get('sacFlies', 0)
+
+    # No season entry (or no season splits yet) = no plate appearances this season
+    season_splits = (_stats_entry(stats_list, 'season') or {}).get('splits', [])
+    season_split = season_splits[0] if season_splits else {}
+    totals['season'] = str(season_split.get('season') or datetime.utcnow().year)
+    totals['season_pa'] = season_split.get('stat', {}).get('plateAppearances', 0)
+    totals['games'] = {}
+    return totals
+
+def lookup_bvp(batter_id, pitcher_id, loader):
+    """
+    Returns the formatted career BvP line for a pair. Unknown pairs are seeded
+    once through loader(url) (the vsPlayer endpoint); after that it's memory only.
+    """
+    global _DIRTY
+    key = pair_key(batter_id, pitcher_id)
+    with _LEDGER_LOCK:
+        totals = _pair_totals(_load()['pairs'].get(key))
+    if totals is not None:
+        return format_bvp(totals)
+
+    res = loader(vs_player_url(batter_id, pitcher_id))
+    if not isinstance(res, dict) or 'stats' not in res:
+        return dict(EMPTY_BVP)   # Error payload: don't freeze it, retry next run
+
+    totals = _seed_totals(res)
+    totals['seeded_at'] = int(time.time())
+    with _LEDGER_LOCK:
+        _load()['pairs'][key] = [totals[f] for f in PAIR_FIELDS]
+        _DIRTY = True
+    return format_bvp(totals)
+
+def _season_pa_windows(feed):
+    """{batter id: (season PAs before the game, after it)} from a Final game's boxscore."""
+    windows = {}
+    for team in feed.get('liveData', {}).get('boxscore', {}).get('teams', {}).values():
+        for player in team.get('players', {}).values():
+            after = player.get('seasonStats', {}).get('batting', {}).get('plateAppearances')
+            in_game = player.get('stats', {}).get('batting', {}).get('plateAppearances')
+            if after is None or in_game is None: continue
+            windows[player.get('person', {}).get('id')] = (after - in_game, after)
+    return windows
+
+def _seed_counted_game(totals, game_season, game_type, game_date, window):
+    """
+    True when the pair's seed response already included this game. Regular season
+    games compare the seed's season-PA baseline with the batter's PA count before
+    the game; the seed carries stats as of its response, however old that is.
+    Anything else falls back to the seed's day.
+    """
+    if totals['season'] < game_season: return False
+    if totals['season'] == game_season and game_type == 'R' and window is not None:
+        return totals['season_pa'] > window[0]
+    return datetime.utcfromtimestamp(totals['seeded_at']).strftime('%Y-%m-%d') >= game_date
+
+def ingest_final_game(game_pk, feed):
+    """
+    Replays a Final game's plate appearances into every pair already in the
+    ledger. Idempotent: a pair absorbs each game once, and pairs whose seed
+    already counted the game only record it.
+    """
+    global _DIRTY
+    game_data = feed.get('gameData', {})
+    if game_data.get('status', {}).get('abstractGameState') != 'Final': return 0
+    game_type = game_data.get('game', {}).get('type')
+    if game_type not in VALID_GAME_TYPES: return 0
+
+    game_date = game_data.get('datetime', {}).get('officialDate') or game_data.get('datetime', {}).get('dateTime', '')[:10]
+    game_season = str(game_data.get('game', {}).get('season') or game_date[:4])
+    if not game_date: return 0
+
+    # Every completed plate appearance, grouped by pair
+    pair_events = {}
+    for play in feed.get('liveData', {}).get('plays', {}).get('allPlays', []):
+        if not play.get('about', {}).get('isComplete'): continue
+        event = play.get('result', {}).get('eventType', '')
+        if not event or event.startswith(RUNNER_EVENT_PREFIXES): continue
+        matchup = play.get('matchup', {})
+        batter_id = matchup.get('batter', {}).get('id')
+        pair_events.setdefault((batter_id, matchup.get('pitcher', {}).get('id')), []).append(event)
+
+    game_pk = str(game_pk)
+    windows = _season_pa_windows(feed)
+    applied = 0
+    with _LEDGER_LOCK:
+        pairs = _load()['pairs']
+        for (batter_id, pitcher_id), events in pair_events.items():
+            key = pair_key(batter_id, pitcher_id)
+            totals = _pair_totals(pairs.get(key))
+            if totals is None or game_pk in totals['games']: continue
+
+            if not _seed_counted_game(totals, game_season, game_type, game_date, windows.get(batter_id)):
+                for event in events:
+                    if event not in NON_AB_EVENTS: totals['ab'] += 1
+                    if event in HIT_EVENTS:
+                        totals['h'] += 1
+                        if HIT_EVENTS[event]: totals[HIT_EVENTS[event]] += 1
+                    elif event in WALK_EVENTS: totals['bb'] += 1
+                    elif event == 'hit_by_pitch': totals['hbp'] += 1
+                    elif event in SAC_FLY_EVENTS: totals['sf'] += 1
+                applied += len(events)
+
+            totals['games'][game_pk] = game_date
+            pairs[key] = [totals[f] for f in PAIR_FIELDS]
+            _DIRTY = True
+    return applied
+
+def ingest_recent_games(schedule_loader, feed_loader, today=None):
+    """
+    Replays every Final game of the last INGEST_WINDOW_DAYS days. schedule_loader(url)
+    returns parsed statsapi JSON, feed_loader(game_pk) a game's live feed.
+    Returns (games scanned, plate appearances applied).
+    """
+    today = today or datetime.utcnow().date()
+    start_date = (today - timedelta(days=INGEST_WINDOW_DAYS)).strftime('%Y-%m-%d')
+    schedule = schedule_loader(schedule_url(start_date, today.strftime('%Y-%m-%d')))
+    scanned = applied = 0
+    for date_obj in (schedule or {}).get('dates', []):
+        for game in date_obj.get('games', []):
+            if game.get('status', {}).get('abstractGameState') != 'Final': continue
+            if game.get('gameType') not in VALID_GAME_TYPES: continue
+            try:
+                feed = feed_loader(game['gamePk'])
+            except Exception as e:
+                print(f"   ⚠️ BvP ingest skipped game {game['gamePk']}: {e}")
+                continue
+            if not feed: continue
+            applied += ingest_final_game(game['gamePk'], feed)
+            scanned += 1
+    print(f"🎯 BvP ledger: rescanned {scanned} Final games from the last {INGEST_WINDOW_DAYS} days, {applied} new plate appearances.")
+    return scanned, applied
+
+def save_ledger():
+    """Writes the ledger if pairs were seeded or games ingested this run, one pair per line."""
+    global _DIRTY
+    with _LEDGER_LOCK:
+        if not _DIRTY or _LEDGER is None: return
+        # Games past the rescan window can't come round again; pairs stop remembering them
+        cutoff = (datetime.utcnow() - timedelta(days=INGEST_WINDOW_DAYS + 1)).strftime('%Y-%m-%d')
+        games_index = PAIR_FIELDS.index('games')
+        pairs = _LEDGER['pairs']
+        for row in pairs.values():
+            if isinstance(row, list) and len(row) == len(PAIR_FIELDS):
+                row[games_index] = {pk: d for pk, d in row[games_index].items() if d >= cutoff}
+        lines = [f"{json.dumps(key)}:{json.dumps(pairs[key], separators=(',', ':'), sort_keys=True)}" for key in sorted(pairs)]
+        tmp_path = LEDGER_FILE + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write('{"pairs":{\n' + ',\n'.join(lines) + '\n}}\n')
+        os.replace(tmp_path, LEDGER_FILE)
+        _DIRTY = False
+        print(f"🎯 BvP ledger saved ({len(pairs)} batter/pitcher pairs).")
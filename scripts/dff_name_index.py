@@ -0,0 +1,114 @@
+import os
+import json
+import threading
+
+# ==========================================================
+# --- DFF PROJECTION NAME INDEX ---
+# ==========================================================
+# DailyFantasyFuel rows are keyed "{TEAM}_{clean name}_{P|B}". inject_dfs in
+# fetch_matchups.py used to fall back to scanning every key on the slate for each
+# player that missed the exact key. The index partitions the rows by team + suffix
+# and then by name token, so the fallback only looks at one team's candidates.
+#
+# Successful matches are remembered by MLB ID in a small committed file, so the
+# same player is a direct dictionary hit on every later run (until a trade or a
+# DFF spelling change makes the remembered key disappear from the slate).
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+RESOLUTION_FILE = os.path.join(SCRIPT_DIR, '..', 'data', 'dff_name_resolution.json')
+
+_CACHE_LOCK = threading.Lock()
+_CACHE = None
+_DIRTY = False
+
+def _load():
+    global _CACHE
+    if _CACHE is None:
+        cache = {}
+        if os.path.exists(RESOLUTION_FILE):
+            try:
+                with open(RESOLUTION_FILE, 'r') as f:
+                    cache = json.load(f) or {}
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"⚠️ Warning: DFF name resolution cache unreadable, rebuilding. Error: {e}")
+                cache = {}
+        _CACHE = cache
+    return _CACHE
+
+def split_key(d_key):
+    """'NYY_aaron judge_B' -> ('NYY', 'aaron judge', '_B')"""
+    team, rest = d_key.split('_', 1)
+    name, suffix = rest.rsplit('_', 1)
+    return team, name, f"_{suffix}"
+
+def build_index(dff_projections):
+    """{(team, suffix): {name token: [(dff name, dff key), ...]}} built once per date."""
+    index = {}
+    for d_key in dff_projections:
+        try:
+            team, d_name, suffix = split_key(d_key)
+        except ValueError:
+            continue
+        bucket = index.setdefault((team, suffix), {})
+        for token in d_name.split():
+            bucket.setdefault(token, []).append((d_name, d_key))
+    return index
+
+def _fuzzy_match(index, team_abbr, clean_name, suffixes):
+    parts = clean_name.split()
+    if len(parts) < 2: return None
+    for suffix in suffixes:
+        candidates = [
+            (d_name, d_key) for d_name, d_key in index.get((team_abbr, suffix), {}).get(parts[-1], [])
+            if d_name.startswith(parts[0][0])
+        ]
+        if not candidates: continue
+        # Two players sharing a last name and first initial: prefer the exact first name
+        exact_first = [c for c in candidates if c[0].split()[0] == parts[0]]
+        return (exact_first or candidates)[0][1]
+    return None
+
+def resolve(dff_projections, index, team_abbr, clean_name, suffixes, player_id=None):
+    """
+    Returns the DFF key for a player, or None. Order: remembered key for this MLB ID,
+    exact key (suffixes in priority order), then the indexed last-name match.
+    Only matches on the preferred suffix are remembered: a two-way player who fell
+    back to his other row today must still find the preferred one tomorrow.
+    """
+    global _DIRTY
+    cache_key = f"{player_id}{suffixes[0]}" if player_id else None
+
+    if cache_key:
+        with _CACHE_LOCK:
+            remembered = _load().get(cache_key)
+        if (remembered in dff_projections and remembered.startswith(f"{team_abbr}_")
+                and remembered.endswith(suffixes[0])):
+            return remembered
+
+    found = None
+    for suffix in suffixes:
+        p_key = f"{team_abbr}_{clean_name}{suffix}"
+        if p_key in dff_projections:
+            found = p_key
+            break
+    if not found:
+        found = _fuzzy_match(index, team_abbr, clean_name, suffixes)
+
+    if found and cache_key and found.endswith(suffixes[0]):
+        with _CACHE_LOCK:
+            cache = _load()
+            if cache.get(cache_key) != found:
+                cache[cache_key] = found
+                _DIRTY = True
+    return found
+
+def save_cache():
+    """Writes the resolution cache if any new players were matched this run."""
+    global _DIRTY
+    with _CACHE_LOCK:
+        if not _DIRTY or _CACHE is None: return
+        tmp_path = RESOLUTION_FILE + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(_CACHE, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, RESOLUTION_FILE)
+        _DIRTY = False
+        print(f"🔗 DFF name resolution cache saved ({len(_CACHE)} players).")
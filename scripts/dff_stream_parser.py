@@ -0,0 +1,160 @@
+import re
+from html.parser import HTMLParser
+
+# ==========================================================
+# --- STREAMING DAILYFANTASYFUEL PAGE EXTRACTOR ---
+# ==========================================================
+# fetch_matchups.py only needs two things from a projections page: the data-*
+# attributes of each <tr class="projections-listing"> and the slate ids/names
+# (select options, data-slate elements, slate= links and raw slate= references
+# in inline scripts). This scanner pulls exactly that in one pass over the HTML
+# with the stdlib tokenizer, so no DOM is ever built.
+SLATE_HREF_RE = re.compile(r'slate=([a-zA-Z0-9]{5})')
+SLATE_REF_RE = re.compile(r'slate=["\']?([a-zA-Z0-9]{5})')
+
+FEED_CHUNK_SIZE = 64 * 1024
+
+# Raw-text elements: get_text() leaves their contents out of every enclosing element's text
+RAW_TEXT_TAGS = ('script', 'style')
+
+def _joined_text(parts):
+    # Same result as BeautifulSoup's get_text(separator=" ", strip=True)
+    return " ".join(p.strip() for p in parts if p.strip())
+
+class _ProjectionPageScanner(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.items = []
+        self._frames = []   # Open elements whose text we still need: [tag, depth, kind, value, start]
+        # Text is stored once, however many frames are open: a frame's text is its
+        # buffer from the frame's start index on. Script text has its own buffer.
+        self._text = []
+        self._script_text = []
+        self._raw_tag = None   # 'script' / 'style' while inside one
+        self._pending = []     # One text run, which the tokenizer may hand over in pieces at chunk edges
+
+    def _buffer(self, kind):
+        return self._script_text if kind == 'script' else self._text
+
+    def _open(self, tag, kind, value):
+        self._frames.append([tag, 0, kind, value, len(self._buffer(kind))])
+
+    def _close(self, frame):
+        self._frames.remove(frame)
+        tag, _, kind, value, start = frame
+        buffer = self._buffer(kind)
+        parts = buffer[start:]
+        if not any(self._buffer(f[2]) is buffer for f in self._frames):
+            buffer.clear()   # Nothing open reads this buffer any more
+        if kind == 'script':
+            for sid in SLATE_REF_RE.findall("".join(parts)):
+                self.items.append(('slate_ref', sid))
+        elif kind == 'option':
+            sid, selected = value
+            self.items.append(('option', sid, _joined_text(parts), selected))
+        else:
+            self.items.append((kind, value, _joined_text(parts)))
+
+    def _close_open(self, tag):
+        for frame in [f for f in self._frames if f[0] == tag]:
+            self._close(frame)
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_text()
+        attrs = {k: (v if v is not None else '') for k, v in attrs}
+        if tag in RAW_TEXT_TAGS: self._raw_tag = tag
+
+        for frame in self._frames:
+            if frame[0] == tag: frame[1] += 1
+
+        for key, value in attrs.items():
+            # The old page_source regex also matched attributes like data-slate="abc12"
+            if key.endswith('slate') and re.match(r'^[a-zA-Z0-9]{5}', value):
+                self.items.append(('slate_ref', value[:5]))
+            if 'slate=' in value:
+                for sid in SLATE_REF_RE.findall(value):
+                    self.items.append(('slate_ref', sid))
+
+        if tag == 'tr' and 'projections-listing' in attrs.get('class', '').split():
+            self.items.append(('row', {k: v for k, v in attrs.items() if k.startswith('data-')}))
+        elif tag == 'option':
+            # </option> is optional in HTML; a new option closes the previous one
+            self._close_open('option')
+            self._open('option', 'option', (attrs.get('value', ''), 'selected' in attrs))
+        if 'data-slate' in attrs:
+            self._open(tag, 'data_slate', attrs['data-slate'])
+        if tag == 'a' and 'href' in attrs:
+            match = SLATE_HREF_RE.search(attrs['href'])
+            if match: self._open('a', 'link', match.group(1))
+        if tag == 'script':
+            self._open('script', 'script', None)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        self._flush_text()
+        if tag == self._raw_tag: self._raw_tag = None
+        if tag == 'select':
+            self._close_open('option')
+        # Depth 0 frames of this tag all belong to the closing element (an <a> can be both a
+        # link and a data-slate frame); deeper ones enclose it
+        for frame in [f for f in self._frames if f[0] == tag]:
+            if frame[1] == 0:
+                self._close(frame)
+            else:
+                frame[1] -= 1
+
+    def handle_comment(self, data):
+        self._flush_text()
+
+    def handle_data(self, data):
+        self._pending.append(data)
+
+    def _flush_text(self):
+        if not self._pending: return
+        data = "".join(self._pending)
+        self._pending = []
+        if self._raw_tag == 'script':
+            # Only the script's own frame reads it; scanned for slate= when the script closes
+            if self._frames and self._frames[-1][2] == 'script': self._script_text.append(data)
+            return
+        if self._raw_tag is None and any(f[2] != 'script' for f in self._frames):
+            self._text.append(data)
+        if 'slate=' in data:
+            for sid in SLATE_REF_RE.findall(data):
+                self.items.append(('slate_ref', sid))
+
+def iter_projection_page(html_text, chunk_size=FEED_CHUNK_SIZE):
+    """
+    Yields the page's items in document order as the HTML is fed through:
+      ('row', {data-* attrs}), ('option', sid, text, selected),
+      ('data_slate', sid, text), ('link', sid, text), ('slate_ref', sid)
+    """
+    scanner = _ProjectionPageScanner()
+    for start in range(0, len(html_text), chunk_size):
+        scanner.feed(html_text[start:start + chunk_size])
+        if scanner.items:
+            yield from scanner.items
+            scanner.items = []
+    scanner.close()
+    scanner._flush_text()
+    for frame in list(scanner._frames):
+        scanner._close(frame)
+    yield from scanner.items
+
+def iter_projection_rows(html_text):
+    for item in iter_projection_page(html_text):
+        if item[0] == 'row':
+            yield item[1]
+
+def extract_projection_page(html_text):
+    """Collects a page in one pass: {"rows": [...], "option": [...], "data_slate": [...], "link": [...], "slate_ref": [...]}"""
+    page = {"rows": [], "option": [], "data_slate": [], "link": [], "slate_ref": []}
+    for item in iter_projection_page(html_text):
+        if item[0] == 'row':
+            page["rows"].append(item[1])
+        else:
+            page[item[0]].append(item[1:])
+    return page
@@ -0,0 +1,204 @@
+import os
+import sys
+import json
+import glob
+import time
+import random
+import argparse
+import numpy as np
+
+# ==========================================================
+# --- TABLE-DRIVEN DFS SCORING ENGINE ---
+# ==========================================================
+# A scoring system is data: one weight per box-score stat for each group
+# (hitting / pitching), plus bonus rules that pay a flat amount when every
+# condition on the stat line holds (FanDuel's quality start, DraftKings'
+# complete game). Stat lines are scored in batches: they become an
+# (n_lines x n_stats) float matrix, points are one matrix-vector product, and
+# each bonus is a boolean mask over the rows. Scoring a new site, or rescoring
+# a season of data/LIVE box scores under changed rules, means adding a table
+# here, not writing more per-player Python.
+#
+#   python scripts/dfs_scoring.py --benchmark          # a synthetic season, batch vs line by line
+#   python scripts/dfs_scoring.py --rescore data/LIVE  # total every system over saved live files
+
+# Stats the tables may use that aren't box-score fields, as sums of ones that are
+DERIVED_STATS = {
+    "singles": {"hits": 1, "doubles": -1, "triples": -1, "homeRuns": -1}
+}
+
+SCORING_SYSTEMS = {
+    "dk": {
+        # DraftKings Hitting: 1B=3, 2B=5, 3B=8, HR=10, RBI=2, R=2, BB=2, HBP=2, SB=5
+        "hitting": {"singles": 3, "doubles": 5, "triples": 8, "homeRuns": 10, "rbi": 2, "runs": 2,
+                    "baseOnBalls": 2, "hitByPitch": 2, "stolenBases": 5},
+        # DraftKings Pitching: Out=0.75, K=2, W=4, ER=-2, Hit=-0.6, BB=-0.6, HBP=-0.6
+        "pitching": {"outs": 0.75, "strikeOuts": 2, "wins": 4, "earnedRuns": -2, "hits": -0.6,
+                     "baseOnBalls": -0.6, "hitByPitch": -0.6},
+        # CG=2.5, CGSO=2.5 (NH=2.5 skipped: a pitcher's line doesn't say he threw one)
+        "bonuses": [
+            {"name": "complete_game", "group": "pitching", "points": 2.5, "when": [("completeGames", ">", 0)]},
+            {"name": "complete_game_shutout", "group": "pitching", "points": 2.5, "when": [("shutouts", ">", 0)]}
+        ]
+    },
+    "fd": {
+        # FanDuel Hitting: 1B=3, 2B=6, 3B=9, HR=12, RBI=3.2, R=3.2, BB=3, HBP=3, SB=6
+        "hitting": {"singles": 3, "doubles": 6, "triples": 9, "homeRuns": 12, "rbi": 3.2, "runs": 3.2,
+                    "baseOnBalls": 3, "hitByPitch": 3, "stolenBases": 6},
+        # FanDuel Pitching: Out=1, K=3, W=6, ER=-3
+        "pitching": {"outs": 1, "strikeOuts": 3, "wins": 6, "earnedRuns": -3},
+        # Quality Start: 6+ IP (18+ outs) and 3 or fewer ER
+        "bonuses": [
+            {"name": "quality_start", "group": "pitching", "points": 4, "when": [("outs", ">=", 18), ("earnedRuns", "<=", 3)]}
+        ]
+    }
+}
+
+DEFAULT_SYSTEMS = ("dk", "fd")
+
+_COMPARE = {">": np.greater, ">=": np.greater_equal, "<": np.less, "<=": np.less_equal, "==": np.equal}
+
+def _raw_weights(weights):
+    """A weight table with derived stats expanded into the box-score fields they're made of."""
+    raw = {}
+    for stat, weight in weights.items():
+        for field, sign in DERIVED_STATS.get(stat, {stat: 1}).items():
+            raw[field] = raw.get(field, 0) + sign * weight
+    return raw
+
+def stat_columns(group, systems=DEFAULT_SYSTEMS):
+    """Every box-score field any of the systems reads for a group, in a fixed order."""
+    columns = set()
+    for name in systems:
+        system = SCORING_SYSTEMS[name]
+        columns.update(_raw_weights(system.get(group, {})))
+        for bonus in system.get("bonuses", []):
+            if bonus["group"] == group: columns.update(stat for stat, _, _ in bonus["when"])
+    return sorted(columns)
+
+def stat_matrix(stat_lines, columns):
+    """(n_lines x n_columns) float matrix. Missing stats, and None / {} lines, count as 0."""
+    blank = [0] * len(columns)
+    rows = [[line.get(c, 0) for c in columns] if line else blank for line in stat_lines]
+    return np.array(rows, dtype=np.float64).reshape(len(stat_lines), len(columns))
+
+def score_matrix(matrix, columns, system_name, group):
+    """Points per row under one system: stats @ weights, plus every bonus whose conditions all hold."""
+    system = SCORING_SYSTEMS[system_name]
+    index = {c: i for i, c in enumerate(columns)}
+    weights = np.zeros(len(columns))
+    for stat, weight in _raw_weights(system.get(group, {})).items():
+        weights[index[stat]] = weight
+    points = matrix @ weights
+    for bonus in system.get("bonuses", []):
+        if bonus["group"] != group: continue
+        mask = np.ones(matrix.shape[0], dtype=bool)
+        for stat, op, value in bonus["when"]:
+            mask &= _COMPARE[op](matrix[:, index[stat]], value)
+        points += mask * bonus["points"]
+    return np.round(points, 2)
+
+def score_lines(stat_lines, group, systems=DEFAULT_SYSTEMS):
+    """Scores a batch of one group's stat lines. Returns {system: array of points}."""
+    columns = stat_columns(group, systems)
+    matrix = stat_matrix(stat_lines, columns)
+    return {name: score_matrix(matrix, columns, name, group) for name in systems}
+
+def score_players(batting_lines, pitching_lines, systems=DEFAULT_SYSTEMS):
+    """
+    Per-player totals for parallel lists of batting / pitching lines (None when
+    the player didn't bat / pitch). Pitchers get hitting points too if they hit.
+    """
+    hitting = score_lines(batting_lines, "hitting", systems)
+    pitching = score_lines(pitching_lines, "pitching", systems)
+    return {name: hitting[name] + pitching[name] for name in systems}
+
+def score_line(stats, group, system_name):
+    """One stat line in plain Python, straight off the tables. The reference the batch path is checked against."""
+    if not stats: return 0.0
+    system = SCORING_SYSTEMS[system_name]
+    points = sum(weight * stats.get(stat, 0) for stat, weight in _raw_weights(system.get(group, {})).items())
+    checks = {">": lambda a, b: a > b, ">=": lambda a, b: a >= b, "<": lambda a, b: a < b,
+              "<=": lambda a, b: a <= b, "==": lambda a, b: a == b}
+    for bonus in system.get("bonuses", []):
+        if bonus["group"] == group and all(checks[op](stats.get(stat, 0), value) for stat, op, value in bonus["when"]):
+            points += bonus["points"]
+    return round(points, 2)
+
+# ==========================================================
+# --- RESCORING / BENCHMARK ---
+# ==========================================================
+def live_file_lines(paths):
+    """Every played stat line in the given data/LIVE files: (batting_lines, pitching_lines)."""
+    batting, pitching = [], []
+    for path in paths:
+        with open(path, 'r') as f:
+            games = json.load(f)
+        for game in games.values():
+            for team in game.get("players", {}).values():
+                for player in team.values():
+                    batting.append(player.get("batting"))
+                    pitching.append(player.get("pitching"))
+    return batting, pitching
+
+def synthetic_season(games=2430, lines_per_game=38, seed=11):
+    """Stat lines shaped like a full regular season of box scores (~10 hitters + ~9 pitcher lines per side)."""
+    rng = random.Random(seed)
+    batting, pitching = [], []
+    for _ in range(games * lines_per_game):
+        if rng.random() < 0.75:
+            hits = rng.randint(0, 4)
+            batting.append({"hits": hits, "doubles": min(hits, rng.randint(0, 1)), "triples": 0, "homeRuns": rng.randint(0, 1) if hits else 0,
+                            "rbi": rng.randint(0, 3), "runs": rng.randint(0, 2), "baseOnBalls": rng.randint(0, 1),
+                            "hitByPitch": 0, "stolenBases": rng.randint(0, 1), "plateAppearances": 4})
+            pitching.append(None)
+        else:
+            batting.append(None)
+            pitching.append({"outs": rng.randint(1, 27), "strikeOuts": rng.randint(0, 10), "wins": rng.randint(0, 1),
+                             "earnedRuns": rng.randint(0, 6), "hits": rng.randint(0, 9), "baseOnBalls": rng.randint(0, 4),
+                             "hitByPitch": rng.randint(0, 1), "completeGames": 1 if rng.random() < 0.01 else 0,
+                             "shutouts": 0, "battersFaced": 20})
+    return batting, pitching
+
+def run_benchmark():
+    batting, pitching = synthetic_season()
+    started = time.perf_counter()
+    columns = {group: stat_columns(group) for group in ("hitting", "pitching")}
+    matrices = {"hitting": stat_matrix(batting, columns["hitting"]), "pitching": stat_matrix(pitching, columns["pitching"])}
+    built_s = time.perf_counter() - started
+    totals = {name: score_matrix(matrices["hitting"], columns["hitting"], name, "hitting") +
+                    score_matrix(matrices["pitching"], columns["pitching"], name, "pitching") for name in DEFAULT_SYSTEMS}
+    vector_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scalar = {name: [score_line(bat, "hitting", name) + score_line(pit, "pitching", name) for bat, pit in zip(batting, pitching)]
+              for name in DEFAULT_SYSTEMS}
+    scalar_s = time.perf_counter() - started
+
+    match = all(np.allclose(totals[name], scalar[name], rtol=0, atol=1e-9) for name in DEFAULT_SYSTEMS)
+    print(f"📊 {len(batting):,} stat lines (a synthetic 2,430-game season), {len(DEFAULT_SYSTEMS)} systems")
+    print(f"   - vectorized: {vector_s * 1000:.0f} ms ({built_s * 1000:.0f} ms of it building the matrices)")
+    print(f"   - per line:   {scalar_s * 1000:.0f} ms")
+    print(f"   - same points: {'yes' if match else 'NO'}")
+    return 0 if match else 1
+
+def run_rescore(live_dir):
+    paths = sorted(glob.glob(os.path.join(live_dir, "live_mlb_*.json")))
+    batting, pitching = live_file_lines(paths)
+    started = time.perf_counter()
+    totals = score_players(batting, pitching, tuple(SCORING_SYSTEMS))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"📊 Rescored {len(batting):,} stat lines from {len(paths)} live files in {elapsed_ms:.1f} ms")
+    for name, points in totals.items():
+        print(f"   - {name}: {points.sum():,.2f} total points")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Table-driven DFS scoring.")
+    parser.add_argument("--benchmark", action="store_true", help="score a synthetic season in batch and line by line")
+    parser.add_argument("--rescore", metavar="LIVE_DIR", help="rescore every live_mlb_*.json in a directory")
+    args = parser.parse_args()
+    status = 0
+    if args.benchmark: status |= run_benchmark()
+    if args.rescore: status |= run_rescore(args.rescore)
+    sys.exit(status)
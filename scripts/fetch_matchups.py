@@ -1,14 +1,32 @@
 import requests
 import json
 import os
+import hashlib
 import time
 import zoneinfo
 import csv
 import io
 import re
 import unicodedata
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+from urllib.parse import urlparse
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+import statsapi_cache
+import split_ledger
+import bvp_ledger
+import dff_name_index
+import dff_stream_parser
+import handedness_registry
+import live_feed_store
+import freshness
+import statsapi_client
+import run_budget
+import lineup_events
+from game_schema import (GAME_RAW_SCHEMA_VERSION, PLAYER_STATS_FILE_NAME, slim_game_raw, validate_game_raw, normalize_deep_stats,
+                         expand_deep_stats, set_date_rows, table_dates, player_stats_ref, save_player_stats_table)
 
 # --- SELENIUM IMPORTS ---
 from selenium import webdriver
@@ -22,16 +40,34 @@ DATA_DIR = 'data'
 DAILY_FILES_DIR = os.path.join(DATA_DIR, 'daily_files')
 UMPIRES_FILE = os.path.join(DATA_DIR, 'umpires.json')
 PARKS_FILE = os.path.join(DATA_DIR, 'parks.json')
+LIVE_DIR = os.path.join(DATA_DIR, 'LIVE')   # scrape_mlb_live.py box scores: live_mlb_<date>.json
+# Sidecar: {"games_<date>.json": {"hash", "changed_at", "games"}} so the save gate is a hash compare
+DAILY_MANIFEST_FILE = os.path.join(DAILY_FILES_DIR, 'manifest.json')
+# Splits & season lines shared by the daily files still being written (see game_schema.py)
+PLAYER_STATS_FILE = os.path.join(DAILY_FILES_DIR, PLAYER_STATS_FILE_NAME)
 
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(DAILY_FILES_DIR, exist_ok=True)
 
+# --- CONCURRENCY SETTINGS ---
+PREFETCH_MAX_WORKERS = 8                              # Deep-stat requests allowed in flight at once
+HOST_MAX_REQUESTS_PER_SEC = {"statsapi.mlb.com": 20}  # Per-host pacing so the pool stays polite
+DEFAULT_MAX_REQUESTS_PER_SEC = 5
+DFF_SLATE_WORKERS = 6                                 # DailyFantasyFuel slate pages fetched at once
+DATE_WORKERS = 4                                      # Dates whose sources / assembly run side by side
+BROWSER_LOCK = threading.Lock()                       # The Selenium DFF fallback never runs two Chromes at once
+
+# --- DFF INGESTION ---
+DFF_PLATFORMS = ['fanduel', 'draftkings']
+DFF_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
 # --- API TRACKING ---
 API_CALL_TRACKER = {
-    "schedule": 0, "odds": 0, "live_feed": 0, "bvp": 0, "splits": 0, "bbm_csv": 0, "season_stats": 0
+    "schedule": 0, "odds": 0, "live_feed": 0, "bvp": 0, "splits": 0, "bbm_csv": 0, "season_stats": 0, "people": 0, "dff_pages": 0
 }
-
-GLOBAL_SLATES = {'fanduel': {}, 'draftkings': {}}
+API_TIMING_TRACKER = {"run_started": time.perf_counter(), "prefetch_seconds": 0.0, "latencies_ms": []}
+API_TRACKER_LOCK = threading.Lock()
+HOST_NEXT_SLOT = {}
 
 # --- BBM TO MLB ID MAPPING ---
 BBM_TO_MLB_ID = {
@@ -95,6 +131,52 @@ def save_json(path, data):
     with open(path, 'w') as f:
         json.dump(data, f, indent=4)
 
+def track_api_call(kind):
+    with API_TRACKER_LOCK:
+        API_CALL_TRACKER[kind] += 1
+
+def wait_for_host_slot(url):
+    """Blocks until the per-host rate limit allows another request to start."""
+    host = urlparse(url).netloc
+    interval = 1.0 / HOST_MAX_REQUESTS_PER_SEC.get(host, DEFAULT_MAX_REQUESTS_PER_SEC)
+    with API_TRACKER_LOCK:
+        now = time.monotonic()
+        slot = max(now, HOST_NEXT_SLOT.get(host, now))
+        HOST_NEXT_SLOT[host] = slot + interval
+    if slot > now:
+        time.sleep(slot - now)
+
+def timed_get(session, url, timeout=10, headers=None, rate_limit=True):
+    """Rate-limited GET that records wall-clock latency for the API summary."""
+    if rate_limit: wait_for_host_slot(url)
+    started = time.perf_counter()
+    try:
+        return session.get(url, timeout=timeout, headers=headers)
+    finally:
+        with API_TRACKER_LOCK:
+            API_TIMING_TRACKER["latencies_ms"].append((time.perf_counter() - started) * 1000)
+
+def client_get(session, url, kind, timeout=10):
+    """One statsapi request through the per-endpoint breaker / adaptive timeout / retry layer."""
+    def send(attempt_timeout):
+        track_api_call(kind)
+        return timed_get(session, url, timeout=attempt_timeout, rate_limit=False)
+    # The host slot is taken before the client starts its clock: queueing isn't endpoint latency
+    return statsapi_client.request(kind, send, max_timeout=timeout, wait=lambda: wait_for_host_slot(url))
+
+def fetch_json(session, url, kind, timeout=10):
+    """Serves statsapi JSON from the persistent cache, only counting & timing real network calls."""
+    return statsapi_cache.get_json(url, lambda: client_get(session, url, kind, timeout=timeout).json())
+
+def load_live_feed(session, url, timeout=5):
+    """Network loader for live_feed_store (full documents and diffPatch requests alike)."""
+    return client_get(session, url, "live_feed", timeout=timeout).json()
+
+def latency_percentile(samples, pct):
+    if not samples: return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
 def get_active_sport_ids():
     current_date = datetime.utcnow().date()
     wbc_start = datetime(2026, 3, 4).date()
@@ -107,8 +189,7 @@ def get_active_sport_ids():
 # --- DATA FETCHERS ---
 # ==========================================
 def get_bbm_projected_lineups(target_date):
-    global API_CALL_TRACKER
-    API_CALL_TRACKER["bbm_csv"] += 1
+    track_api_call("bbm_csv")
     
     session = requests.Session()
     headers = {'User-Agent': 'Mozilla/5.0'}
@@ -159,142 +240,196 @@ def get_bbm_projected_lineups(target_date):
             
     return projections
 
-def scrape_dff_projections(target_date_str):
-    print(f"\n--- BROWSER BOT STARTING FOR: {target_date_str} ---")
-    dff_data = {}
-    platforms = ['fanduel', 'draftkings']
+def new_dff_record():
+    return {
+        "salary": 0, "proj": 0.0, "value": 0.0,
+        "dk_salary": 0, "dk_proj": 0.0, "dk_value": 0.0,
+        "fd_slates": {}, "dk_slates": {},
+        "fd_positions": "", "dk_positions": ""
+    }
+
+def parse_dff_row(row, plt, sid, dff_data):
+    team_raw = row.get('data-team')
+    if not team_raw: return
+    team = team_raw.upper()
+    if team == 'CHW': team = 'CWS'
+    
+    raw_name = row.get('data-name', '')
+    clean_name = clean_player_name(raw_name)
+    
+    try:
+        sal = float(row.get('data-salary', '0') or '0')
+        proj = float(row.get('data-ppg_proj') or row.get('data-fpts_proj') or '0')
+        val = float(row.get('data-value_proj', '0') or '0')
+    except:
+        sal, proj, val = 0, 0, 0
+        
+    # 1. GRAB POSITIONS FIRST
+    pos = row.get('data-pos', '').strip()
+    pos_alt = row.get('data-pos_alt', '').strip()
+    combined_pos = f"{pos}/{pos_alt}" if pos_alt else pos
+    
+    # 2. DEFINE THE KEY WITH THE _P OR _B SUFFIX
+    is_pitcher = 'P' in combined_pos.split('/')
+    p_key = f"{team}_{clean_name}_{'P' if is_pitcher else 'B'}"
+    
+    # 3. INITIALIZE THE DICTIONARY USING THE CORRECT SUFFIXED KEY
+    if p_key not in dff_data:
+        dff_data[p_key] = new_dff_record()
+    
+    # 4. SAVE THE DATA
+    if plt == 'fanduel' and sal > 0:
+        dff_data[p_key]["fd_positions"] = combined_pos # Save the FD string
+        if sid:
+            dff_data[p_key]["fd_slates"][sid] = {"salary": int(sal), "proj": round(proj, 1), "value": round(val, 2)}
+    elif plt == 'draftkings' and sal > 0:
+        dff_data[p_key]["dk_positions"] = combined_pos # Save the DK string
+        if sid:
+            dff_data[p_key]["dk_slates"][sid] = {"salary": int(sal), "proj": round(proj, 1), "value": round(val, 2)}
+
+def parse_dff_page(html_text, plt, sid, dff_data):
+    rows = 0
+    for row in dff_stream_parser.iter_projection_rows(html_text):
+        parse_dff_row(row, plt, sid, dff_data)
+        rows += 1
+    return rows
+
+def new_slate_names():
+    """Per-date {platform: {slate_id: display name}}; each date's DFF pull owns its own."""
+    return {'fanduel': {}, 'draftkings': {}}
+
+def discover_dff_slates(page, platform, slates):
+    """Finds every slate id on an extracted projections page and records its display name in slates. Returns (slate_ids, active_sid)."""
+    slate_ids = set()
+    
+    def add_slate_name(sid, name):
+        if not sid or not re.match(r'^[a-zA-Z0-9]{5}$', str(sid)): return
+        slate_ids.add(sid)
+        name = str(name).strip()
+        if name and len(name) > 2:
+            bad_names = ["projections", "matchups", "odds", "starting lineups", "players", "lineups", "optimizer"]
+            if name.lower() not in bad_names:
+                if sid not in slates[platform] or slates[platform][sid].startswith("Slate "):
+                    clean_name = re.sub(r'^(FD|DK)\s+', '', name, flags=re.IGNORECASE).strip()
+                    if clean_name:
+                        slates[platform][sid] = clean_name
+
+    active_sid = None
+    for val, text, selected in page["option"]:
+        if selected: active_sid = val
+        add_slate_name(val, text)
+        
+    for sid, text in page["data_slate"]:
+        add_slate_name(sid, text)
+        
+    for sid, text in page["link"]:
+        add_slate_name(sid, text)
+
+    for (m,) in page["slate_ref"]:
+        slate_ids.add(m)
+        if m not in slates[platform]:
+            slates[platform][m] = f"Slate {m}"
+            
+    if active_sid not in slate_ids: active_sid = None
+    return slate_ids, active_sid
+
+def fetch_dff_slates(session, base_url, platform, slate_ids, dff_data):
+    """Pulls every slate's XHR page concurrently over the pooled session, then parses them in order."""
+    headers = {'User-Agent': 'Mozilla/5.0', 'X-Requested-With': 'XMLHttpRequest'}
+    
+    def fetch_slate(sid):
+        track_api_call("dff_pages")
+        try:
+            res = timed_get(session, f"{base_url}?slate={sid}", timeout=5, headers=headers)
+            return res.text if res.status_code == 200 else None
+        except requests.exceptions.RequestException:
+            return None
+
+    slate_list = sorted(slate_ids)
+    with ThreadPoolExecutor(max_workers=DFF_SLATE_WORKERS) as pool:
+        pages = list(pool.map(fetch_slate, slate_list))
+    for sid, html_text in zip(slate_list, pages):
+        if html_text:
+            try: parse_dff_page(html_text, platform, sid, dff_data)
+            except Exception: pass
+
+def scrape_dff_platform_http(session, target_date_str, platform, dff_data, slates):
+    """
+    Browserless ingestion for one platform: slate discovery from the static HTML,
+    then all slates over plain HTTP. Returns False when discovery finds nothing
+    so the caller can fall back to the browser.
+    """
+    base_url = f"https://www.dailyfantasyfuel.com/mlb/projections/{platform}/{target_date_str}"
+    try:
+        print(f"Loading {platform.upper()} Base URL (HTTP): {base_url}")
+        track_api_call("dff_pages")
+        res = timed_get(session, base_url, timeout=10, headers={'User-Agent': DFF_USER_AGENT})
+        if res.status_code != 200: return False
+        
+        page = dff_stream_parser.extract_projection_page(res.text)
+        slate_ids, active_sid = discover_dff_slates(page, platform, slates)
+        if not slate_ids: return False
+        print(f"HTTP found slates: {slate_ids}")
+        
+        # The base page already holds the selected slate's rows
+        if active_sid:
+            for row in page["rows"]: parse_dff_row(row, platform, active_sid, dff_data)
+        fetch_dff_slates(session, base_url, platform, slate_ids - {active_sid}, dff_data)
+        return True
+    except Exception as e:
+        print(f"HTTP DFF ingestion failed ({platform}): {e}")
+        return False
+
+def scrape_dff_platforms_browser(session, target_date_str, platforms, dff_data, slates):
+    """Fallback for platforms whose slates only appear after the page's JS runs."""
+    print(f"\n--- BROWSER BOT STARTING FOR: {target_date_str} ({', '.join(platforms)}) ---")
     
     chrome_options = Options()
     chrome_options.add_argument("--headless") 
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+    chrome_options.add_argument(f"user-agent={DFF_USER_AGENT}")
     
     try:
         driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=chrome_options)
     except Exception as e:
         print(f"Failed to launch browser bot: {e}")
-        return dff_data
+        return
 
-    for platform in platforms:
-        base_url = f"https://www.dailyfantasyfuel.com/mlb/projections/{platform}/{target_date_str}"
-        slate_ids = set()
-        
-        try:
-            print(f"Loading {platform.upper()} Base URL: {base_url}")
-            driver.get(base_url)
-            time.sleep(3) 
+    try:
+        for platform in platforms:
+            base_url = f"https://www.dailyfantasyfuel.com/mlb/projections/{platform}/{target_date_str}"
             
             try:
-                toggles = driver.find_elements(By.XPATH, "//*[contains(translate(text(), 'SLATE', 'slate'), 'slate') or contains(translate(text(), 'MAIN', 'main'), 'main') or contains(@class, 'slate')]")
-                for t in toggles:
-                    try:
-                        if not t.get_attribute("href"):
-                            driver.execute_script("arguments[0].click();", t)
-                    except: pass
-                time.sleep(1) 
-            except: pass
-
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            
-            def add_slate_name(sid, name):
-                if not sid or not re.match(r'^[a-zA-Z0-9]{5}$', str(sid)): return
-                slate_ids.add(sid)
-                name = str(name).strip()
-                if name and len(name) > 2:
-                    bad_names = ["projections", "matchups", "odds", "starting lineups", "players", "lineups", "optimizer"]
-                    if name.lower() not in bad_names:
-                        if sid not in GLOBAL_SLATES[platform] or GLOBAL_SLATES[platform][sid].startswith("Slate "):
-                            clean_name = re.sub(r'^(FD|DK)\s+', '', name, flags=re.IGNORECASE).strip()
-                            if clean_name:
-                                GLOBAL_SLATES[platform][sid] = clean_name
-
-            active_sid = None
-            for opt in soup.find_all('option'):
-                val = opt.get('value', '')
-                if opt.has_attr('selected'): active_sid = val
-                add_slate_name(val, opt.get_text(separator=" ", strip=True))
-                
-            for el in soup.find_all(attrs={"data-slate": True}):
-                add_slate_name(el.get("data-slate", ""), el.get_text(separator=" ", strip=True))
-                
-            for a in soup.find_all('a', href=True):
-                match = re.search(r'slate=([a-zA-Z0-9]{5})', a['href'])
-                if match:
-                    add_slate_name(match.group(1), a.get_text(separator=" ", strip=True))
-
-            html_text = driver.page_source
-            matches = re.findall(r'slate=["\']?([a-zA-Z0-9]{5})', html_text)
-            for m in matches:
-                slate_ids.add(m)
-                if m not in GLOBAL_SLATES[platform]:
-                    GLOBAL_SLATES[platform][m] = f"Slate {m}"
-                
-            print(f"Browser found slates: {slate_ids}")
-            
-            def parse_row(row, plt, sid):
-                team_raw = row.get('data-team')
-                if not team_raw: return
-                team = team_raw.upper()
-                if team == 'CHW': team = 'CWS'
-                
-                raw_name = row.get('data-name', '')
-                clean_name = clean_player_name(raw_name)
-                
-                try:
-                    sal = float(row.get('data-salary', '0') or '0')
-                    proj = float(row.get('data-ppg_proj') or row.get('data-fpts_proj') or '0')
-                    val = float(row.get('data-value_proj', '0') or '0')
-                except:
-                    sal, proj, val = 0, 0, 0
-                    
-                # 1. GRAB POSITIONS FIRST
-                pos = row.get('data-pos', '').strip()
-                pos_alt = row.get('data-pos_alt', '').strip()
-                combined_pos = f"{pos}/{pos_alt}" if pos_alt else pos
+                print(f"Loading {platform.upper()} Base URL: {base_url}")
+                driver.get(base_url)
+                time.sleep(3) 
                 
-                # 2. DEFINE THE KEY WITH THE _P OR _B SUFFIX
-                is_pitcher = 'P' in combined_pos.split('/')
-                p_key = f"{team}_{clean_name}_{'P' if is_pitcher else 'B'}"
-                
-                # 3. INITIALIZE THE DICTIONARY USING THE CORRECT SUFFIXED KEY
-                if p_key not in dff_data:
-                    dff_data[p_key] = {
-                        "salary": 0, "proj": 0.0, "value": 0.0,
-                        "dk_salary": 0, "dk_proj": 0.0, "dk_value": 0.0,
-                        "fd_slates": {}, "dk_slates": {},
-                        "fd_positions": "", "dk_positions": ""
-                    }
-                
-                # 4. SAVE THE DATA
-                if plt == 'fanduel' and sal > 0:
-                    dff_data[p_key]["fd_positions"] = combined_pos # Save the FD string
-                    if sid:
-                        dff_data[p_key]["fd_slates"][sid] = {"salary": int(sal), "proj": round(proj, 1), "value": round(val, 2)}
-                elif plt == 'draftkings' and sal > 0:
-                    dff_data[p_key]["dk_positions"] = combined_pos # Save the DK string
-                    if sid:
-                        dff_data[p_key]["dk_slates"][sid] = {"salary": int(sal), "proj": round(proj, 1), "value": round(val, 2)}
-
-            if active_sid:
-                for row in soup.find_all('tr', class_='projections-listing'):
-                    parse_row(row, platform, active_sid)
-            
-            for sid in slate_ids:
-                if sid == active_sid: continue
                 try:
-                    headers = {'User-Agent': 'Mozilla/5.0', 'X-Requested-With': 'XMLHttpRequest'}
-                    res = requests.get(f"{base_url}?slate={sid}", headers=headers, timeout=5)
-                    if res.status_code == 200:
-                        sub_soup = BeautifulSoup(res.text, 'html.parser')
-                        for row in sub_soup.find_all('tr', class_='projections-listing'):
-                            parse_row(row, platform, sid)
+                    toggles = driver.find_elements(By.XPATH, "//*[contains(translate(text(), 'SLATE', 'slate'), 'slate') or contains(translate(text(), 'MAIN', 'main'), 'main') or contains(@class, 'slate')]")
+                    for t in toggles:
+                        try:
+                            if not t.get_attribute("href"):
+                                driver.execute_script("arguments[0].click();", t)
+                        except: pass
+                    time.sleep(1) 
                 except: pass
-                
-        except Exception as e:
-            print(f"Error scraping DFF ({platform}): {e}")
-            
+
+                page = dff_stream_parser.extract_projection_page(driver.page_source)
+                slate_ids, active_sid = discover_dff_slates(page, platform, slates)
+                print(f"Browser found slates: {slate_ids}")
+
+                if active_sid:
+                    for row in page["rows"]: parse_dff_row(row, platform, active_sid, dff_data)
+                fetch_dff_slates(session, base_url, platform, slate_ids - {active_sid}, dff_data)
+                    
+            except Exception as e:
+                print(f"Error scraping DFF ({platform}): {e}")
+    finally:
+        driver.quit()
+
+def apply_dff_waterfall(dff_data, slates):
     print("Applying Waterfall Logic for Default DFS Stats...")
     def get_slate_priority(slate_name):
         name_lower = slate_name.lower()
@@ -306,7 +441,7 @@ def scrape_dff_projections(target_date_str):
     for p_key, p_data in dff_data.items():
         best_fd_sid, best_fd_pri = None, 99
         for sid, stats in p_data["fd_slates"].items():
-            pri = get_slate_priority(GLOBAL_SLATES['fanduel'].get(sid, ""))
+            pri = get_slate_priority(slates['fanduel'].get(sid, ""))
             if pri < best_fd_pri or (pri == best_fd_pri and stats["proj"] > p_data["fd_slates"].get(best_fd_sid, {}).get("proj", 0)):
                 best_fd_pri, best_fd_sid = pri, sid
         if best_fd_sid:
@@ -314,111 +449,74 @@ def scrape_dff_projections(target_date_str):
             
         best_dk_sid, best_dk_pri = None, 99
         for sid, stats in p_data["dk_slates"].items():
-            pri = get_slate_priority(GLOBAL_SLATES['draftkings'].get(sid, ""))
+            pri = get_slate_priority(slates['draftkings'].get(sid, ""))
             if pri < best_dk_pri or (pri == best_dk_pri and stats["proj"] > p_data["dk_slates"].get(best_dk_sid, {}).get("proj", 0)):
                 best_dk_pri, best_dk_sid = pri, sid
         if best_dk_sid:
             p_data["dk_salary"], p_data["dk_proj"], p_data["dk_value"] = p_data["dk_slates"][best_dk_sid]["salary"], p_data["dk_slates"][best_dk_sid]["proj"], p_data["dk_slates"][best_dk_sid]["value"]
 
-    driver.quit() 
-    return dff_data
-
-def fetch_bvp(session, batter_id, pitcher_id):
-    global API_CALL_TRACKER
-    API_CALL_TRACKER["bvp"] += 1
+def scrape_dff_projections(target_date_str):
+    """Returns (projections, slate names) for one date."""
+    print(f"\n--- DFF INGESTION STARTING FOR: {target_date_str} ---")
+    dff_data = {}
+    slates = new_slate_names()
     
-    # Ask the API for ALL history
-    url = f"https://statsapi.mlb.com/api/v1/people/{batter_id}/stats?stats=vsPlayer&opposingPlayerId={pitcher_id}&group=hitting"
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=DFF_SLATE_WORKERS, pool_maxsize=DFF_SLATE_WORKERS))
     
+    # Plain HTTP first; Chrome only starts if a platform's slates can't be discovered without JS
+    needs_browser = [p for p in DFF_PLATFORMS if not scrape_dff_platform_http(session, target_date_str, p, dff_data, slates)]
+    if needs_browser:
+        # One Chrome at a time, even with several dates pulling DFF in parallel
+        with BROWSER_LOCK:
+            scrape_dff_platforms_browser(session, target_date_str, needs_browser, dff_data, slates)
+    
+    apply_dff_waterfall(dff_data, slates)
+    return dff_data, slates
+
+def fetch_bvp(session, batter_id, pitcher_id):
+    # Career history lives in the local ledger; only never-seen pairs hit the vsPlayer API
     try:
-        res = session.get(url, timeout=10).json()
-        stats_list = res.get('stats', [])
-        
-        if stats_list and len(stats_list) > 0:
-            splits = stats_list[0].get('splits', [])
-            
-            if splits:
-                total_ab = 0
-                total_hits = 0
-                total_hr = 0
-                total_bb = 0
-                total_hbp = 0
-                total_sf = 0
-                total_2b = 0
-                total_3b = 0
-                
-                # Define exactly which game types we care about
-                # R = Regular Season
-                # D, L, W, F, P = Various Postseason rounds
-                valid_game_types = {'R', 'D', 'L', 'W', 'F', 'P'}
-                
-                for split in splits:
-                    # Check the game type for this specific stint
-                    game_type = split.get('gameType', '')
-                    
-                    # Only add the stats to the total if it's a meaningful game
-                    if game_type in valid_game_types:
-                        stat = split.get('stat', {})
-                        total_ab += stat.get('atBats', 0)
-                        total_hits += stat.get('hits', 0)
-                        total_hr += stat.get('homeRuns', 0)
-                        total_bb += stat.get('baseOnBalls', 0)
-                        total_hbp += stat.get('hitByPitch', 0)
-                        total_sf += stat.get('sacFlies', 0)
-                        total_2b += stat.get('doubles', 0)
-                        total_3b += stat.get('triples', 0)
-                
-                # If they have actual history in meaningful games, calculate!
-                if total_ab > 0:
-                    avg = total_hits / total_ab
-                    
-                    obp_denom = total_ab + total_bb + total_hbp + total_sf
-                    obp = (total_hits + total_bb + total_hbp) / obp_denom if obp_denom > 0 else 0.0
-                    
-                    singles = total_hits - (total_2b + total_3b + total_hr)
-                    total_bases = singles + (2 * total_2b) + (3 * total_3b) + (4 * total_hr)
-                    slg = total_bases / total_ab
-                    
-                    ops = obp + slg
-                    
-                    avg_str = f"{avg:.3f}".replace("0.", ".")
-                    ops_str = f"{ops:.3f}".replace("0.", ".")
-                    
-                    return {
-                        "ab": total_ab, 
-                        "hits": total_hits,
-                        "hr": total_hr, 
-                        "avg": avg_str, 
-                        "ops": ops_str
-                    }
-                
+        return bvp_ledger.lookup_bvp(batter_id, pitcher_id, lambda url: fetch_json(session, url, "bvp", timeout=10))
+    except statsapi_client.EndpointUnavailable:
+        raise
     except requests.exceptions.RequestException as e:
         print(f"   ⚠️ Network error fetching BvP: {e}")
     except Exception as e:
         print(f"   ⚠️ Unexpected error parsing BvP: {e}")
 
     # Fallback if no history or error occurs
-    return {"ab": 0, "hits": 0, "hr": 0, "avg": "-", "ops": "-"}
+    return dict(bvp_ledger.EMPTY_BVP)
 
 def fetch_combined_splits(session, person_id, hand_code, group_type="hitting"):
-    global API_CALL_TRACKER
+    """Last season + this season vs. one hand. Raises statsapi_client.EndpointUnavailable when splits is down."""
     current_year = datetime.utcnow().year
-    years = [current_year - 1, current_year]
-    totals = {"ab": 0, "h": 0, "2b": 0, "3b": 0, "hr": 0, "bb": 0, "hbp": 0, "sf": 0, "k": 0}
+    stat_lines = []
     
-    for year in years:
-        API_CALL_TRACKER["splits"] += 1
-        url = f"https://statsapi.mlb.com/api/v1/people/{person_id}/stats?stats=statSplits&sitCodes={hand_code}&group={group_type}&gameType=R&season={year}"
-        try:
-            res = session.get(url, timeout=10).json()
-            splits = res.get('stats', [{}])[0].get('splits', [])
-            if splits:
-                stat = splits[0].get('stat', {})
-                for key in totals.keys():
-                    api_key = key if key in stat else 'atBats' if key == 'ab' else 'hits' if key == 'h' else 'doubles' if key == '2b' else 'triples' if key == '3b' else 'homeRuns' if key == 'hr' else 'baseOnBalls' if key == 'bb' else 'hitByPitch' if key == 'hbp' else 'sacFlies' if key == 'sf' else 'strikeOuts'
-                    totals[key] += stat.get(api_key, 0)
-        except Exception: pass
-        time.sleep(0.05)
+    # Last season is frozen in the local ledger; only the first sighting hits the API
+    try:
+        stat_lines.append(split_ledger.get_prior_season_split(person_id, hand_code, group_type, lambda url: fetch_json(session, url, "splits", timeout=10)))
+    except statsapi_client.EndpointUnavailable: raise
+    except Exception: pass
+    
+    url = split_ledger.split_url(person_id, hand_code, group_type, current_year)
+    try:
+        res = fetch_json(session, url, "splits", timeout=10)
+        splits = res.get('stats', [{}])[0].get('splits', [])
+        if splits:
+            stat_lines.append(splits[0].get('stat', {}))
+    except statsapi_client.EndpointUnavailable: raise
+    except Exception: pass
+    
+    return summarize_split(stat_lines, hand_code, group_type)
+
+def summarize_split(stat_lines, hand_code, group_type="hitting"):
+    """Adds raw split lines together into the slash line the site shows (no lines = the empty split)."""
+    totals = {"ab": 0, "h": 0, "2b": 0, "3b": 0, "hr": 0, "bb": 0, "hbp": 0, "sf": 0, "k": 0}
+    for stat in stat_lines:
+        for key in totals.keys():
+            api_key = key if key in stat else 'atBats' if key == 'ab' else 'hits' if key == 'h' else 'doubles' if key == '2b' else 'triples' if key == '3b' else 'homeRuns' if key == 'hr' else 'baseOnBalls' if key == 'bb' else 'hitByPitch' if key == 'hbp' else 'sacFlies' if key == 'sf' else 'strikeOuts'
+            totals[key] += stat.get(api_key, 0)
             
     ab, h, hr, bb, hbp, sf, k = totals["ab"], totals["h"], totals["hr"], totals["bb"], totals["hbp"], totals["sf"], totals["k"]
     avg = h / ab if ab > 0 else 0.0
@@ -436,18 +534,18 @@ def fetch_combined_splits(session, person_id, hand_code, group_type="hitting"):
     return {"split_type": split_label, "ab": ab, "hr": hr, "k": k, "bb": bb, "avg": avg_str, "ops": ops_str}
 
 
+EMPTY_SEASON = {
+    "hitting": {"ab": 0, "hits": 0, "hr": 0, "rbi": 0, "sb": 0, "avg": "-", "obp": "-", "ops": "-"},
+    "pitching": {"ip": "0.0", "w": 0, "l": 0, "era": "-", "whip": "-", "k": 0}
+}
+
 def fetch_season_stats(session, person_id, group_type="hitting"):
-    global API_CALL_TRACKER
-    API_CALL_TRACKER["season_stats"] += 1
-    
+    """This season's line. Raises statsapi_client.EndpointUnavailable when season_stats is down."""
     current_year = datetime.utcnow().year
     url = f"https://statsapi.mlb.com/api/v1/people/{person_id}/stats?stats=season&group={group_type}&gameType=R&season={current_year}"
     
-    default_hit = {"ab": 0, "hits": 0, "hr": 0, "rbi": 0, "sb": 0, "avg": "-", "obp": "-", "ops": "-"}
-    default_pit = {"ip": "0.0", "w": 0, "l": 0, "era": "-", "whip": "-", "k": 0}
-    
     try:
-        res = session.get(url, timeout=10).json()
+        res = fetch_json(session, url, "season_stats", timeout=10)
         stats_list = res.get('stats', [])
         if stats_list and len(stats_list) > 0:
             splits = stats_list[0].get('splits', [])
@@ -473,27 +571,358 @@ def fetch_season_stats(session, person_id, group_type="hitting"):
                         "whip": stat.get('whip', '-'),
                         "k": stat.get('strikeOuts', 0)
                     }
+    except statsapi_client.EndpointUnavailable:
+        raise
     except Exception:
         pass
 
-    return default_hit if group_type == "hitting" else default_pit
+    return dict(EMPTY_SEASON["hitting" if group_type == "hitting" else "pitching"])
+
+def resolve_deep_stats(session, person_id, group_type, memory, stale_memory):
+    """
+    Splits + season line for one player: memory first, then statsapi. While an
+    endpoint's breaker is open, last run's copy (stale_memory) stands in, then
+    the empty line, so assembly finishes on what it already has. Stand-ins are
+    marked "stale" so the next run fetches them again.
+    """
+    fetchers = {
+        "split_vL": lambda: fetch_combined_splits(session, person_id, 'vl', group_type=group_type),
+        "split_vR": lambda: fetch_combined_splits(session, person_id, 'vr', group_type=group_type),
+        "season": lambda: fetch_season_stats(session, person_id, group_type=group_type)
+    }
+    stats = {}
+    for field, fetch in fetchers.items():
+        if stat_is_current(memory, field):
+            stats[field] = memory[field]
+            continue
+        try:
+            stats[field] = fetch()
+        except statsapi_client.EndpointUnavailable:
+            if stale_memory.get(field):
+                stats[field] = {**stale_memory[field], "stale": True}
+            elif field == "season":
+                stats[field] = {**EMPTY_SEASON["hitting" if group_type == "hitting" else "pitching"], "stale": True}
+            else:
+                stats[field] = {**summarize_split([], 'vl' if field == "split_vL" else 'vr', group_type), "stale": True}
+    return stats
+
+def resolve_bvp(session, batter_id, pitcher_id):
+    """Career BvP line, or None while the bvp endpoint's breaker is open (the pair is retried next run)."""
+    try:
+        return fetch_bvp(session, batter_id, pitcher_id)
+    except statsapi_client.EndpointUnavailable:
+        return None
+
+# ==========================================
+# --- CONCURRENT DEEP-STAT PREFETCH ---
+# ==========================================
+DEEP_STAT_FIELDS = ("split_vL", "split_vR", "season")
+
+def stat_is_current(stats, field):
+    """True when a player's deep-stat field holds a fetched line, not missing or an outage stand-in."""
+    value = stats.get(field)
+    return bool(value) and not value.get("stale")
+
+def needs_deep_stats(stats):
+    return not all(stat_is_current(stats, field) for field in DEEP_STAT_FIELDS)
+
+def deep_stats_incomplete(game_deep_stats, starter_ids):
+    """
+    True when a game's deepStats still hold gaps the next build would fill: a
+    missing or stand-in split / season line, or a BvP line that was never
+    stamped with its pitcher although both starters are known.
+    """
+    for stats in game_deep_stats.values():
+        if needs_deep_stats(stats): return True
+        bvp = stats.get("bvp")
+        if bvp is not None and (bvp.get("stale") or (all(starter_ids) and "pitcher_id" not in bvp)): return True
+    return False
+
+# What a game played yesterday can move: current-season splits/season line, and BvP if they met
+NIGHTLY_STALE_FIELDS = DEEP_STAT_FIELDS + ("bvp",)
+NIGHTLY_MAX_GAP_DAYS = 3   # Refreshes missed for longer than this just wipe everything
+DEFERRED = object()   # Prefetch result for a request the run budget no longer had room for
+
+class RunCache:
+    """
+    Thread-safe run cache shared by every date worker. get_or_fetch() de-duplicates
+    in-flight work: when two dates need the same key at once, the second waits
+    for the first fetch instead of repeating it. None results are not cached.
+    """
+    def __init__(self):
+        self._values = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._values
+
+    def __getitem__(self, key):
+        with self._lock:
+            return self._values[key]
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._values[key] = value
+
+    def get_or_fetch(self, key, fetch):
+        with self._lock:
+            if key in self._values: return self._values[key]
+            pending = self._inflight.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._inflight[key] = Future()
+        if not owner:
+            return pending.result()
+        try:
+            value = fetch()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            if value is not None: self._values[key] = value
+            self._inflight.pop(key, None)
+        pending.set_result(value)
+        return value
+
+def players_who_played(date_str):
+    """IDs of every player with a batting or pitching line in that date's live box scores, or None if the file is missing."""
+    live_path = os.path.join(LIVE_DIR, f'live_mlb_{date_str}.json')
+    if not os.path.exists(live_path): return None
+    live_games = load_json(live_path, None)
+    if not isinstance(live_games, dict): return None
+    played = set()
+    for live_game in live_games.values():
+        if not isinstance(live_game, dict): continue
+        for side_players in (live_game.get('players') or {}).values():
+            for key, line in (side_players or {}).items():
+                if line.get('batting') or line.get('pitching'):
+                    played.add(key[2:] if key.startswith('ID') else key)
+    return played
+
+def players_played_since(last_refresh_ts, now):
+    """
+    Everyone who played between the last nightly refresh and yesterday (usually
+    just yesterday's slate). None means "can't tell": a box score file is
+    missing or the gap is too long, so the caller falls back to a full wipe.
+    """
+    if last_refresh_ts is None: return None
+    first_date = datetime.fromtimestamp(last_refresh_ts, now.tzinfo).date()
+    yesterday = now.date() - timedelta(days=1)
+    if (yesterday - first_date).days > NIGHTLY_MAX_GAP_DAYS: return None
+    played = set()
+    day = first_date
+    while day <= yesterday:
+        day_players = players_who_played(day.strftime('%Y-%m-%d'))
+        if day_players is None: return None
+        played |= day_players
+        day += timedelta(days=1)
+    return played
+
+def memory_deep_stats(ctx, existing_game_state):
+    """
+    A game's deepStats as this run should trust them. On the nightly refresh,
+    only the players who played yesterday lose their current-season numbers;
+    without yesterday's box scores everything is refetched as before.
+    """
+    deep_stats = existing_game_state.get('deepStats', {})
+    if not ctx["nightly_refresh"]: return deep_stats
+    stale_players = ctx["stale_players"]
+    if stale_players is None: return {}
+    return {
+        pid: {k: v for k, v in stats.items() if k not in NIGHTLY_STALE_FIELDS} if pid in stale_players else stats
+        for pid, stats in deep_stats.items()
+    }
+
+def projected_batting_orders(ctx, game, existing_game_state):
+    """{'away': [...], 'home': [...]} from this run's BBM pull, or from the daily file memory."""
+    teams = game.get('teams', {})
+    if ctx["needs_bbm_fetch"]:
+        proj_lineups = ctx["bbm_projections_for_date"]
+        team_keys = {side: f"{teams.get(side, {}).get('team', {}).get('id', '')}_{game.get('gameNumber', 1)}" for side in ('away', 'home')}
+        return {side: (proj_lineups.get(team_keys[side]) or {}).get('battingOrder', []) for side in ('away', 'home')}
+    proj_lineups = existing_game_state.get('projectedLineups') or {}
+    return {side: (proj_lineups.get(side) or {}).get('battingOrder', []) for side in ('away', 'home')}
+
+def collect_slate_player_ids(date_contexts):
+    """Every starter, official and projected batter ID across all dates in this run."""
+    player_ids = set()
+    for ctx in date_contexts:
+        if ctx["deferred"]: continue
+        for game in ctx["date_item"].get('games', []):
+            existing_game_state = ctx["daily_memory"].get(str(game['gamePk']), {})
+            proj = projected_batting_orders(ctx, game, existing_game_state)
+            lineups = game.get('lineups', {})
+            for side in ('away', 'home'):
+                starter = game.get('teams', {}).get(side, {}).get('probablePitcher')
+                if starter and 'id' in starter:
+                    player_ids.add(str(starter['id']))
+                for p in lineups.get(f'{side}Players', []) + proj[side]:
+                    if 'id' in p: player_ids.add(str(p['id']))
+    return player_ids
+
+def collect_deep_stat_jobs(date_contexts, run_cache_splits, run_cache_bvp, now_ts=None):
+    """
+    Walks every game on every date exactly like the assembly loop does and returns
+    the (player, endpoint) work that is missing from the daily file memory. Each
+    job carries the best run_budget.game_rank of the games it serves and the dates
+    that need it.
+    """
+    now_ts = now_ts if now_ts is not None else time.time()
+    split_jobs = {}
+    bvp_jobs = {}
+
+    def tag(job, rank, date_str):
+        job["rank"] = min(job.get("rank", rank), rank)
+        job.setdefault("dates", set()).add(date_str)
+
+    def queue_player(pid, group_type, memory, rank, date_str):
+        if pid in run_cache_splits: return
+        job = split_jobs.setdefault(pid, {"group": group_type, "known": {}})
+        tag(job, rank, date_str)
+        for field in DEEP_STAT_FIELDS:
+            if stat_is_current(memory, field): job["known"].setdefault(field, memory[field])
+
+    for ctx in date_contexts:
+        if ctx["deferred"]: continue
+        date_str = ctx["date_item"]['date']
+        for game in ctx["date_item"].get('games', []):
+            rank = run_budget.game_rank(ctx["days_away"], game, now_ts)
+            existing_game_state = ctx["daily_memory"].get(str(game['gamePk']), {})
+            game_deep_stats = memory_deep_stats(ctx, existing_game_state)
+            teams = game.get('teams', {})
+            starters = {side: teams.get(side, {}).get('probablePitcher') for side in ('away', 'home')}
+            starter_ids = {side: str(p['id']) if p else None for side, p in starters.items()}
+
+            for p_id in starter_ids.values():
+                if p_id and needs_deep_stats(game_deep_stats.get(p_id, {})):
+                    queue_player(p_id, "pitching", game_deep_stats.get(p_id, {}), rank, date_str)
+
+            proj = projected_batting_orders(ctx, game, existing_game_state)
+
+            lineups = game.get('lineups', {})
+            for side, opp_side in [('away', 'home'), ('home', 'away')]:
+                opp_starter_id = starter_ids[opp_side]
+                for batter in lineups.get(f'{side}Players', []) + proj[side]:
+                    if 'id' not in batter: continue
+                    batter_id = str(batter['id'])
+                    memory = game_deep_stats.get(batter_id, {})
+                    if needs_deep_stats(memory):
+                        queue_player(batter_id, "hitting", memory, rank, date_str)
+
+                    bvp_key = f"{batter_id}_{opp_starter_id}"
+                    if opp_starter_id and memory.get("bvp", {}).get("pitcher_id") != opp_starter_id and bvp_key not in run_cache_bvp:
+                        tag(bvp_jobs.setdefault(bvp_key, {"ids": (batter_id, opp_starter_id)}), rank, date_str)
+
+    return split_jobs, bvp_jobs
+
+def run_deep_stat_prefetch(session, date_contexts, run_cache_splits, run_cache_bvp, budget, now_ts=None):
+    """
+    Fetches every missing split, season line and BvP history for the whole run in
+    parallel, then fills the run caches so the per-game loop only reads memory.
+    Requests are queued most urgent first. A request whose priority the budget no
+    longer allows is skipped, and returns the dates it was needed for.
+    """
+    split_jobs, bvp_jobs = collect_deep_stat_jobs(date_contexts, run_cache_splits, run_cache_bvp, now_ts)
+    started = time.perf_counter()
+
+    requests_queue = []
+    for pid, job in split_jobs.items():
+        for field in DEEP_STAT_FIELDS:
+            if field in job["known"]: continue
+            if field == "season":
+                call = (fetch_season_stats, (session, pid), {"group_type": job["group"]})
+            else:
+                hand_code = 'vl' if field == "split_vL" else 'vr'
+                call = (fetch_combined_splits, (session, pid, hand_code), {"group_type": job["group"]})
+            requests_queue.append((job["rank"], ("splits", pid, field), call, job["dates"]))
+    for bvp_key, job in bvp_jobs.items():
+        requests_queue.append((job["rank"], ("bvp", bvp_key, None), (fetch_bvp, (session, *job["ids"]), {}), job["dates"]))
+    requests_queue.sort(key=lambda item: item[0])
+
+    def run_if_allowed(priority, fn, args, kwargs):
+        # Checked when a worker picks the request up, not when it is queued
+        if not budget.allows(priority): return DEFERRED
+        return fn(*args, **kwargs)
+
+    futures = {}
+    deferred_dates = set()
+    unavailable = 0
+    with ThreadPoolExecutor(max_workers=PREFETCH_MAX_WORKERS) as pool:
+        for rank, job_key, (fn, args, kwargs), dates in requests_queue:
+            futures[pool.submit(run_if_allowed, rank[0], fn, args, kwargs)] = (job_key, dates)
+
+        if futures:
+            print(f"⚡ Prefetching {len(futures)} deep-stat requests with {PREFETCH_MAX_WORKERS} workers...")
+
+        for future in as_completed(futures):
+            (kind, key, field), dates = futures[future]
+            try:
+                result = future.result()
+            except statsapi_client.EndpointUnavailable:
+                unavailable += 1
+                continue
+            except Exception as e:
+                print(f"   ⚠️ Prefetch failed for {kind} {key}: {e}")
+                continue
+            if result is DEFERRED:
+                deferred_dates.update(dates)
+                continue
+            if kind == "bvp":
+                run_cache_bvp[key] = result
+            else:
+                split_jobs[key]["known"][field] = result
+
+    if unavailable:
+        print(f"   🔌 {unavailable} prefetch requests hit an unavailable endpoint; assembly falls back to cached stats.")
+
+    for pid, job in split_jobs.items():
+        if all(field in job["known"] for field in DEEP_STAT_FIELDS):
+            run_cache_splits[pid] = {field: job["known"][field] for field in DEEP_STAT_FIELDS}
+
+    API_TIMING_TRACKER["prefetch_seconds"] += time.perf_counter() - started
+    return deferred_dates
+
+# ==========================================
+# --- INCREMENTAL CHANGE DETECTION ---
+# ==========================================
+def fingerprint(obj):
+    return hashlib.sha1(json.dumps(obj, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')).hexdigest()
+
+def payload_hash(payload):
+    """Canonical content hash of a daily file, ignoring the per-run last_updated stamp."""
+    return fingerprint({k: v for k, v in payload.items() if k != "last_updated"})
+
+def hash_dff_by_team(dff_projections):
+    """Hashes each team's DFF rows once per date so a game only fingerprints its own two teams."""
+    by_team = {}
+    for p_key, p_data in dff_projections.items():
+        by_team.setdefault(p_key.split('_')[0], {})[p_key] = p_data
+    return {team: fingerprint(rows) for team, rows in by_team.items()}
+
 # ==========================================
 # --- MAIN SCRIPT LOGIC ---
 # ==========================================
 def main():
-    global API_CALL_TRACKER, GLOBAL_SLATES
+    global API_CALL_TRACKER
     est_tz = zoneinfo.ZoneInfo("America/New_York")
     current_est_time = datetime.now(est_tz)
+    budget = run_budget.RunBudget(run_budget.budget_from_args())
     
     # --- 🛑 THE DEEP SLEEP CHECK ---
-    if 4 <= current_est_time.hour < 8:
+    if freshness.in_quiet_hours(current_est_time):
         print(f"💤 SLEEP MODE ACTIVE: It is currently {current_est_time.strftime('%I:%M %p')} EST.")
         return
 
-    is_nightly_refresh = current_est_time.hour == 3
-    
-    if is_nightly_refresh:
-        print(f"🧹 NIGHTLY REFRESH ACTIVE: Wiping saved stats to fetch fresh data for the day.")
+    # --- ⏭️ FAST EXIT: NOTHING DUE SINCE THE LAST RUN'S PLAN ---
+    planner = freshness.RunPlanner(current_est_time)
+    if planner.can_skip_run():
+        next_due = datetime.fromtimestamp(planner.next_run_due(), est_tz).strftime('%I:%M %p')
+        print(f"⏭️ NOTHING DUE: Every source is fresh until {next_due} EST.")
+        return
         
     today_est_str = current_est_time.strftime('%Y-%m-%d')
     
@@ -509,6 +938,8 @@ def main():
     print(f"🚀 Building Master JSONs using the Daily File as Memory")
     
     session = requests.Session()
+    # Size the connection pool to the prefetch workers so threads don't queue for sockets
+    session.mount("https://", HTTPAdapter(pool_connections=PREFETCH_MAX_WORKERS, pool_maxsize=PREFETCH_MAX_WORKERS))
     session.headers.update({
         "User-Agent": "MLBStartingNine-DataBot/1.0",
         "Cache-Control": "no-cache",
@@ -518,86 +949,109 @@ def main():
     ump_cache = load_json(UMPIRES_FILE, {}).get('umpires', {})
     park_cache = load_json(PARKS_FILE, {}).get('parks', {})
     
-    API_CALL_TRACKER["odds"] += 1
-    try: odds_data = requests.get("https://weathermlb.com/data/odds.json", timeout=10).json().get('odds', [])
-    except Exception: odds_data = []
-
-    API_CALL_TRACKER["schedule"] += 1
     sport_ids = get_active_sport_ids()
     # Attaching the exact current second to the URL as a cache-buster
     current_timestamp = int(time.time())
     schedule_url = f"https://statsapi.mlb.com/api/v1/schedule?sportId={sport_ids}&startDate={start_date}&endDate={end_date}&hydrate=linescore,probablePitcher,lineups,person&v={current_timestamp}"
-    try: schedule_data = session.get(schedule_url, timeout=15).json()
+    try: schedule_data = client_get(session, schedule_url, "schedule", timeout=15).json()
     except Exception as e:
         print(f"❌ Failed to fetch schedule: {e}")
         return
 
+    run_ctx = freshness.build_run_context(schedule_data, current_est_time)
+    planner.mark_done("schedule", freshness.schedule_policy, run_ctx)
+
+    # 🧹 Deep stats (splits / season / BvP) turn over once a night
+    last_nightly = planner.prior_done.get("deep_stats")
+    is_nightly_refresh = planner.check("deep_stats", freshness.deep_stats_policy, run_ctx)
+    stale_players = None
+    if is_nightly_refresh:
+        # Only players who played since the last refresh have new current-season numbers
+        stale_players = players_played_since(last_nightly, current_est_time)
+        if stale_players is None:
+            print(f"🧹 NIGHTLY REFRESH ACTIVE: No box scores to target with, wiping saved stats to fetch fresh data for the day.")
+        else:
+            print(f"🧹 NIGHTLY REFRESH ACTIVE: Refreshing {len(stale_players)} players who played since the last refresh; everyone else keeps their stats.")
+
+    odds_data = freshness.load_snapshot("odds")
+    if planner.check("odds", freshness.odds_policy, run_ctx) or odds_data is None:
+        track_api_call("odds")
+        try:
+            odds_data = requests.get("https://weathermlb.com/data/odds.json", timeout=10).json().get('odds', [])
+            freshness.save_snapshot("odds", odds_data)
+        except Exception:
+            odds_data = odds_data or []
+            planner.retry("odds")
+
+    # 🎯 Recent Final games into the BvP ledger before any slate reads it (this run is its only writer)
+    try:
+        bvp_ledger.ingest_recent_games(lambda url: fetch_json(session, url, "schedule", timeout=15),
+                                       lambda game_pk: live_feed_store.get_live_feed(game_pk, lambda url: load_live_feed(session, url)))
+    except Exception as e:
+        print(f"   ⚠️ BvP ingest failed, the next run rescans the same games: {e}")
+
     master_dates = {}
+    daily_manifest = load_json(DAILY_MANIFEST_FILE, {})
+    manifest_dirty = False
     
-    # --- CROSS-DATE MEMORY CACHES ---
-    run_cache_splits = {}
-    run_cache_bvp = {}
+    # --- CROSS-DATE MEMORY CACHES (shared by the date workers) ---
+    run_cache_splits = RunCache()
+    run_cache_bvp = RunCache()
+    manifest_lock = threading.Lock()
+    # Splits & season lines shared by every daily file this run writes (game_schema.py)
+    player_stats_table = load_json(PLAYER_STATS_FILE, {})
+    player_stats_table.setdefault("players", {})
+    table_lock = threading.Lock()
 
-    for date_item in schedule_data.get('dates', []):
+    # --- PASS 1: READ MEMORY & PULL LINEUP/DFS SOURCES FOR EVERY DATE ---
+    # Most urgent dates first, so a slow run spends its budget on today's slate
+    def date_order(date_item):
+        days_away = (datetime.strptime(date_item['date'], '%Y-%m-%d').date() - current_est_time.date()).days
+        return (run_budget.date_priority(days_away), date_item['date'])
+
+    def pull_date_sources(date_item):
         date_str = date_item['date']
-        master_dates[date_str] = []
         
-        # CLEAR SLATES PER DATE
-        GLOBAL_SLATES = {'fanduel': {}, 'draftkings': {}}
+        # SLATE NAMES ARE PER DATE
+        slates = new_slate_names()
         
         # --- 📖 READ THE DAILY FILE MEMORY (Updated for Dictionary structure) ---
         daily_file_path = os.path.join(DAILY_FILES_DIR, f'games_{date_str}.json')
         daily_memory = {}
+        existing_data = None
         if os.path.exists(daily_file_path):
             existing_data = load_json(daily_file_path, {})
             # Gracefully handle both old Array structures and new Object structures
-            existing_games = existing_data.get('games', []) if isinstance(existing_data, dict) else existing_data
+            # Memory works on full per-game deepStats; the shared player stats table is only the on-disk layout
+            expanded_data = expand_deep_stats(existing_data, player_stats_table)
+            existing_games = expanded_data.get('games', []) if isinstance(expanded_data, dict) else expanded_data
             for g in existing_games:
                 daily_memory[str(g['gameRaw']['gamePk'])] = g
                 
-        # --- 🤖 TIME GATES FOR BBM & DFF ---
-        target_date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
-        days_away = (target_date_obj - current_est_time.date()).days
+        # --- 🤖 FRESHNESS GATES FOR BBM & DFF ---
+        day_ctx = freshness.build_date_context(date_item, current_est_time)
+        days_away = day_ctx["days_away"]
+        priority = run_budget.date_priority(days_away)
+
+        # ⏳ Out of budget for this priority: keep the daily file as is and stay due next run
+        if not budget.allows(priority):
+            budget.defer(date_str, "sources", "BBM / DFF pulls and game assembly")
+            planner.retry(f"bbm:{date_str}")
+            planner.retry(f"dff:{date_str}")
+            return {"date_item": date_item, "daily_memory": daily_memory, "existing_data": existing_data,
+                    "days_away": days_away, "priority": priority, "deferred": True}
         
         # BBM LOGIC
-        needs_bbm_fetch = True
         bbm_projections_for_date = {}
-        has_real_games = False
-        for g in date_item.get('games', []):
-            if g.get('gameType') in ['R', 'F', 'D', 'L', 'W']:
-                has_real_games = True
-                break
-                
-        if not has_real_games:
-            needs_bbm_fetch = False
+        if not day_ctx["has_real_games"]:
             print(f"   [BBM] Skipping {date_str} - Only Spring Training/Exhibition games scheduled.")
             
-        if needs_bbm_fetch and daily_memory:
+        # The projected lineups already in the daily file say when BBM was last pulled
+        bbm_last_updated = 0
+        if daily_memory:
             first_game = list(daily_memory.values())[0]
-            last_updated = first_game.get('projectedLineups', {}).get('lastUpdated', 0)
-            
-            # --- NEW: 3-TIER CACHE SYSTEM ---
-            if days_away == 0:
-                threshold_seconds = 600       # 10 minutes for Today
-            elif days_away == 1:
-                threshold_seconds = 28800     # 8 hours for Tomorrow
-            else:
-                threshold_seconds = 86400     # 24 hours for the Future
-                
-            if (current_est_time.timestamp() - last_updated) < threshold_seconds:
-                needs_bbm_fetch = False
-
-        if days_away == 0 and needs_bbm_fetch:
-            all_official = True
-            for g in date_item.get('games', []):
-                state = g.get('status', {}).get('abstractGameState', '')
-                if state not in ['Final', 'Postponed', 'Cancelled']:
-                    a_len = len(g.get('lineups', {}).get('awayPlayers', []))
-                    h_len = len(g.get('lineups', {}).get('homePlayers', []))
-                    if a_len == 0 or h_len == 0:
-                        all_official = False
-                        break
-            if all_official: needs_bbm_fetch = False
+            bbm_last_updated = (first_game.get('projectedLineups') or {}).get('lastUpdated', 0)
+        needs_bbm_fetch = planner.check(f"bbm:{date_str}", freshness.bbm_policy, day_ctx, last_done=bbm_last_updated)
 
         if needs_bbm_fetch:
             print(f"   [BBM] Fetching fresh projected lineups for {date_str} (Days Away: {days_away})...")
@@ -605,17 +1059,81 @@ def main():
             time.sleep(1) 
 
         # DFF LOGIC
-        needs_dff_fetch = False
-        if days_away == 0: needs_dff_fetch = True 
-        elif days_away == 1 and current_est_time.hour >= 23: needs_dff_fetch = True 
+        dff_key = f"dff:{date_str}"
+        dff_snapshot = freshness.load_snapshot(f"dff_{date_str}")
+        needs_dff_fetch = planner.check(dff_key, freshness.dff_policy, day_ctx)
+        # Locked slates are served from the last pull; only refetch if that pull is gone
+        if not needs_dff_fetch and dff_snapshot is None and days_away == 0:
+            needs_dff_fetch = True
             
         dff_projections = {}
         has_valid_dfs = False
         if needs_dff_fetch:
-            dff_projections = scrape_dff_projections(date_str)
+            dff_projections, slates = scrape_dff_projections(date_str)
             has_valid_dfs = len(dff_projections) > 0
-            if not has_valid_dfs:
+            if has_valid_dfs:
+                freshness.save_snapshot(f"dff_{date_str}", {"projections": dff_projections, "slates": slates})
+            else:
+                planner.retry(dff_key)
                 print(f"⚠️ Safety Valve Triggered: DFF scrape for {date_str} failed or was empty. Skipping injection.")
+        elif dff_snapshot:
+            dff_projections = dff_snapshot.get("projections", {})
+            slates = dff_snapshot.get("slates", slates)
+            has_valid_dfs = len(dff_projections) > 0
+
+        return {
+            "date_item": date_item,
+            "daily_memory": daily_memory,
+            "existing_data": existing_data,
+            # Taken now: assembly updates the remembered games in place
+            "game_facts": {pk: lineup_events.game_facts(g) for pk, g in daily_memory.items()},
+            "days_away": days_away,
+            "priority": priority,
+            "deferred": False,
+            "nightly_refresh": is_nightly_refresh and date_str >= today_est_str,
+            "stale_players": stale_players,
+            "needs_bbm_fetch": needs_bbm_fetch,
+            "bbm_projections_for_date": bbm_projections_for_date,
+            "dff_projections": dff_projections,
+            "has_valid_dfs": has_valid_dfs,
+            "slates": slates
+        }
+
+    # Workers pick dates up in priority order, so today's pulls start first
+    with ThreadPoolExecutor(max_workers=DATE_WORKERS) as pool:
+        date_contexts = list(pool.map(pull_date_sources, sorted(schedule_data.get('dates', []), key=date_order)))
+
+    # --- PASS 2: FETCH EVERY MISSING DEEP STAT IN PARALLEL ---
+    # Handedness first: one slate-wide /people call, and only for never-seen players
+    handedness_registry.resolve_missing(collect_slate_player_ids(date_contexts), lambda url: fetch_json(session, url, "people", timeout=5))
+    prefetch_deferred = run_deep_stat_prefetch(session, date_contexts, run_cache_splits, run_cache_bvp, budget, current_est_time.timestamp())
+    for ctx in date_contexts:
+        if ctx["date_item"]['date'] in prefetch_deferred and not ctx["deferred"]:
+            budget.defer(ctx["date_item"]['date'], "deep_stats", "prefetch skipped; assembly would fetch them one at a time")
+            ctx["deferred"] = True
+
+    # --- PASS 3: ASSEMBLE GAMES FROM MEMORY + RUN CACHES ---
+    def assemble_date(ctx):
+        nonlocal manifest_dirty
+        date_item = ctx["date_item"]
+        date_str = date_item['date']
+        if not ctx["deferred"] and not budget.allows(ctx["priority"]):
+            budget.defer(date_str, "assembly")
+            ctx["deferred"] = True
+        if ctx["deferred"]:
+            # The daily file stays exactly as the last run left it
+            planner.retry(f"bbm:{date_str}")
+            return
+        master_dates[date_str] = []
+        daily_memory = ctx["daily_memory"]
+        days_away = ctx["days_away"]
+        needs_bbm_fetch = ctx["needs_bbm_fetch"]
+        bbm_projections_for_date = ctx["bbm_projections_for_date"]
+        dff_projections = ctx["dff_projections"]
+        has_valid_dfs = ctx["has_valid_dfs"]
+        dff_team_hashes = hash_dff_by_team(dff_projections) if has_valid_dfs else {}
+        dff_index = dff_name_index.build_index(dff_projections) if has_valid_dfs else {}
+        reused_games = 0
                 
         def inject_dfs(player_obj, team_abbr, is_pitcher_slot=False):
             if not player_obj: return
@@ -629,24 +1147,8 @@ def main():
             # --- OHTANI FIX: PRIORITIZE THE CORRECT SUFFIX ---
             suffixes = ['_P', '_B'] if is_pitcher_slot else ['_B', '_P']
             
-            dff_p = None
-            for suffix in suffixes:
-                p_key = f"{team_abbr}_{clean_name}{suffix}"
-                if p_key in dff_projections:
-                    dff_p = dff_projections[p_key]
-                    break
-            
-            if not dff_p:
-                parts = clean_name.split()
-                if len(parts) >= 2:
-                    for suffix in suffixes:
-                        for d_key, d_val in dff_projections.items():
-                            if d_key.startswith(f"{team_abbr}_") and d_key.endswith(suffix):
-                                d_name = d_key.split('_')[1]
-                                if parts[-1] in d_name and d_name.startswith(parts[0][0]):
-                                    dff_p = d_val
-                                    break
-                        if dff_p: break
+            dff_key = dff_name_index.resolve(dff_projections, dff_index, team_abbr, clean_name, suffixes, player_obj.get('id'))
+            dff_p = dff_projections.get(dff_key) if dff_key else None
             
             if dff_p and (dff_p.get('salary', 0) > 0 or dff_p.get('dk_salary', 0) > 0):
                 player_obj['salary'], player_obj['proj'], player_obj['value'] = dff_p.get('salary', 0), dff_p.get('proj', 0), dff_p.get('value', 0)
@@ -664,17 +1166,18 @@ def main():
             existing_game_state = daily_memory.get(game_pk, {})
             
             # 🌙 NIGHTLY REFRESH LOGIC
-            if is_nightly_refresh and date_str >= today_est_str:
-                game_deep_stats = {}
+            stale_deep_stats = existing_game_state.get('deepStats', {})
+            game_deep_stats = memory_deep_stats(ctx, existing_game_state)
+            if ctx["nightly_refresh"]:
                 lineup_tracking = {'away': {}, 'home': {}}
             else:
-                game_deep_stats = existing_game_state.get('deepStats', {})
                 lineup_tracking = existing_game_state.get('lineupTracking', {'away': {}, 'home': {}})
                 
             game_positions = existing_game_state.get('gamePositions', {})
             lineup_handedness = existing_game_state.get('lineupHandedness', {})
             hp_umpire = existing_game_state.get('hpUmpire', "TBD")
             ump_stats = ump_cache.get(hp_umpire) if hp_umpire != "TBD" else None
+            park_stats = park_cache.get(game.get('venue', {}).get('name'))
             
             teams = game.get('teams', {})
             away_team_name = teams.get('away', {}).get('team', {}).get('name', '')
@@ -708,23 +1211,51 @@ def main():
             away_starter_id = str(away_starter.get('id')) if away_starter else None
             home_starter_id = str(home_starter.get('id')) if home_starter else None
             
+            # --- ♻️ CHANGE DETECTION: SKIP GAMES WHOSE INPUTS DIDN'T MOVE ---
+            # BBM isn't refetched every run, so carry the last BBM hash forward when we're reading from memory
+            prior_fingerprint = existing_game_state.get('inputFingerprint') or {}
+            game_fingerprint = {
+                "schedule": fingerprint(game),
+                "odds": fingerprint(game_odds),
+                "bbm": fingerprint([bbm_projections_for_date.get(f"{away_team_id}_{game_num}"), bbm_projections_for_date.get(f"{home_team_id}_{game_num}")]) if needs_bbm_fetch else prior_fingerprint.get('bbm'),
+                "dff": fingerprint([dff_team_hashes.get(get_dff_team_abbr(away_team_name)), dff_team_hashes.get(get_dff_team_abbr(home_team_name))]) if has_valid_dfs else None,
+                # umpires.json / parks.json are rebuilt on their own schedules
+                "umpire": fingerprint([hp_umpire, ump_stats]),
+                "park": fingerprint(park_stats),
+                "today": date_str == today_est_str,
+                "schema": GAME_RAW_SCHEMA_VERSION
+            }
+            
+            # In-progress games and games still missing umpire/positions must keep hitting the live feed
+            has_official_lineup = len(game.get('lineups', {}).get('awayPlayers', [])) > 0 or len(game.get('lineups', {}).get('homePlayers', [])) > 0
+            needs_live_refresh = date_str == today_est_str and has_official_lineup and (
+                game.get('status', {}).get('abstractGameState', '') == 'Live' or hp_umpire == "TBD" or not game_positions
+            )
+            
+            # A game left with outage stand-ins or unstamped BvP lines is rebuilt, so the prefetch's results land
+            if (existing_game_state and prior_fingerprint == game_fingerprint and not ctx["nightly_refresh"] and not needs_live_refresh
+                    and not deep_stats_incomplete(game_deep_stats, (away_starter_id, home_starter_id))):
+                reused_game = dict(existing_game_state)
+                if needs_bbm_fetch:
+                    # Keep the BBM freshness clock honest even though the payload was identical
+                    reused_game["projectedLineups"] = {**(reused_game.get("projectedLineups") or {}), "lastUpdated": current_est_time.timestamp()}
+                master_dates[date_str].append(reused_game)
+                reused_games += 1
+                continue
+            
             for p_id, p_data in [(away_starter_id, away_starter), (home_starter_id, home_starter)]:
-                if p_id and (p_id not in game_deep_stats or "season" not in game_deep_stats[p_id]):
+                if p_id and needs_deep_stats(game_deep_stats.get(p_id, {})):
                     # Check our script memory first
                     if p_id not in run_cache_splits:
                         print(f"   [NEW] Fetching Pitcher Splits & Season Stats for {p_data['fullName']}...")
-                        run_cache_splits[p_id] = {
-                            "split_vL": game_deep_stats.get(p_id, {}).get("split_vL") or fetch_combined_splits(session, p_id, 'vl', group_type="pitching"),
-                            "split_vR": game_deep_stats.get(p_id, {}).get("split_vR") or fetch_combined_splits(session, p_id, 'vr', group_type="pitching"),
-                            "season": game_deep_stats.get(p_id, {}).get("season") or fetch_season_stats(session, p_id, group_type="pitching")
-                        }
+                    pitcher_stats = run_cache_splits.get_or_fetch(p_id, lambda: resolve_deep_stats(session, p_id, "pitching", game_deep_stats.get(p_id, {}), stale_deep_stats.get(p_id, {})))
                     
                     game_deep_stats[p_id] = {
                         "name": p_data['fullName'], 
                         "is_pitcher": True,
-                        "split_vL": run_cache_splits[p_id]["split_vL"],
-                        "split_vR": run_cache_splits[p_id]["split_vR"],
-                        "season": run_cache_splits[p_id]["season"]
+                        "split_vL": pitcher_stats["split_vL"],
+                        "split_vR": pitcher_stats["split_vR"],
+                        "season": pitcher_stats["season"]
                     }
 
             # --- CRITICAL FIX: BULK FETCH HANDEDNESS FOR ALL PLAYERS ---
@@ -771,23 +1302,17 @@ def main():
             for p in away_lineup + home_lineup + away_proj + home_proj:
                 if 'id' in p: all_pids.add(str(p['id']))
             
-            # Bulk fetch the missing handedness from MLB People API
-            if all_pids:
-                try:
-                    people_data = session.get(f"https://statsapi.mlb.com/api/v1/people?personIds={','.join(all_pids)}", timeout=5).json()
-                    for person in people_data.get('people', []):
-                        pid = str(person['id'])
-                        bat_side = person.get('batSide', {}).get('code')
-                        if bat_side:
-                            lineup_handedness[pid] = bat_side
-                except Exception:
-                    pass
+            # Bat sides come from the persisted registry (resolved slate-wide in pass 2)
+            for pid in all_pids:
+                bat_side = handedness_registry.bat_side(pid)
+                if bat_side:
+                    lineup_handedness[pid] = bat_side
 
             # Ensure Pitchers get their handedness assigned too
-            if away_starter and away_starter.get('pitchHand'):
-                lineup_handedness[str(away_starter['id'])] = away_starter['pitchHand'].get('code')
-            if home_starter and home_starter.get('pitchHand'):
-                lineup_handedness[str(home_starter['id'])] = home_starter['pitchHand'].get('code')
+            for starter in (away_starter, home_starter):
+                if starter and starter.get('pitchHand'):
+                    lineup_handedness[str(starter['id'])] = starter['pitchHand'].get('code')
+                    handedness_registry.record(starter['id'], pitch=starter['pitchHand'].get('code'))
             # -------------------------------------------------------------------------------------
 
             # 2. Combine Official and Projected lists to fetch Deep Stats
@@ -806,16 +1331,11 @@ def main():
                     game_deep_stats[batter_id] = {"name": batter_name}
                     
                 # 1. Fetch Splits & Season (Only if missing from memory)
-                if "split_vL" not in game_deep_stats[batter_id] or "season" not in game_deep_stats[batter_id]:
-                    if batter_id not in run_cache_splits:
-                        run_cache_splits[batter_id] = {
-                            "split_vL": game_deep_stats.get(batter_id, {}).get("split_vL") or fetch_combined_splits(session, batter_id, 'vl'), 
-                            "split_vR": game_deep_stats.get(batter_id, {}).get("split_vR") or fetch_combined_splits(session, batter_id, 'vr'),
-                            "season": game_deep_stats.get(batter_id, {}).get("season") or fetch_season_stats(session, batter_id, group_type="hitting")
-                        }
-                    game_deep_stats[batter_id]["split_vL"] = run_cache_splits[batter_id]["split_vL"]
-                    game_deep_stats[batter_id]["split_vR"] = run_cache_splits[batter_id]["split_vR"]
-                    game_deep_stats[batter_id]["season"] = run_cache_splits[batter_id]["season"]
+                if needs_deep_stats(game_deep_stats[batter_id]):
+                    batter_stats = run_cache_splits.get_or_fetch(batter_id, lambda: resolve_deep_stats(session, batter_id, "hitting", game_deep_stats.get(batter_id, {}), stale_deep_stats.get(batter_id, {})))
+                    game_deep_stats[batter_id]["split_vL"] = batter_stats["split_vL"]
+                    game_deep_stats[batter_id]["split_vR"] = batter_stats["split_vR"]
+                    game_deep_stats[batter_id]["season"] = batter_stats["season"]
                     
                 # 2. Fetch BvP (Refetch automatically if the Pitcher changed)
                 current_bvp = game_deep_stats[batter_id].get("bvp", {})
@@ -823,13 +1343,16 @@ def main():
                 
                 if home_starter_id and saved_pitcher_id != home_starter_id:
                     bvp_key = f"{batter_id}_{home_starter_id}"
-                    if bvp_key not in run_cache_bvp:
-                        run_cache_bvp[bvp_key] = fetch_bvp(session, batter_id, home_starter_id)
+                    bvp_line = run_cache_bvp.get_or_fetch(bvp_key, lambda: resolve_bvp(session, batter_id, home_starter_id))
                     
                     # Copy the stats and stamp the new pitcher's ID into memory
-                    bvp_stats = dict(run_cache_bvp[bvp_key])
-                    bvp_stats["pitcher_id"] = home_starter_id
-                    game_deep_stats[batter_id]["bvp"] = bvp_stats
+                    if bvp_line is not None:
+                        bvp_stats = dict(bvp_line)
+                        bvp_stats["pitcher_id"] = home_starter_id
+                        game_deep_stats[batter_id]["bvp"] = bvp_stats
+                    else:
+                        # Endpoint down: an unstamped empty line keeps the pair due for the next run
+                        game_deep_stats[batter_id]["bvp"] = {**bvp_ledger.EMPTY_BVP, "stale": True}
                     
                 elif not home_starter_id and "bvp" not in game_deep_stats[batter_id]:
                     game_deep_stats[batter_id]["bvp"] = {"ab": 0, "hits": 0, "hr": 0, "avg": "-", "ops": "-"}
@@ -845,16 +1368,11 @@ def main():
                     game_deep_stats[batter_id] = {"name": batter_name}
                     
                 # 1. Fetch Splits & Season (Only if missing from memory)
-                if "split_vL" not in game_deep_stats[batter_id] or "season" not in game_deep_stats[batter_id]:
-                    if batter_id not in run_cache_splits:
-                        run_cache_splits[batter_id] = {
-                            "split_vL": game_deep_stats.get(batter_id, {}).get("split_vL") or fetch_combined_splits(session, batter_id, 'vl'), 
-                            "split_vR": game_deep_stats.get(batter_id, {}).get("split_vR") or fetch_combined_splits(session, batter_id, 'vr'),
-                            "season": game_deep_stats.get(batter_id, {}).get("season") or fetch_season_stats(session, batter_id, group_type="hitting")
-                        }
-                    game_deep_stats[batter_id]["split_vL"] = run_cache_splits[batter_id]["split_vL"]
-                    game_deep_stats[batter_id]["split_vR"] = run_cache_splits[batter_id]["split_vR"]
-                    game_deep_stats[batter_id]["season"] = run_cache_splits[batter_id]["season"]
+                if needs_deep_stats(game_deep_stats[batter_id]):
+                    batter_stats = run_cache_splits.get_or_fetch(batter_id, lambda: resolve_deep_stats(session, batter_id, "hitting", game_deep_stats.get(batter_id, {}), stale_deep_stats.get(batter_id, {})))
+                    game_deep_stats[batter_id]["split_vL"] = batter_stats["split_vL"]
+                    game_deep_stats[batter_id]["split_vR"] = batter_stats["split_vR"]
+                    game_deep_stats[batter_id]["season"] = batter_stats["season"]
                     
                 # 2. Fetch BvP (Refetch automatically if the Pitcher changed)
                 current_bvp = game_deep_stats[batter_id].get("bvp", {})
@@ -862,28 +1380,25 @@ def main():
                 
                 if away_starter_id and saved_pitcher_id != away_starter_id:
                     bvp_key = f"{batter_id}_{away_starter_id}"
-                    if bvp_key not in run_cache_bvp:
-                        run_cache_bvp[bvp_key] = fetch_bvp(session, batter_id, away_starter_id)
+                    bvp_line = run_cache_bvp.get_or_fetch(bvp_key, lambda: resolve_bvp(session, batter_id, away_starter_id))
                     
                     # Copy the stats and stamp the new pitcher's ID into memory
-                    bvp_stats = dict(run_cache_bvp[bvp_key])
-                    bvp_stats["pitcher_id"] = away_starter_id
-                    game_deep_stats[batter_id]["bvp"] = bvp_stats
+                    if bvp_line is not None:
+                        bvp_stats = dict(bvp_line)
+                        bvp_stats["pitcher_id"] = away_starter_id
+                        game_deep_stats[batter_id]["bvp"] = bvp_stats
+                    else:
+                        # Endpoint down: an unstamped empty line keeps the pair due for the next run
+                        game_deep_stats[batter_id]["bvp"] = {**bvp_ledger.EMPTY_BVP, "stale": True}
                     
                 elif not away_starter_id and "bvp" not in game_deep_stats[batter_id]:
                     game_deep_stats[batter_id]["bvp"] = {"ab": 0, "hits": 0, "hr": 0, "avg": "-", "ops": "-"}
 
-            game_state = game.get('status', {}).get('abstractGameState', '')
-            needs_live_feed = False
-            
-            if date_str == today_est_str and (len(away_lineup) > 0 or len(home_lineup) > 0):
-                if game_state != 'Final': needs_live_feed = True
-                elif hp_umpire == "TBD" or not game_positions: needs_live_feed = True
+            needs_live_feed = freshness.live_feed_due(game, date_str == today_est_str, hp_umpire, game_positions)
 
             if needs_live_feed:
                 try:
-                    API_CALL_TRACKER["live_feed"] += 1
-                    live_data = session.get(f"https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live", timeout=5).json()
+                    live_data = live_feed_store.get_live_feed(game_pk, lambda url: load_live_feed(session, url))
                     
                     officials = live_data.get('liveData', {}).get('boxscore', {}).get('officials', [])
                     hp = next((o for o in officials if o.get('officialType') == 'Home Plate'), None)
@@ -903,7 +1418,9 @@ def main():
                         elif p_val.get('allPositions'): 
                             game_positions[pid] = p_val['allPositions'][0].get('abbreviation')
                             
-                        if p_val.get('person', {}).get('batSide'): lineup_handedness[pid] = p_val['person']['batSide'].get('code')
+                        if p_val.get('person', {}).get('batSide'):
+                            lineup_handedness[pid] = p_val['person']['batSide'].get('code')
+                            handedness_registry.record(pid, bat=lineup_handedness[pid])
                 except Exception: pass
                 
             if needs_bbm_fetch:
@@ -936,8 +1453,14 @@ def main():
                 for batter in game.get('lineups', {}).get('homePlayers', []):
                     inject_dfs(batter, home_abbr, is_pitcher_slot=False)
 
+            # Persist only the gameRaw fields the generators & front-end actually read
+            slim_raw = slim_game_raw(game)
+            schema_errors = validate_game_raw(slim_raw)
+            if schema_errors:
+                print(f"   ⚠️ gameRaw schema check failed for {game_pk}: {'; '.join(schema_errors[:3])}")
+
             master_dates[date_str].append({
-                "gameRaw": game,
+                "gameRaw": slim_raw,
                 "projectedLineups": game_projected_lineups,
                 "odds": game_odds,
                 "lineupTracking": lineup_tracking,
@@ -946,61 +1469,124 @@ def main():
                 "deepStats": game_deep_stats,
                 "hpUmpire": hp_umpire,
                 "umpStats": ump_stats,
-                "parkStats": park_cache.get(game.get('venue', {}).get('name'))
+                "parkStats": park_stats,
+                # The live feed may have just assigned the umpire; next run compares against what was stored
+                "inputFingerprint": {**game_fingerprint, "umpire": fingerprint([hp_umpire, ump_stats])}
             })
 
+        if reused_games:
+            print(f"♻️  {date_str}: {reused_games}/{len(master_dates[date_str])} games unchanged, copied from the daily file.")
+
         # Save Daily File
         formatted_slates = {
-            "fanduel": [{"id": k, "name": v} for k, v in GLOBAL_SLATES['fanduel'].items()],
-            "draftkings": [{"id": k, "name": v} for k, v in GLOBAL_SLATES['draftkings'].items()]
+            "fanduel": [{"id": k, "name": v} for k, v in ctx["slates"]['fanduel'].items()],
+            "draftkings": [{"id": k, "name": v} for k, v in ctx["slates"]['draftkings'].items()]
         }
 
         # ALWAYS save as the new Object structure to standardize the Frontend
+        # Splits & season lines go to the shared table once per player, not once per game and date
+        player_rows, slim_games = normalize_deep_stats(master_dates[date_str])
         final_output = {
             "last_updated": current_est_time.strftime("%b %d, %I:%M %p ET"),
+            "schema_version": GAME_RAW_SCHEMA_VERSION,
             "slates": formatted_slates if has_valid_dfs else {"fanduel": [], "draftkings": []},
-            "games": master_dates[date_str]
+            "playerStatsRef": player_stats_ref(date_str),
+            "games": slim_games
         }
 
         # THE SAVE GATE: Only process Yesterday, Today, Tomorrow, OR if we pulled fresh future projections
         if days_away <= 1 or needs_bbm_fetch:
-            daily_file = os.path.join(DAILY_FILES_DIR, f'games_{date_str}.json')
+            file_name = f'games_{date_str}.json'
+            daily_file = os.path.join(DAILY_FILES_DIR, file_name)
+            # The date's table rows count as part of the file: a new season line alone still saves
+            new_hash = payload_hash({**final_output, "playerStatsRows": player_rows})
             
-            should_save = True
-            if os.path.exists(daily_file):
-                try:
-                    with open(daily_file, 'r') as f:
-                        old_data = json.load(f)
-                    
-                    # Create shallow copies so we don't delete the timestamp from the actual output
-                    old_compare = dict(old_data)
-                    new_compare = dict(final_output)
-                    
-                    # Ignore the timestamp since it changes every single run
-                    old_compare.pop("last_updated", None)
-                    new_compare.pop("last_updated", None)
-                    
-                    # Deep compare every single stat, lineup, and odds value
-                    if old_compare == new_compare:
-                        should_save = False
-                except Exception:
-                    pass # If the old file is corrupted or unreadable, default to saving over it
+            # O(1) gate: compare against the hash recorded when the file was last written.
+            # Files from before the manifest existed get hashed once from the copy already in memory.
+            old_hash = daily_manifest.get(file_name, {}).get("hash")
+            if old_hash is None and isinstance(ctx["existing_data"], dict):
+                old_hash = payload_hash(ctx["existing_data"])
+            should_save = not os.path.exists(daily_file) or old_hash != new_hash
             
             if should_save:
+                # Log what changed per game before the file moves on, so the generators can rebuild just that
+                events = []
+                for entry in master_dates[date_str]:
+                    pk = str(entry['gameRaw']['gamePk'])
+                    events.extend(lineup_events.diff_game(date_str, pk, ctx["game_facts"].get(pk), lineup_events.game_facts(entry)))
+                lineup_events.append_events(events)
+                # Table first: the daily file never points at rows that aren't on disk yet
+                with table_lock:
+                    set_date_rows(player_stats_table, date_str, player_rows)
+                    save_player_stats_table(player_stats_table, PLAYER_STATS_FILE)
                 save_json(daily_file, final_output)
+                with manifest_lock:
+                    daily_manifest[file_name] = {
+                        "hash": new_hash,
+                        "changed_at": current_est_time.isoformat(timespec='seconds'),
+                        "games": len(master_dates[date_str])
+                    }
+                    manifest_dirty = True
                 print(f"✅ Created/Updated {daily_file} with {len(master_dates[date_str])} games.")
             else:
                 print(f"🛑 No data changes for {date_str}. Skipped file overwrite to prevent GitHub build.")
         else:
             print(f"⏩ Skipped saving {date_str} (Future game with no fresh BBM data).")
 
+    # Each date writes its own daily file; the shared caches keep workers from fetching the same player twice
+    with ThreadPoolExecutor(max_workers=DATE_WORKERS) as pool:
+        list(pool.map(assemble_date, date_contexts))
+
+    # --- SEAL DATES THIS RUN NO LONGER WRITES ---
+    # Their rows fold back into the daily file and leave the shared table, so past files stay self-contained
+    sealed_dates = sorted(d for d in table_dates(player_stats_table) if d < start_date)
+    for date_str in sealed_dates:
+        file_name = f'games_{date_str}.json'
+        daily_file = os.path.join(DAILY_FILES_DIR, file_name)
+        past_data = load_json(daily_file, None) if os.path.exists(daily_file) else None
+        if isinstance(past_data, dict) and past_data.get('playerStatsRef'):
+            sealed = expand_deep_stats(past_data, player_stats_table)
+            save_json(daily_file, sealed)
+            daily_manifest[file_name] = {**daily_manifest.get(file_name, {}), "hash": payload_hash(sealed)}
+            manifest_dirty = True
+        set_date_rows(player_stats_table, date_str, {})
+    if sealed_dates:
+        save_player_stats_table(player_stats_table, PLAYER_STATS_FILE)
+        print(f"📦 Sealed {', '.join(sealed_dates)}: player stats folded back into the daily file.")
+
+    if manifest_dirty:
+        save_json(DAILY_MANIFEST_FILE, daily_manifest)
+
+    # Persist next-due times so the next run can exit early when nothing is due
+    planner.save()
+    planner.print_plan()
+    budget.save_log(current_est_time.isoformat(timespec='seconds'))
+
     # --- PRINT API METRICS ---
     total_calls = sum(API_CALL_TRACKER.values())
     print("\n" + "="*40)
     print(f"📊 API CALL SUMMARY: {total_calls} Total Requests")
     print("="*40)
     for k, v in API_CALL_TRACKER.items(): print(f"  - {k.replace('_', ' ').title()}: {v}")
+    latencies = API_TIMING_TRACKER["latencies_ms"]
+    print("-"*40)
+    print(f"  - Wall Clock: {time.perf_counter() - API_TIMING_TRACKER['run_started']:.1f}s (Prefetch: {API_TIMING_TRACKER['prefetch_seconds']:.1f}s)")
+    print(f"  - Latency p50/p90/p99: {latency_percentile(latencies, 50):.0f} / {latency_percentile(latencies, 90):.0f} / {latency_percentile(latencies, 99):.0f} ms ({len(latencies)} timed)")
+    budget.print_summary()
+    statsapi_client.print_client_summary()
+    statsapi_cache.print_cache_summary()
+    live_feed_store.print_feed_summary()
+    lineup_events.print_event_summary()
     print("="*40 + "\n")
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        split_ledger.save_ledger()
+        bvp_ledger.save_ledger()
+        dff_name_index.save_cache()
+        handedness_registry.save_registry()
+        live_feed_store.prune_old_feeds()
+        lineup_events.prune_events()
+        statsapi_cache.close()
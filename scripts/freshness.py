@@ -0,0 +1,244 @@
+import os
+import json
+import time
+import threading
+from datetime import datetime, timedelta, timezone
+
+# ==========================================================
+# --- DECLARATIVE FRESHNESS POLICIES ---
+# ==========================================================
+# Every data source fetch_matchups.py pulls declares when it is next due as a
+# function of game state and time to first pitch. Each run checks its sources
+# through a RunPlanner, does only the due work, and persists the next-due
+# timestamps. When nothing is due the next run exits before touching the
+# network. Sources that are not due are served from the snapshot of their last
+# fetch (data/cache/snapshots, kept between runs by actions/cache).
+#
+# A policy is policy(ctx, last_done, now) -> next-due epoch, or None when the
+# source is not needed at all. last_done is None when it has never run.
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(SCRIPT_DIR, '..', 'data', 'cache')
+STATE_FILE = os.path.join(CACHE_DIR, 'freshness_state.json')
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, 'snapshots')
+
+QUIET_HOURS = (4, 8)          # 4–8 AM ET: nothing is due (the old deep sleep check)
+NIGHTLY_ROLLOVER_HOUR = 3     # Deep stats (splits / season / BvP) turn over once a night
+SNAPSHOT_RETENTION_DAYS = 3
+
+LINEUP_WINDOW_SECONDS = 3 * 3600   # Lineups post ~3h before first pitch: poll every run inside it
+IDLE_SCHEDULE_TTL = 3600           # Nothing live and no game left to start today
+PREGAME_SCHEDULE_TTL = 900         # Games later today, lineups not close yet
+BBM_TTL_BY_DAYS_AWAY = {0: 600, 1: 28800}   # 10 min today, 8 h tomorrow...
+BBM_FUTURE_TTL = 86400                       # ...24 h for anything further out
+DFF_TOMORROW_OPEN_HOUR = 23                  # Tomorrow's DFF slates are pulled from 11 PM ET
+FINISHED_ODDS_TTL = 1800
+
+REAL_GAME_TYPES = ['R', 'F', 'D', 'L', 'W']
+DONE_STATES = ['Final', 'Postponed', 'Cancelled']
+
+def in_quiet_hours(now):
+    return QUIET_HOURS[0] <= now.hour < QUIET_HOURS[1]
+
+def next_rollover(ts, tz):
+    moment = datetime.fromtimestamp(ts, tz)
+    rollover = moment.replace(hour=NIGHTLY_ROLLOVER_HOUR, minute=0, second=0, microsecond=0)
+    if rollover <= moment:
+        rollover += timedelta(days=1)
+    return rollover.timestamp()
+
+def _game_start(game):
+    try:
+        return datetime.strptime(game.get('gameDate', ''), "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return None
+
+# ==========================================================
+# --- CONTEXTS ---
+# ==========================================================
+def build_run_context(schedule_data, now):
+    """Slate-wide state the run-level policies look at. next_first_pitch = today's next unstarted game."""
+    today_str = now.strftime('%Y-%m-%d')
+    any_live, next_first_pitch = False, None
+    for date_item in schedule_data.get('dates', []):
+        for game in date_item.get('games', []):
+            state = game.get('status', {}).get('abstractGameState', '')
+            if state == 'Live': any_live = True
+            if date_item['date'] != today_str or state != 'Preview': continue
+            start = _game_start(game)
+            if start and (next_first_pitch is None or start < next_first_pitch):
+                next_first_pitch = start
+    return {"tz": now.tzinfo, "today": today_str, "any_live": any_live, "next_first_pitch": next_first_pitch}
+
+def build_date_context(date_item, now):
+    """Per-date state the BBM / DFF policies look at."""
+    games = date_item.get('games', [])
+    target_date_obj = datetime.strptime(date_item['date'], '%Y-%m-%d').date()
+    all_official = True
+    for g in games:
+        if g.get('status', {}).get('abstractGameState', '') in DONE_STATES: continue
+        if not g.get('lineups', {}).get('awayPlayers') or not g.get('lineups', {}).get('homePlayers'):
+            all_official = False
+            break
+    return {
+        "tz": now.tzinfo,
+        "date": date_item['date'],
+        "days_away": (target_date_obj - now.date()).days,
+        "has_real_games": any(g.get('gameType') in REAL_GAME_TYPES for g in games),
+        "all_lineups_official": all_official,
+        "all_started": all(g.get('status', {}).get('abstractGameState', '') != 'Preview' for g in games)
+    }
+
+# ==========================================================
+# --- POLICIES ---
+# ==========================================================
+def schedule_policy(run, last_done, now):
+    if last_done is None: return now
+    if run["any_live"]: return last_done
+    if run["next_first_pitch"] and run["next_first_pitch"] - now <= LINEUP_WINDOW_SECONDS: return last_done
+    if run["next_first_pitch"]: return last_done + PREGAME_SCHEDULE_TTL
+    return last_done + IDLE_SCHEDULE_TTL
+
+def odds_policy(run, last_done, now):
+    if last_done is None: return now
+    if run["any_live"] or run["next_first_pitch"]: return last_done
+    return last_done + FINISHED_ODDS_TTL
+
+def deep_stats_policy(run, last_done, now):
+    # First ever run: don't wipe, just start the nightly clock
+    return next_rollover(last_done if last_done is not None else now, run["tz"])
+
+def bbm_policy(day, last_done, now):
+    if not day["has_real_games"]: return None
+    if day["days_away"] == 0 and day["all_lineups_official"]: return None
+    ttl = BBM_TTL_BY_DAYS_AWAY.get(day["days_away"], BBM_FUTURE_TTL)
+    return (last_done or 0) + ttl
+
+def dff_policy(day, last_done, now):
+    if day["days_away"] == 0:
+        # Slates lock once every game has started; the last pull stays valid after that
+        return None if day["all_started"] and last_done else (last_done or now)
+    if day["days_away"] == 1:
+        day_before = datetime.strptime(day["date"], '%Y-%m-%d').replace(tzinfo=day["tz"]) - timedelta(days=1)
+        opens_at = day_before.replace(hour=DFF_TOMORROW_OPEN_HOUR).timestamp()
+        return max(opens_at, last_done or 0)
+    return None
+
+def live_feed_due(game, is_today, hp_umpire, game_positions):
+    """Per game, checked every run: in-progress games, or finished ones still missing umpire/positions."""
+    lineups = game.get('lineups', {})
+    if not is_today or not (lineups.get('awayPlayers') or lineups.get('homePlayers')): return False
+    if game.get('status', {}).get('abstractGameState', '') != 'Final': return True
+    return hp_umpire == "TBD" or not game_positions
+
+# ==========================================================
+# --- SNAPSHOTS OF NOT-DUE SOURCES ---
+# ==========================================================
+def save_snapshot(name, data):
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    path = os.path.join(SNAPSHOT_DIR, f"{name}.json")
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def load_snapshot(name):
+    path = os.path.join(SNAPSHOT_DIR, f"{name}.json")
+    if not os.path.exists(path): return None
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return None
+
+def prune_snapshots():
+    if not os.path.isdir(SNAPSHOT_DIR): return
+    cutoff = time.time() - SNAPSHOT_RETENTION_DAYS * 86400
+    for name in os.listdir(SNAPSHOT_DIR):
+        path = os.path.join(SNAPSHOT_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff: os.remove(path)
+        except OSError:
+            pass
+
+# ==========================================================
+# --- RUN PLANNER ---
+# ==========================================================
+class RunPlanner:
+    def __init__(self, now):
+        self.now_dt = now
+        self.now = now.timestamp()
+        state = {}
+        if os.path.exists(STATE_FILE):
+            try:
+                with open(STATE_FILE, 'r') as f:
+                    state = json.load(f) or {}
+            except (json.JSONDecodeError, OSError):
+                state = {}
+        self.prior_done = state.get('done', {})
+        self.prior_next_due = state.get('next_due', {})
+        self.done = {}
+        self.next_due = {}
+        self.due_keys = []
+        self._lock = threading.Lock()   # Date workers check their own keys concurrently
+
+    def next_run_due(self):
+        """Earliest persisted next-due time from the last run, or None when there is no plan yet."""
+        if not self.prior_next_due: return None
+        return min(self.prior_next_due.values())
+
+    def can_skip_run(self):
+        due_at = self.next_run_due()
+        return due_at is not None and due_at > self.now
+
+    def check(self, key, policy, ctx, last_done=None):
+        """Evaluates a source's policy. Returns True when it is due (and books it as done now)."""
+        with self._lock:
+            return self._check(key, policy, ctx, last_done)
+
+    def _check(self, key, policy, ctx, last_done):
+        last = last_done if last_done is not None else self.prior_done.get(key)
+        due_at = policy(ctx, last, self.now)
+        # Never run yet, but an earlier run already booked a time for it (e.g. the first nightly rollover)
+        if due_at is not None and last is None and key in self.prior_next_due:
+            due_at = min(due_at, self.prior_next_due[key])
+        if due_at is None:
+            if last is not None: self.done[key] = last
+            return False
+        if due_at <= self.now:
+            self.done[key] = self.now
+            self.due_keys.append(key)
+            next_due = policy(ctx, self.now, self.now)
+            if next_due is not None: self.next_due[key] = next_due
+            return True
+        if last is not None: self.done[key] = last
+        self.next_due[key] = due_at
+        return False
+
+    def mark_done(self, key, policy, ctx):
+        """Books work that always happens once the run proceeds (e.g. the schedule pull)."""
+        with self._lock:
+            self.done[key] = self.now
+            due_at = policy(ctx, self.now, self.now)
+            if due_at is not None: self.next_due[key] = due_at
+
+    def retry(self, key):
+        """The due work failed: keep it due for the next run."""
+        with self._lock:
+            self.next_due[key] = self.now
+            if key in self.prior_done: self.done[key] = self.prior_done[key]
+            else: self.done.pop(key, None)
+
+    def save(self):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = STATE_FILE + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({"done": self.done, "next_due": self.next_due}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, STATE_FILE)
+        prune_snapshots()
+
+    def print_plan(self):
+        upcoming = sorted(self.next_due.items(), key=lambda kv: kv[1])[:1]
+        due_list = ", ".join(self.due_keys) if self.due_keys else "nothing"
+        print(f"🗓️  Freshness plan: due this run -> {due_list}")
+        for key, due_at in upcoming:
+            print(f"   next due: {key} at {datetime.fromtimestamp(due_at, self.now_dt.tzinfo).strftime('%I:%M %p ET')}")
@@ -0,0 +1,261 @@
+import os
+import json
+import threading
+from datetime import datetime, timedelta
+
+# ==========================================================
+# --- DAILY FILE gameRaw SCHEMA ---
+# ==========================================================
+# fetch_matchups.py used to persist the fully hydrated schedule object as gameRaw.
+# This schema is the whitelist of fields that build_site.py, generate_team_pages.py,
+# generate_all_profiles.py, generate_dfs_directories.py and the front-end JS
+# (mlb_starting_lineup.js, script.js, player_core.js, mlb_animation.html) read.
+# Bump GAME_RAW_SCHEMA_VERSION whenever a field is added or removed.
+#
+# Schema nodes: True = keep the whole value, dict = keep only the listed keys
+# (applied to every element when the value is a list).
+GAME_RAW_SCHEMA_VERSION = 1
+
+PITCHER_FIELDS = {
+    "id": True, "fullName": True, "pitchHand": True, "batSide": True,
+    "primaryPosition": {"abbreviation": True, "code": True}
+}
+
+# Official lineup players carry the DFS numbers injected by fetch_matchups.inject_dfs
+LINEUP_PLAYER_FIELDS = {
+    "id": True, "fullName": True, "primaryPosition": {"abbreviation": True, "code": True},
+    "salary": True, "proj": True, "value": True,
+    "dk_salary": True, "dk_proj": True, "dk_value": True,
+    "fd_slates": True, "dk_slates": True, "fd_positions": True, "dk_positions": True
+}
+
+TEAM_SIDE_FIELDS = {
+    "team": {"id": True, "name": True, "teamName": True, "abbreviation": True},
+    "leagueRecord": {"wins": True, "losses": True, "pct": True},
+    "teamName": True, "score": True, "isWinner": True,
+    "probablePitcher": PITCHER_FIELDS
+}
+
+LINESCORE_TEAM_FIELDS = {"runs": True, "hits": True, "errors": True, "leftOnBase": True}
+
+GAME_RAW_SCHEMA = {
+    "gamePk": True, "gameType": True, "season": True, "gameDate": True, "officialDate": True,
+    "gameNumber": True, "doubleHeader": True, "dayNight": True, "description": True,
+    "scheduledInnings": True, "seriesDescription": True, "seriesGameNumber": True, "gamesInSeries": True,
+    "status": {
+        "abstractGameState": True, "codedGameState": True, "detailedState": True,
+        "statusCode": True, "abstractGameCode": True, "startTimeTBD": True, "reason": True
+    },
+    "teams": {"away": TEAM_SIDE_FIELDS, "home": TEAM_SIDE_FIELDS},
+    "linescore": {
+        "currentInning": True, "currentInningOrdinal": True, "inningState": True, "inningHalf": True,
+        "isTopInning": True, "scheduledInnings": True, "balls": True, "strikes": True, "outs": True, "note": True,
+        "teams": {"away": LINESCORE_TEAM_FIELDS, "home": LINESCORE_TEAM_FIELDS}
+    },
+    "venue": {"id": True, "name": True},
+    "lineups": {"awayPlayers": LINEUP_PLAYER_FIELDS, "homePlayers": LINEUP_PLAYER_FIELDS}
+}
+
+# Paths every consumer assumes exist
+REQUIRED_PATHS = [
+    ("gamePk",), ("gameDate",), ("status", "abstractGameState"),
+    ("teams", "away", "team", "id"), ("teams", "home", "team", "id"),
+    ("teams", "away", "team", "name"), ("teams", "home", "team", "name")
+]
+
+def project(value, schema):
+    """Returns a copy of value holding only the fields allowed by schema."""
+    if schema is True:
+        return value
+    if isinstance(value, list):
+        return [project(item, schema) for item in value]
+    if isinstance(value, dict):
+        return {k: project(v, schema[k]) for k, v in value.items() if k in schema}
+    return value
+
+def slim_game_raw(game):
+    return project(game, GAME_RAW_SCHEMA)
+
+def validate_game_raw(raw, schema=GAME_RAW_SCHEMA, path=""):
+    """Lists schema violations (missing required fields or unexpected keys). Empty list = valid."""
+    errors = []
+    if not path:
+        for req in REQUIRED_PATHS:
+            node = raw
+            for key in req:
+                node = node.get(key) if isinstance(node, dict) else None
+            if node is None:
+                errors.append(f"missing required field {'.'.join(req)}")
+
+    if schema is True:
+        return errors
+    items = raw if isinstance(raw, list) else [raw]
+    for item in items:
+        if not isinstance(item, dict): continue
+        for k, v in item.items():
+            child_path = f"{path}.{k}" if path else k
+            if k not in schema:
+                errors.append(f"unexpected field {child_path}")
+            else:
+                errors.extend(validate_game_raw(v, schema[k], child_path))
+    return errors
+
+# ==========================================================
+# --- SHARED PLAYER STATS TABLE ---
+# ==========================================================
+# A player's splits and season line are the same in every game of a date, and
+# in every daily file one run writes (they turn over nightly). So the 3–4 daily
+# files fetch_matchups.py keeps rewriting share one table,
+# data/daily_files/player_stats.json. It is keyed by player ID, and each row
+# covers a range of dates:
+#   {"players": {"660271": [{"from": "2026-07-24", "to": "2026-07-26", "stats": {...}}]}}
+# Each game's deepStats only holds what is per game: name, is_pitcher and the
+# BvP line against that game's opposing starter. The file points at the table
+# with "playerStatsRef": {"file": "player_stats.json", "date": ...}. Values
+# that differ between two games of the same date (one game reused from an
+# older run, say) stay inline in the game and take precedence.
+#
+# Once a date falls behind the dates fetch_matchups.py writes, its file is
+# sealed: its rows are folded back inline and the date leaves the table. Past
+# files stay self-contained, and the table only spans the live window.
+#
+# Readers call expand_deep_stats() (or expandDeepStats() in
+# scripts/player_core.js) right after loading a daily file. Each game then has
+# full deepStats again, as before.
+PLAYER_STAT_FIELDS = ("split_vL", "split_vR", "season")
+PLAYER_STATS_FILE_NAME = "player_stats.json"
+PLAYER_STATS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'daily_files', PLAYER_STATS_FILE_NAME)
+
+_TABLE_LOCK = threading.Lock()
+_TABLE_CACHE = {"mtime": None, "table": None}
+
+def normalize_deep_stats(games):
+    """Returns (rows, games): one date's shared stat fields per player, and the games without them."""
+    candidates, conflicts = {}, set()
+    for game in games:
+        for pid, stats in (game.get('deepStats') or {}).items():
+            shared = {f: stats[f] for f in PLAYER_STAT_FIELDS if f in stats}
+            if not shared: continue
+            known = candidates.setdefault(pid, {})
+            for field, value in shared.items():
+                if field in known and known[field] != value:
+                    conflicts.add((pid, field))
+                known.setdefault(field, value)
+
+    rows = {}
+    for pid, fields in candidates.items():
+        table_row = {f: v for f, v in fields.items() if (pid, f) not in conflicts}
+        if table_row: rows[pid] = table_row
+
+    slim_games = []
+    for game in games:
+        deep_stats = {}
+        for pid, stats in (game.get('deepStats') or {}).items():
+            table_row = rows.get(pid, {})
+            deep_stats[pid] = {k: v for k, v in stats.items() if k not in table_row}
+        slim_games.append({**game, "deepStats": deep_stats})
+    return rows, slim_games
+
+def _shift(date_str, days):
+    return (datetime.strptime(date_str, '%Y-%m-%d') + timedelta(days=days)).strftime('%Y-%m-%d')
+
+def load_player_stats_table(path=None):
+    """The shared table ({"players": {}} when missing). Re-read only when the file changed."""
+    path = path or PLAYER_STATS_FILE
+    with _TABLE_LOCK:
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return {"players": {}}
+        if _TABLE_CACHE["mtime"] != (path, mtime):
+            try:
+                with open(path, 'r') as f:
+                    table = json.load(f) or {}
+            except (json.JSONDecodeError, OSError):
+                table = {}
+            _TABLE_CACHE.update(mtime=(path, mtime), table={"players": table.get("players", {})})
+        return _TABLE_CACHE["table"]
+
+def save_player_stats_table(table, path=None):
+    """Writes the table atomically, one player per line so concurrent edits merge line by line."""
+    path = path or PLAYER_STATS_FILE
+    players = table.get("players", {})
+    lines = [f"{json.dumps(pid)}:{json.dumps(players[pid], separators=(',', ':'))}" for pid in sorted(players, key=str)]
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write('{"players":{\n' + ',\n'.join(lines) + '\n}}\n')
+    os.replace(tmp_path, path)
+
+def rows_for_date(table, date_str):
+    """{player id: stats} for one date."""
+    rows = {}
+    for pid, ranges in (table or {}).get("players", {}).items():
+        for entry in ranges:
+            if entry["from"] <= date_str <= entry["to"]:
+                rows[pid] = entry["stats"]
+                break
+    return rows
+
+def set_date_rows(table, date_str, rows):
+    """Replaces a date's rows in the table in place, extending a neighbouring range when the stats match."""
+    players = table.setdefault("players", {})
+    for pid in set(players) | set(rows):
+        kept = []
+        for entry in players.get(pid, []):
+            if not entry["from"] <= date_str <= entry["to"]:
+                kept.append(entry)
+                continue
+            # Cut the date out of the range it sat in
+            if entry["from"] < date_str: kept.append({**entry, "to": _shift(date_str, -1)})
+            if date_str < entry["to"]: kept.append({**entry, "from": _shift(date_str, 1)})
+        if pid in rows:
+            stats = rows[pid]
+            before = next((e for e in kept if e["to"] == _shift(date_str, -1) and e["stats"] == stats), None)
+            after = next((e for e in kept if e["from"] == _shift(date_str, 1) and e["stats"] == stats), None)
+            if before and after:
+                kept.remove(after)
+                before["to"] = after["to"]
+            elif before:
+                before["to"] = date_str
+            elif after:
+                after["from"] = date_str
+            else:
+                kept.append({"from": date_str, "to": date_str, "stats": stats})
+        if kept: players[pid] = sorted(kept, key=lambda e: e["from"])
+        else: players.pop(pid, None)
+    return table
+
+def table_dates(table):
+    """Every date the table covers."""
+    dates = set()
+    for ranges in (table or {}).get("players", {}).values():
+        for entry in ranges:
+            day = entry["from"]
+            while day <= entry["to"]:
+                dates.add(day)
+                day = _shift(day, 1)
+    return dates
+
+def player_stats_ref(date_str):
+    return {"file": PLAYER_STATS_FILE_NAME, "date": date_str}
+
+def expand_deep_stats(payload, table=None):
+    """
+    Compatibility accessor: returns the payload with every game's deepStats
+    filled from the shared table (the loaded payload itself is left as read).
+    Older files (inline deepStats, a per-file playerStats table, or the bare-list
+    layout) pass through or expand as before.
+    """
+    if not isinstance(payload, dict): return payload
+    ref = payload.get('playerStatsRef')
+    if ref:
+        rows = rows_for_date(table if table is not None else load_player_stats_table(), ref.get('date'))
+    else:
+        rows = payload.get('playerStats') or {}
+    if not rows: return payload
+    games = []
+    for game in payload.get('games', []):
+        deep_stats = game.get('deepStats') or {}
+        games.append({**game, "deepStats": {pid: {**rows.get(pid, {}), **stats} for pid, stats in deep_stats.items()}})
+    expanded = {k: v for k, v in payload.items() if k not in ('playerStatsRef', 'playerStats')}
+    return {**expanded, "games": games}
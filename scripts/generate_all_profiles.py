@@ -6,6 +6,8 @@ import xml.etree.ElementTree as ET
 from xml.dom import minidom
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
+from game_schema import expand_deep_stats
+import lineup_events
 
 # Path Configurations
 MASTER_DATA_PATH = "data/player_master_data.json"
@@ -163,6 +165,35 @@ def resolve_active_matchup(player_id, team_name, daily_data):
             
     return matching_games[0]["game"], matching_games[0]["teamSide"]
 
+def game_player_ids(game):
+    """Every player a game entry can attach a profile to: official, projected and probable."""
+    game_raw = game.get("gameRaw", {})
+    ids = set()
+    for side in ("away", "home"):
+        ids.update(str(p.get("id")) for p in game_raw.get("lineups", {}).get(f"{side}Players", []))
+        projected = (game.get("projectedLineups") or {}).get(side) or {}
+        ids.update(str(p.get("id")) for p in projected.get("battingOrder", []))
+        for pitcher in (game_raw.get("teams", {}).get(side, {}).get("probablePitcher"), projected.get("startingPitcher")):
+            if pitcher and pitcher.get("id"): ids.add(str(pitcher["id"]))
+    return ids
+
+def profiles_to_rebuild(events, target_date_str, daily_data, live_hashes, prior_live_hashes):
+    """
+    Player IDs and team names whose profiles may have changed: everyone in a game
+    with lineup events or a changed live box score. None means rebuild everything.
+    """
+    if events is None: return None
+    touched = lineup_events.affected(events, {target_date_str})
+    games = set(touched["games"]) | {pk for pk, h in live_hashes.items() if prior_live_hashes.get(pk) != h}
+    player_ids, team_names = set(touched["players"]), set(touched["team_names"])
+    for game in daily_data.get("games", []):
+        if str(game.get("gameRaw", {}).get("gamePk")) not in games: continue
+        player_ids |= game_player_ids(game)
+        for side in ("away", "home"):
+            name = game.get("gameRaw", {}).get("teams", {}).get(side, {}).get("team", {}).get("name")
+            if name: team_names.add(name)
+    return player_ids, team_names
+
 # ==========================================
 # 3. HTML SUB-RENDERERS
 # ==========================================
@@ -701,9 +732,17 @@ def main():
     master_data = load_json_safe(MASTER_DATA_PATH)
     target_date_str = get_target_slate_date()
     
-    daily_data = load_json_safe(f"data/daily_files/games_{target_date_str}.json")
+    daily_data = expand_deep_stats(load_json_safe(f"data/daily_files/games_{target_date_str}.json"))
     live_data = load_json_safe(f"data/LIVE/live_mlb_{target_date_str}.json")
 
+    # Live box scores don't go through the event log, so each game's is hashed and compared with the last build
+    cursor = lineup_events.EventCursor("player_profiles", lineup_events.context_key(
+        target_date_str, lineup_events.file_digest(MASTER_DATA_PATH), lineup_events.file_digest(__file__)))
+    live_hashes = {pk: lineup_events.context_key(box) for pk, box in live_data.items()}
+    rebuild = profiles_to_rebuild(cursor.pending(), target_date_str, daily_data, live_hashes, cursor.state.get("live", {}))
+    if rebuild is not None:
+        print(f"🧩 Player profiles: {len(rebuild[0])} players / {len(rebuild[1])} teams touched since the last build.")
+
     all_player_urls = []
     updated_urls = [] 
     updated_count = 0
@@ -718,6 +757,11 @@ def main():
         
         all_player_urls.append(f"{DOMAIN}/players/{player_slug}/")
 
+        if rebuild is not None:
+            team_name = profile.get("team_name", "Free Agent")
+            if str(profile.get("player_id", "")) not in rebuild[0] and not any(name in team_name for name in rebuild[1]):
+                continue
+
         new_html_content = generate_player_html(profile, player_slug, daily_data, live_data, master_data)
         
         existing_html = ""
@@ -738,5 +782,7 @@ def main():
     if updated_urls:
         queue_urls_for_indexnow(updated_urls)
 
+    cursor.commit({"live": live_hashes})
+
 if __name__ == "__main__":
     main()
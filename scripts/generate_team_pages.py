@@ -6,6 +6,8 @@ import xml.etree.ElementTree as ET
 from xml.dom import minidom
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
+from game_schema import expand_deep_stats
+import lineup_events
 
 # ==========================================
 # 1. DICTIONARIES & THEMES
@@ -740,16 +742,27 @@ def main():
     os.makedirs(base_dir, exist_ok=True)
     
     player_db = load_json_safe("data/player_master_data.json")
+
+    # Only teams with lineup events since the last build get re-rendered (None = rebuild all 30)
+    target_dates = [get_est_date_string(i) for i in range(3)]
+    cursor = lineup_events.EventCursor("team_pages", lineup_events.context_key(
+        target_dates, lineup_events.file_digest("data/player_master_data.json"), lineup_events.file_digest(__file__)))
+    events = cursor.pending()
+    touched = lineup_events.affected(events, set(target_dates)) if events is not None else None
+    if touched is not None:
+        print(f"🧩 Team pages: {len(touched['team_ids'])} teams touched by {len(events)} lineup events since the last build.")
+
     daily_slates = {
-        0: load_json_safe(f"data/daily_files/games_{get_est_date_string(0)}.json"),
-        1: load_json_safe(f"data/daily_files/games_{get_est_date_string(1)}.json"),
-        2: load_json_safe(f"data/daily_files/games_{get_est_date_string(2)}.json")
+        0: expand_deep_stats(load_json_safe(f"data/daily_files/games_{target_dates[0]}.json")),
+        1: expand_deep_stats(load_json_safe(f"data/daily_files/games_{target_dates[1]}.json")),
+        2: expand_deep_stats(load_json_safe(f"data/daily_files/games_{target_dates[2]}.json"))
     }
 
     updated_urls = [] # --- NEW: List to track changed URLs ---
     updated_files = 0
     
     for team in MLB_TEAMS:
+        if touched is not None and team["id"] not in touched["team_ids"]: continue
         team_dir = os.path.join(base_dir, team["slug"])
         os.makedirs(team_dir, exist_ok=True)
         file_path = os.path.join(team_dir, "index.html")
@@ -775,5 +788,7 @@ def main():
         queue_urls_for_indexnow(updated_urls)
         update_lineup_sitemap_dates(updated_urls)
 
+    cursor.commit()
+
 if __name__ == "__main__":
     main()
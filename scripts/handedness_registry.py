@@ -0,0 +1,87 @@
+import os
+import json
+import threading
+
+# ==========================================================
+# --- PERSISTED BAT / PITCH SIDE REGISTRY ---
+# ==========================================================
+# A player's bat side and throwing hand essentially never change, so they are
+# looked up once and kept here. fetch_matchups.py resolves every never-seen ID
+# on the slate with one /people bulk call per run (usually zero), and anything
+# the live feed or schedule hydration already tells us is recorded for free.
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REGISTRY_FILE = os.path.join(SCRIPT_DIR, '..', 'data', 'handedness_registry.json')
+
+# Keeps the personIds query string a sane length on a cold start
+BULK_CHUNK_SIZE = 200
+
+_REGISTRY_LOCK = threading.Lock()
+_REGISTRY = None
+_DIRTY = False
+
+def _load():
+    global _REGISTRY
+    if _REGISTRY is None:
+        registry = {}
+        if os.path.exists(REGISTRY_FILE):
+            try:
+                with open(REGISTRY_FILE, 'r') as f:
+                    registry = json.load(f) or {}
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"⚠️ Warning: Handedness registry unreadable, rebuilding. Error: {e}")
+                registry = {}
+        _REGISTRY = registry
+    return _REGISTRY
+
+def people_url(person_ids):
+    return f"https://statsapi.mlb.com/api/v1/people?personIds={','.join(person_ids)}"
+
+def record(person_id, bat=None, pitch=None):
+    """Stores whatever sides are known for a player. Returns nothing; unknown sides are left alone."""
+    global _DIRTY
+    if not person_id or not (bat or pitch): return
+    with _REGISTRY_LOCK:
+        entry = _load().setdefault(str(person_id), {})
+        for side, code in (('bat', bat), ('pitch', pitch)):
+            if code and entry.get(side) != code:
+                entry[side] = code
+                _DIRTY = True
+
+def bat_side(person_id):
+    with _REGISTRY_LOCK:
+        return _load().get(str(person_id), {}).get('bat')
+
+def pitch_hand(person_id):
+    with _REGISTRY_LOCK:
+        return _load().get(str(person_id), {}).get('pitch')
+
+def resolve_missing(person_ids, loader):
+    """
+    Looks up every ID with no bat side yet through loader(url) (the /people bulk
+    endpoint), in as few calls as possible. Returns how many IDs were requested.
+    """
+    with _REGISTRY_LOCK:
+        registry = _load()
+        missing = sorted({str(pid) for pid in person_ids if pid and 'bat' not in registry.get(str(pid), {})})
+
+    for start in range(0, len(missing), BULK_CHUNK_SIZE):
+        try:
+            res = loader(people_url(missing[start:start + BULK_CHUNK_SIZE]))
+        except Exception as e:
+            print(f"   ⚠️ Handedness lookup failed: {e}")
+            continue
+        for person in (res or {}).get('people', []):
+            record(person.get('id'), bat=person.get('batSide', {}).get('code'), pitch=person.get('pitchHand', {}).get('code'))
+    return len(missing)
+
+def save_registry():
+    """Writes the registry if any new players were learned this run."""
+    global _DIRTY
+    with _REGISTRY_LOCK:
+        if not _DIRTY or _REGISTRY is None: return
+        tmp_path = REGISTRY_FILE + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(_REGISTRY, f, separators=(',', ':'), sort_keys=True)
+        os.replace(tmp_path, REGISTRY_FILE)
+        _DIRTY = False
+        print(f"✋ Handedness registry saved ({len(_REGISTRY)} players).")
@@ -0,0 +1,246 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from datetime import datetime, timezone
+
+# ==========================================================
+# --- LINEUP CHANGE EVENT LOG ---
+# ==========================================================
+# lineupTracking in a daily file only holds the latest state, so a generator
+# cannot tell what changed since it last ran. When fetch_matchups.py writes a
+# daily file, it compares each game with the copy already on disk and appends
+# one line per change to data/cache/lineup_events.jsonl. The cache directory is
+# kept between runs by actions/cache and is never committed. Event types:
+#   lineup_posted             a side's official lineup appeared
+#   lineup_modified           a posted lineup changed (late swap)
+#   probable_pitcher_changed  a side's probable starter changed
+#   game_status_changed       abstract or detailed state moved (Live, Final, Delayed...)
+#   odds_moved                moneyline or total moved
+#   game_data_changed         anything else in the game entry (DFS numbers, deep stats...)
+# Every event has a monotonically increasing seq. A consumer (generate_team_pages.py,
+# generate_all_profiles.py, build_site.py, the tweet bot) keeps an EventCursor and
+# rebuilds only the games, teams and players that changed since its last build.
+# When the cursor can't vouch for that, pending() returns None and the consumer
+# rebuilds everything: first run, log pruned past it, or output built for a
+# different context (new date, new master data, new generator code).
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(SCRIPT_DIR, '..', 'data', 'cache')
+EVENT_LOG_FILE = os.path.join(CACHE_DIR, 'lineup_events.jsonl')
+CURSOR_FILE = os.path.join(CACHE_DIR, 'event_cursors.json')
+
+EVENT_RETENTION_SECONDS = 3 * 86400   # The generators only look at yesterday through day-after-tomorrow
+
+EVENT_TYPES = ["lineup_posted", "lineup_modified", "probable_pitcher_changed",
+               "game_status_changed", "odds_moved", "game_data_changed"]
+
+EVENT_STATS = {t: 0 for t in EVENT_TYPES}
+
+_LOG_LOCK = threading.Lock()
+_LAST_SEQ = None
+
+def _digest(obj):
+    return hashlib.sha1(json.dumps(obj, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')).hexdigest()
+
+def file_digest(path):
+    """Content hash of a file a generator depends on ("" when missing), for cursor contexts."""
+    if not os.path.exists(path): return ""
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def context_key(*parts):
+    return _digest(list(parts))
+
+# ==========================================================
+# --- DETECTION (fetch_matchups.py) ---
+# ==========================================================
+def _odds_line(odds):
+    """Moneylines and total from the first book carrying them; None when there are no odds."""
+    if not odds: return None
+    line = {"away_ml": None, "home_ml": None, "total": None}
+    for book in odds.get('bookmakers', []):
+        for market in book.get('markets', []):
+            for outcome in market.get('outcomes', []):
+                if market.get('key') == 'h2h' and line["away_ml"] is None and outcome.get('name') == odds.get('away_team'):
+                    line["away_ml"] = outcome.get('price')
+                elif market.get('key') == 'h2h' and line["home_ml"] is None and outcome.get('name') == odds.get('home_team'):
+                    line["home_ml"] = outcome.get('price')
+                elif market.get('key') == 'totals' and line["total"] is None and outcome.get('name') == 'Over':
+                    line["total"] = outcome.get('point')
+    return line
+
+def game_facts(game_entry):
+    """
+    The parts of a daily-file game entry the events are cut from, plus a digest
+    of the whole entry. Take it before the entry is reused (assembly updates
+    memory in place).
+    """
+    raw = game_entry.get('gameRaw', {})
+    teams = raw.get('teams', {})
+    lineups = raw.get('lineups', {})
+    # BBM's lastUpdated moves on every pull even when the projections didn't
+    projected = {k: v for k, v in (game_entry.get('projectedLineups') or {}).items() if k != 'lastUpdated'}
+    facts = {"digest": _digest({**game_entry, "projectedLineups": projected}), "teams": {}, "pitchers": {}, "lineups": {}}
+    for side in ('away', 'home'):
+        team = teams.get(side, {}).get('team', {})
+        pitcher = teams.get(side, {}).get('probablePitcher') or {}
+        facts["teams"][side] = {"id": team.get('id'), "name": team.get('name')}
+        facts["pitchers"][side] = {"id": pitcher.get('id'), "name": pitcher.get('fullName')} if pitcher.get('id') else None
+        # Same identity as lineupTracking's hash: the batting order's first nine IDs
+        facts["lineups"][side] = [p.get('id') for p in lineups.get(f'{side}Players', [])[:9]]
+    status = raw.get('status', {})
+    facts["status"] = {"abstract": status.get('abstractGameState'), "detailed": status.get('detailedState')}
+    facts["odds"] = _odds_line(game_entry.get('odds'))
+    return facts
+
+def diff_game(date_str, game_pk, old, new):
+    """Events for one game, given its facts before (None for a new game) and after this run."""
+    base = {"date": date_str, "gamePk": str(game_pk), "teams": new["teams"]}
+    events = []
+    for side in ('away', 'home'):
+        old_ids = old["lineups"][side] if old else []
+        new_ids = new["lineups"][side]
+        if new_ids and not old_ids:
+            events.append({**base, "type": "lineup_posted", "side": side, "players": new_ids})
+        elif new_ids and new_ids != old_ids:
+            changed = sorted(set(old_ids) ^ set(new_ids), key=str)
+            events.append({**base, "type": "lineup_modified", "side": side, "players": changed or new_ids,
+                           "from": old_ids, "to": new_ids})
+
+        old_p = old["pitchers"][side] if old else None
+        new_p = new["pitchers"][side]
+        if (old_p or {}).get('id') != (new_p or {}).get('id'):
+            events.append({**base, "type": "probable_pitcher_changed", "side": side,
+                           "players": [p["id"] for p in (old_p, new_p) if p], "from": old_p, "to": new_p})
+
+    if old and old["status"] != new["status"]:
+        events.append({**base, "type": "game_status_changed", "players": [], "from": old["status"], "to": new["status"]})
+    if (old["odds"] if old else None) != new["odds"] and new["odds"]:
+        events.append({**base, "type": "odds_moved", "players": [], "from": old["odds"] if old else None, "to": new["odds"]})
+    if not events and (not old or old["digest"] != new["digest"]):
+        events.append({**base, "type": "game_data_changed", "players": []})
+    return events
+
+# ==========================================================
+# --- LOG ---
+# ==========================================================
+def _read_log():
+    if not os.path.exists(EVENT_LOG_FILE): return []
+    events = []
+    with open(EVENT_LOG_FILE, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line: continue
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue   # A run killed mid-append leaves at most one torn line
+    return events
+
+def _seal_torn_tail():
+    """Ends a torn last line so the next event starts on a line of its own."""
+    if not os.path.exists(EVENT_LOG_FILE) or os.path.getsize(EVENT_LOG_FILE) == 0: return
+    with open(EVENT_LOG_FILE, 'rb+') as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n": f.write(b"\n")
+
+def append_events(events):
+    """Stamps events with seq / ts and appends them to the log. Returns the last seq written."""
+    global _LAST_SEQ
+    if not events: return _LAST_SEQ
+    with _LOG_LOCK:
+        if _LAST_SEQ is None:
+            existing = _read_log()
+            _LAST_SEQ = existing[-1]["seq"] if existing else 0
+            _seal_torn_tail()
+        now = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(EVENT_LOG_FILE, 'a') as f:
+            for event in events:
+                _LAST_SEQ += 1
+                f.write(json.dumps({"seq": _LAST_SEQ, "ts": now, "type": event["type"], **event}, separators=(',', ':')) + "\n")
+                EVENT_STATS[event["type"]] = EVENT_STATS.get(event["type"], 0) + 1
+        return _LAST_SEQ
+
+def prune_events():
+    """Drops events older than the retention window. The newest event always stays so seq never restarts."""
+    with _LOG_LOCK:
+        events = _read_log()
+        cutoff = time.time() - EVENT_RETENTION_SECONDS
+        kept = [e for e in events[:-1] if datetime.fromisoformat(e["ts"]).timestamp() >= cutoff] + events[-1:]
+        if len(kept) == len(events): return
+        tmp_path = EVENT_LOG_FILE + '.tmp'
+        with open(tmp_path, 'w') as f:
+            for event in kept:
+                f.write(json.dumps(event, separators=(',', ':')) + "\n")
+        os.replace(tmp_path, EVENT_LOG_FILE)
+
+def print_event_summary():
+    logged = {t: n for t, n in EVENT_STATS.items() if n}
+    detail = ", ".join(f"{n} {t.replace('_', ' ')}" for t, n in logged.items()) if logged else "no changes"
+    print(f"📝 Lineup Events: {detail}")
+
+# ==========================================================
+# --- CURSORS (consumers) ---
+# ==========================================================
+def _load_cursors():
+    if not os.path.exists(CURSOR_FILE): return {}
+    try:
+        with open(CURSOR_FILE, 'r') as f:
+            return json.load(f) or {}
+    except (json.JSONDecodeError, OSError):
+        return {}
+
+class EventCursor:
+    """
+    One consumer's position in the log. context identifies what the consumer's
+    output was built from besides the daily files (target dates, master data,
+    its own code); a different context means a full rebuild.
+    """
+    def __init__(self, consumer, context=""):
+        self.consumer = consumer
+        self.context = context
+        saved = _load_cursors().get(consumer, {})
+        self.seq = saved.get("seq") if saved.get("context") == context else None
+        self.state = saved.get("state", {}) if self.seq is not None else {}
+        self._read_up_to = None
+
+    def pending(self):
+        """Events since the last commit, oldest first, or None when everything must be rebuilt."""
+        events = _read_log()
+        self._read_up_to = events[-1]["seq"] if events else 0
+        if self.seq is None: return None
+        if not events: return [] if self.seq == 0 else None
+        if self.seq > events[-1]["seq"] or self.seq < events[0]["seq"] - 1:
+            return None   # Log was reset or pruned past this cursor
+        return [e for e in events if e["seq"] > self.seq]
+
+    def commit(self, state=None):
+        """Marks everything pending() returned as handled. state is kept for the consumer's next run."""
+        if self._read_up_to is None: self.pending()
+        cursors = _load_cursors()
+        cursors[self.consumer] = {
+            "seq": self._read_up_to,
+            "context": self.context,
+            "state": state if state is not None else self.state,
+            "updated_at": datetime.now(timezone.utc).isoformat(timespec='seconds')
+        }
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = CURSOR_FILE + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(cursors, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, CURSOR_FILE)
+
+def affected(events, dates=None):
+    """What a batch of events touches: {"dates", "games", "team_ids", "team_names", "players"} as sets."""
+    touched = {"dates": set(), "games": set(), "team_ids": set(), "team_names": set(), "players": set()}
+    for event in events:
+        if dates is not None and event.get("date") not in dates: continue
+        touched["dates"].add(event.get("date"))
+        touched["games"].add(str(event.get("gamePk")))
+        for team in (event.get("teams") or {}).values():
+            if team.get("id") is not None: touched["team_ids"].add(team["id"])
+            if team.get("name"): touched["team_names"].add(team["name"])
+        touched["players"].update(str(p) for p in event.get("players", []))
+    return touched
@@ -0,0 +1,295 @@
+import os
+import sys
+import json
+import time
+import threading
+import zoneinfo
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+# ==========================================================
+# --- INCREMENTAL LIVE FEED STORE ---
+# ==========================================================
+# A full /feed/live document is often several MB once a game has a few innings
+# of plays. The store keeps the last copy of each game under data/cache (kept
+# between runs by actions/cache, never committed). It asks statsapi only for the
+# JSON patches since that copy's metaData.timeStamp, through the feed's
+# diffPatch mode. Final games are never requested again.
+#
+# It is also the one place a cycle's feeds come from. Run as a script, it is the
+# fetch stage: every started game on today's schedule is brought up to date
+# once. fetch_matchups.py, scrape_mlb_live.py, render_tweet_bot.py and
+# umpire_builder.py then read those snapshots. A snapshot younger than
+# CYCLE_SECONDS is served without touching the network.
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+FEED_DIR = os.path.join(SCRIPT_DIR, '..', 'data', 'cache', 'live_feeds')
+
+FEED_RETENTION_SECONDS = 2 * 86400   # Old games' documents are pruned after two days
+CYCLE_SECONDS = 240                  # Snapshots this fresh count as "already fetched this cycle" (runs are 5 min apart)
+FETCH_STAGE_WORKERS = 6
+HEADERS = {'User-Agent': 'Mozilla/5.0'}
+
+FEED_STATS = {"full": 0, "diff": 0, "unchanged": 0, "frozen": 0, "fresh": 0, "patch_errors": 0}
+
+_STATS_LOCK = threading.Lock()
+_GAME_LOCKS = {}
+
+class PatchError(Exception):
+    pass
+
+def live_feed_url(game_pk):
+    return f"https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live"
+
+def diff_patch_url(game_pk, timecode):
+    return f"https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live/diffPatch?startTimecode={timecode}"
+
+def _count(key):
+    with _STATS_LOCK:
+        FEED_STATS[key] += 1
+
+def _game_lock(game_pk):
+    with _STATS_LOCK:
+        return _GAME_LOCKS.setdefault(str(game_pk), threading.Lock())
+
+def _feed_path(game_pk):
+    return os.path.join(FEED_DIR, f"{game_pk}.json")
+
+def _meta_path(game_pk):
+    return os.path.join(FEED_DIR, f"{game_pk}.meta.json")
+
+def _read_json(path):
+    if not os.path.exists(path): return None
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return None
+
+def _write_json(path, obj):
+    os.makedirs(FEED_DIR, exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(obj, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def _read(game_pk):
+    return _read_json(_feed_path(game_pk))
+
+def _write(game_pk, doc):
+    _write_json(_feed_path(game_pk), doc)
+    _touch(game_pk, doc)
+
+def _touch(game_pk, doc):
+    """Records when the snapshot was last confirmed current."""
+    _write_json(_meta_path(game_pk), {
+        "fetched_at": time.time(),
+        "timecode": doc.get('metaData', {}).get('timeStamp'),
+        "state": doc.get('gameData', {}).get('status', {}).get('abstractGameState')
+    })
+
+def snapshot_info(game_pk):
+    """Freshness metadata for a stored game: {"fetched_at", "timecode", "state"} or None."""
+    return _read_json(_meta_path(game_pk))
+
+def is_final(doc):
+    return (doc or {}).get('gameData', {}).get('status', {}).get('abstractGameState') == 'Final'
+
+# ==========================================================
+# --- JSON PATCH (RFC 6902) ---
+# ==========================================================
+def _parse_pointer(pointer):
+    if pointer == '': return []
+    if not pointer.startswith('/'): raise PatchError(f"bad pointer {pointer}")
+    return [p.replace('~1', '/').replace('~0', '~') for p in pointer[1:].split('/')]
+
+def _resolve_parent(doc, pointer):
+    parts = _parse_pointer(pointer)
+    if not parts: raise PatchError("patch targets the document root")
+    node = doc
+    for part in parts[:-1]:
+        try:
+            node = node[int(part)] if isinstance(node, list) else node[part]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise PatchError(f"missing path {pointer}")
+    return node, parts[-1]
+
+def _get(doc, pointer):
+    node, key = _resolve_parent(doc, pointer)
+    try:
+        return node[int(key)] if isinstance(node, list) else node[key]
+    except (KeyError, IndexError, ValueError, TypeError):
+        raise PatchError(f"missing path {pointer}")
+
+def _remove(doc, pointer):
+    node, key = _resolve_parent(doc, pointer)
+    try:
+        return node.pop(int(key)) if isinstance(node, list) else node.pop(key)
+    except (KeyError, IndexError, ValueError, TypeError):
+        raise PatchError(f"missing path {pointer}")
+
+def _add(doc, pointer, value, replace=False):
+    node, key = _resolve_parent(doc, pointer)
+    if isinstance(node, list):
+        if key == '-':
+            node.append(value)
+            return
+        try:
+            idx = int(key)
+        except ValueError:
+            raise PatchError(f"bad list index {pointer}")
+        if replace:
+            if idx >= len(node): raise PatchError(f"missing path {pointer}")
+            node[idx] = value
+        else:
+            if idx > len(node): raise PatchError(f"missing path {pointer}")
+            node.insert(idx, value)
+    elif isinstance(node, dict):
+        node[key] = value
+    else:
+        raise PatchError(f"cannot write into {pointer}")
+
+def apply_patch(doc, operations):
+    """Applies a list of JSON patch operations to doc in place."""
+    for op in operations:
+        kind, path = op.get('op'), op.get('path', '')
+        if kind == 'add':
+            _add(doc, path, op.get('value'))
+        elif kind == 'replace':
+            _add(doc, path, op.get('value'), replace=True)
+        elif kind == 'remove':
+            _remove(doc, path)
+        elif kind == 'move':
+            _add(doc, path, _remove(doc, op.get('from', '')))
+        elif kind == 'copy':
+            _add(doc, path, json.loads(json.dumps(_get(doc, op.get('from', '')))))
+        elif kind == 'test':
+            if _get(doc, path) != op.get('value'): raise PatchError(f"test failed at {path}")
+        else:
+            raise PatchError(f"unknown op {kind}")
+    return doc
+
+# ==========================================================
+# --- PUBLIC API ---
+# ==========================================================
+def read_feed(game_pk, max_age=None):
+    """
+    Reader API: the stored snapshot for a game, or None. No network. With max_age,
+    snapshots older than that many seconds (unless Final) count as missing.
+    """
+    with _game_lock(game_pk):
+        doc = _read(game_pk)
+        if doc is None or max_age is None or is_final(doc): return doc
+        info = snapshot_info(game_pk) or {}
+        return doc if time.time() - info.get('fetched_at', 0) <= max_age else None
+
+def get_live_feed(game_pk, loader, max_age=CYCLE_SECONDS):
+    """
+    Returns the current /feed/live document for a game. loader(url) must return
+    parsed JSON. A snapshot fetched within max_age seconds is returned as is;
+    otherwise it is brought up to date with a diffPatch request, and the full
+    feed is only downloaded the first time or when patching fails.
+    """
+    with _game_lock(game_pk):
+        doc = _read(game_pk)
+        if doc is not None and is_final(doc):
+            _count("frozen")
+            return doc
+
+        info = snapshot_info(game_pk) or {}
+        if doc is not None and time.time() - info.get('fetched_at', 0) <= max_age:
+            _count("fresh")
+            return doc
+
+        timecode = (doc or {}).get('metaData', {}).get('timeStamp')
+        if timecode:
+            try:
+                res = loader(diff_patch_url(game_pk, timecode))
+                if isinstance(res, list):
+                    if not res:
+                        _count("unchanged")
+                        _touch(game_pk, doc)
+                        return doc
+                    for entry in res:
+                        apply_patch(doc, entry.get('diff', []) if isinstance(entry, dict) else entry)
+                    _count("diff")
+                    _write(game_pk, doc)
+                    return doc
+                if isinstance(res, dict) and 'gameData' in res:
+                    # Too far behind: statsapi answers with the whole document instead
+                    _count("full")
+                    _write(game_pk, res)
+                    return res
+            except PatchError as e:
+                _count("patch_errors")
+                print(f"   ⚠️ Live feed patch failed for {game_pk}, refetching in full: {e}")
+            except Exception:
+                pass
+
+        doc = loader(live_feed_url(game_pk))
+        _count("full")
+        if isinstance(doc, dict) and 'gameData' in doc:
+            _write(game_pk, doc)
+        return doc
+
+def refresh_feeds(game_pks, loader, max_workers=FETCH_STAGE_WORKERS):
+    """Fetch stage: brings every listed game's snapshot up to date, a few games at a time."""
+    def refresh(game_pk):
+        try:
+            get_live_feed(game_pk, loader, max_age=0)
+        except Exception as e:
+            print(f"   ⚠️ Live feed fetch failed for {game_pk}: {e}")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        list(pool.map(refresh, game_pks))
+
+def prune_old_feeds():
+    if not os.path.isdir(FEED_DIR): return
+    cutoff = time.time() - FEED_RETENTION_SECONDS
+    for name in os.listdir(FEED_DIR):
+        path = os.path.join(FEED_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff: os.remove(path)
+        except OSError:
+            pass
+
+def print_feed_summary():
+    print(f"📡 Live Feeds: {FEED_STATS['full']} full, {FEED_STATS['diff']} patched, {FEED_STATS['unchanged']} unchanged, "
+          f"{FEED_STATS['fresh']} fresh this cycle, {FEED_STATS['frozen']} frozen (Final), {FEED_STATS['patch_errors']} patch errors")
+
+# ==========================================================
+# --- FETCH STAGE ---
+# ==========================================================
+def started_game_pks(date_str):
+    """Every game on the date's schedule that is in progress, final, or delayed."""
+    sched_url = f"https://statsapi.mlb.com/api/v1/schedule?sportId=1&date={date_str}"
+    sched_res = requests.get(sched_url, headers=HEADERS, timeout=10).json()
+    game_pks = []
+    for date_block in sched_res.get('dates', []):
+        for game in date_block.get('games', []):
+            status = game.get('status', {})
+            if status.get('abstractGameState', 'Preview') == 'Preview' and 'Delayed' not in status.get('detailedState', ''):
+                continue
+            game_pks.append(str(game['gamePk']))
+    return game_pks
+
+def run_fetch_stage(date_str=None):
+    # Same "sports day" as scrape_mlb_live.py: the date rolls over at 5:00 AM ET
+    if not date_str:
+        now_est = datetime.now(zoneinfo.ZoneInfo("America/New_York"))
+        date_str = (now_est - timedelta(hours=5)).strftime('%Y-%m-%d')
+
+    try:
+        game_pks = started_game_pks(date_str)
+    except Exception as e:
+        print(f"Failed to fetch schedule: {e}")
+        return
+
+    session = requests.Session()
+    print(f"📡 Refreshing live feeds for {len(game_pks)} started games on {date_str}...")
+    refresh_feeds(game_pks, lambda url: session.get(url, headers=HEADERS, timeout=10).json())
+    prune_old_feeds()
+    print_feed_summary()
+
+if __name__ == "__main__":
+    run_fetch_stage(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -28,6 +28,43 @@ function getSlugFromId(id) {
     return slugMap[id] || "los-angeles-dodgers";
 }
 
+// Daily files keep each player's splits & season line once, in data/daily_files/player_stats.json
+// (rows keyed by player and date range, see scripts/game_schema.py). Fold them back into every
+// game's deepStats so the rest of the page reads the old shape. Shared by every page that reads
+// daily files (script.js, mlb_starting_lineup.js): load this file before them.
+const PLAYER_STATS_TABLE_TTL_MS = 60000;
+const playerStatsTables = {};
+
+function loadPlayerStatsTable(url) {
+    const cached = playerStatsTables[url];
+    if (cached && Date.now() - cached.at < PLAYER_STATS_TABLE_TTL_MS) return cached.table;
+    const table = fetch(`${url}?v=${Date.now()}`).then(r => r.ok ? r.json() : {}).catch(() => ({}));
+    playerStatsTables[url] = { at: Date.now(), table };
+    return table;
+}
+
+async function expandDeepStats(payload, dailyFilesBase = "/data/daily_files/") {
+    if (!payload || Array.isArray(payload)) return payload;
+    let rows = payload.playerStats || null;
+    const ref = payload.playerStatsRef;
+    if (ref) {
+        const table = await loadPlayerStatsTable(dailyFilesBase + ref.file);
+        rows = {};
+        Object.entries(table.players || {}).forEach(([pid, ranges]) => {
+            const match = ranges.find(entry => entry.from <= ref.date && ref.date <= entry.to);
+            if (match) rows[pid] = match.stats;
+        });
+    }
+    if (!rows) return payload;
+    (payload.games || []).forEach(game => {
+        const deepStats = game.deepStats || {};
+        Object.keys(deepStats).forEach(pid => {
+            deepStats[pid] = { ...(rows[pid] || {}), ...deepStats[pid] };
+        });
+    });
+    return payload;
+}
+
 async function loadPlayerProfileData() {
     if (typeof PLAYER_ID === 'undefined') return;
 
@@ -38,7 +75,7 @@ async function loadPlayerProfileData() {
         const liveRes = await fetch(`https://mlbstartingnine.com/data/LIVE/live_mlb_${targetDateStr}.json?v=` + Date.now()).catch(() => ({ ok: false }));
         
         if (dailyRes.ok) {
-            const dailyData = await dailyRes.json();
+            const dailyData = await expandDeepStats(await dailyRes.json(), "https://mlbstartingnine.com/data/daily_files/");
             const liveData = liveRes.ok ? await liveRes.json() : {};
             
             let myGame = null;
@@ -19,6 +19,8 @@ import sys
 import ctypes
 import re
 
+import live_feed_store
+
 # ==========================================
 # 0. ENVIRONMENT & DRY RUN SETTINGS
 # ==========================================
@@ -783,7 +785,9 @@ async def run_engines(memory):
         positions = {}
         player_names_map = {} 
         try:
-            box_teams = requests.get(f"https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live").json().get('liveData', {}).get('boxscore', {}).get('teams', {})
+            # Positions come from this cycle's shared live feed snapshot when there is one
+            live_feed = live_feed_store.get_live_feed(game_pk, lambda url: requests.get(url, timeout=10).json())
+            box_teams = live_feed.get('liveData', {}).get('boxscore', {}).get('teams', {})
             for pid, p_data in {**box_teams.get('away', {}).get('players', {}), **box_teams.get('home', {}).get('players', {})}.items():
                 person_id = str(p_data['person']['id'])
                 player_names_map[person_id] = p_data['person']['fullName'] 
@@ -0,0 +1,99 @@
+import os
+import sys
+import json
+import time
+import threading
+from datetime import datetime, timezone
+
+# ==========================================================
+# --- DEADLINE-AWARE RUN BUDGET ---
+# ==========================================================
+# fetch_matchups.py runs every 5 minutes. When statsapi is slow, one run can
+# outlive its slot and collide with the next run's git push. Work is tagged
+# with a priority: today (and yesterday's late games) first, tomorrow next,
+# future dates last. Lower-priority work may only start while enough of the
+# budget is left. Work that cannot start is deferred to the next run and
+# recorded in data/cache/deferred_work.json.
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFERRED_LOG_FILE = os.path.join(SCRIPT_DIR, '..', 'data', 'cache', 'deferred_work.json')
+
+DEFAULT_BUDGET_SECONDS = 240       # Leaves a minute of the 5-minute slot for generators + git push
+BUDGET_ENV_VAR = "FETCH_MATCHUPS_BUDGET_SECONDS"
+
+PRIORITY_TODAY, PRIORITY_TOMORROW, PRIORITY_FUTURE = 0, 1, 2
+# A priority may start new work until this fraction of the budget is spent (today always runs)
+PRIORITY_CUTOFFS = {PRIORITY_TODAY: None, PRIORITY_TOMORROW: 0.6, PRIORITY_FUTURE: 0.4}
+
+NEAR_FIRST_PITCH_SECONDS = 3 * 3600   # Inside the lineup window a game jumps the queue
+
+def date_priority(days_away):
+    if days_away <= 0: return PRIORITY_TODAY
+    if days_away == 1: return PRIORITY_TOMORROW
+    return PRIORITY_FUTURE
+
+def game_rank(days_away, game, now_ts):
+    """Sort key for per-game work: date priority, then live / near-first-pitch games first."""
+    state = game.get('status', {}).get('abstractGameState', '')
+    try:
+        start = datetime.strptime(game.get('gameDate', ''), "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        start = None
+    urgent = state == 'Live' or (state == 'Preview' and start is not None and start - now_ts <= NEAR_FIRST_PITCH_SECONDS)
+    return (date_priority(days_away), 0 if urgent else 1)
+
+def budget_from_args(argv=None):
+    """--budget SECONDS on the command line wins over the env var, which wins over the default."""
+    argv = sys.argv[1:] if argv is None else argv
+    if "--budget" in argv:
+        idx = argv.index("--budget")
+        if idx + 1 < len(argv):
+            try: return float(argv[idx + 1])
+            except ValueError: pass
+    try:
+        return float(os.environ.get(BUDGET_ENV_VAR, DEFAULT_BUDGET_SECONDS))
+    except ValueError:
+        return DEFAULT_BUDGET_SECONDS
+
+class RunBudget:
+    def __init__(self, seconds, started=None):
+        self.seconds = seconds
+        self.started = started if started is not None else time.perf_counter()
+        self.deferred = []
+        self._lock = threading.Lock()
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def remaining(self):
+        return self.seconds - self.elapsed()
+
+    def allows(self, priority):
+        """True when work at this priority may still start."""
+        cutoff = PRIORITY_CUTOFFS.get(priority, PRIORITY_CUTOFFS[PRIORITY_FUTURE])
+        return cutoff is None or self.elapsed() < self.seconds * cutoff
+
+    def defer(self, date_str, stage, detail=""):
+        with self._lock:
+            if any(d["date"] == date_str and d["stage"] == stage for d in self.deferred): return
+            self.deferred.append({"date": date_str, "stage": stage, "detail": detail, "at_seconds": round(self.elapsed(), 1)})
+        print(f"⏳ BUDGET: Deferred {stage} for {date_str} to the next run ({self.elapsed():.0f}s of {self.seconds:.0f}s used). {detail}".rstrip())
+
+    def deferred_dates(self):
+        return {d["date"] for d in self.deferred}
+
+    def save_log(self, run_at):
+        """Records this run's deferrals (an empty list clears the previous run's)."""
+        os.makedirs(os.path.dirname(DEFERRED_LOG_FILE), exist_ok=True)
+        tmp_path = DEFERRED_LOG_FILE + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                "run_at": run_at,
+                "budget_seconds": self.seconds,
+                "elapsed_seconds": round(self.elapsed(), 1),
+                "deferred": self.deferred
+            }, f, indent=2)
+        os.replace(tmp_path, DEFERRED_LOG_FILE)
+
+    def print_summary(self):
+        status = f"{len(self.deferred)} deferred" if self.deferred else "nothing deferred"
+        print(f"  - Budget: {self.elapsed():.1f}s of {self.seconds:.0f}s used, {status}")
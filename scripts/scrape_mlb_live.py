@@ -1,8 +1,18 @@
 import json
 import os
+import sys
+import time
+import hashlib
+import subprocess
 import requests
 import zoneinfo
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from datetime import datetime, timedelta, timezone
+from requests.adapters import HTTPAdapter
+
+import statsapi_cache
+import live_feed_store
+import dfs_scoring
 
 # ==========================================================
 # --- FOLDER SETUP ---
@@ -15,199 +25,518 @@ os.makedirs(DATA_DIR, exist_ok=True)
 
 HEADERS = {'User-Agent': 'Mozilla/5.0'}
 
+# --- CONCURRENCY SETTINGS ---
+LIVE_WORKERS = 6              # Live feeds in flight at once (one pooled connection each)
+FEED_TIMEOUT_SECONDS = 10     # Per request
+POLL_DEADLINE_SECONDS = 25    # The whole slate; games still loading after this keep their last snapshot
+
+# --- FEED SOURCES ---
+# "feed": the full /feed/live document, shared with the other consumers through live_feed_store.
+# "boxscore": only /boxscore + /linescore plus the current play's description through a
+# fields= filter, a small fraction of the bytes. Final games still read the full feed
+# once into the shared store, where fetch_matchups' BvP ledger ingest reads every plate appearance.
+# Pick with --source boxscore or LIVE_SOURCE=boxscore; scripts/benchmark_live_endpoints.py compares the two.
+SOURCE_FEED, SOURCE_BOXSCORE = "feed", "boxscore"
+LIVE_SOURCES = [SOURCE_FEED, SOURCE_BOXSCORE]
+LIVE_SOURCE_ENV_VAR = "LIVE_SOURCE"
+
+# Feed timecode / linescore hash + ETag each game's output was last built from (kept by actions/cache)
+VERSIONS_FILE = os.path.join(SCRIPT_DIR, '..', 'data', 'cache', 'live_scrape_versions.json')
+
+# --- DAEMON MODE (--daemon) ---
+# One process and one connection pool for the whole sports day instead of a cron
+# firing the one-shot run at a fixed rate. Each game gets its next poll time from
+# its state; a cycle re-reads the schedule, fetches only the games that are due
+# (or whose state just changed), and writes the live file atomically. The daemon
+# exits once every game of the sports day is Final and written as Final.
+POLL_SECONDS_BY_PHASE = {
+    "in_play": 15,            # Ball in play: every pitch can move the points
+    "between_innings": 60,    # Three outs on the board: ~2 minutes of break
+    "warmup": 120,            # Warmup / Pre-Game: the feed barely moves
+    "delayed": 300,           # Rain delay / suspended
+    "final": None             # Frozen once written as Final
+}
+PREGAME_RECHECK_SECONDS = 300     # Unstarted games: re-read the schedule at least this often before first pitch
+MIN_CYCLE_SECONDS = 5
+SCHEDULE_RETRY_SECONDS = 60
+DAEMON_MAX_HOURS = 5.5            # Stays inside a GitHub Actions job's 6-hour limit; --max-hours overrides
+# --publish: the daemon runs the workflow's closing steps itself (DFS pages, commit, push) after
+# cycles that wrote, at most every PUBLISH_MIN_SECONDS, and once more when it stops. Without it
+# nothing reaches the site until the process exits. mlb_live_scraper.yml runs it with daemon=true.
+PUBLISH_MIN_SECONDS = 120
+PUBLISH_PATHS = ["data/LIVE/", "dfs/", "sitemap-dfs.xml"]
+REPO_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
+SPORTS_DAY_OFFSET_HOURS = 5
+DONE_STATES = ['Final', 'Postponed', 'Cancelled']
+
 # ==========================================================
-# --- DFS SCORING CALCULATORS ---
+# --- GAME PARSING ---
 # ==========================================================
-def calc_hitter_dfs(stats):
-    """Calculates DK and FD points for hitters"""
-    dk = 0.0
-    fd = 0.0
-    
-    if not stats: return dk, fd
-    
-    h = stats.get('hits', 0)
-    d = stats.get('doubles', 0)
-    t = stats.get('triples', 0)
-    hr = stats.get('homeRuns', 0)
-    s = h - d - t - hr # Singles
+def build_game_obj(game, live_res):
+    """Turns one game's schedule entry + live feed into the live file's game object."""
+    abstract_state = game.get('status', {}).get('abstractGameState', 'Preview')
+    detailed_state = game.get('status', {}).get('detailedState', '')
+    away_abbr = game['teams']['away']['team'].get('abbreviation', 'AWAY')
+    home_abbr = game['teams']['home']['team'].get('abbreviation', 'HOME')
+
+    live_data = live_res.get('liveData', {})
+
+    # --- Linescore & Game State ---
+    linescore = live_data.get('linescore', {})
+    plays = live_data.get('plays', {})
     
-    rbi = stats.get('rbi', 0)
-    r = stats.get('runs', 0)
-    bb = stats.get('baseOnBalls', 0)
-    hbp = stats.get('hitByPitch', 0)
-    sb = stats.get('stolenBases', 0)
-
-    # DraftKings Hitting: 1B=3, 2B=5, 3B=8, HR=10, RBI=2, R=2, BB=2, HBP=2, SB=5
-    dk = (s*3) + (d*5) + (t*8) + (hr*10) + (rbi*2) + (r*2) + (bb*2) + (hbp*2) + (sb*5)
+    current_inning = linescore.get('currentInningOrdinal', '')
+    inning_half = linescore.get('inningHalf', '')
+    outs = linescore.get('outs', 0)
     
-    # FanDuel Hitting: 1B=3, 2B=6, 3B=9, HR=12, RBI=3.2, R=3.2, BB=3, HBP=3, SB=6
-    fd = (s*3) + (d*6) + (t*9) + (hr*12) + (rbi*3.2) + (r*3.2) + (bb*3) + (hbp*3) + (sb*6)
+    away_score = linescore.get('teams', {}).get('away', {}).get('runs', 0)
+    home_score = linescore.get('teams', {}).get('home', {}).get('runs', 0)
     
-    return round(dk, 2), round(fd, 2)
-
-def calc_pitcher_dfs(stats):
-    """Calculates DK and FD points for pitchers"""
-    dk = 0.0
-    fd = 0.0
+    # Base Runners
+    offense = linescore.get('offense', {})
+    bases = {
+        "1B": 'first' in offense,
+        "2B": 'second' in offense,
+        "3B": 'third' in offense
+    }
     
-    if not stats: return dk, fd
+    # Current Play Text
+    current_play = plays.get('currentPlay', {}).get('result', {}).get('description', '')
     
-    outs = stats.get('outs', 0)
-    k = stats.get('strikeOuts', 0)
-    er = stats.get('earnedRuns', 0)
-    w = stats.get('wins', 0)
+    # --- Build the Live Object ---
+    game_obj = {
+        "status": abstract_state,
+        "detailed_status": detailed_state,
+        "inning": current_inning,
+        "half": inning_half,
+        "outs": outs,
+        "away_score": away_score,
+        "home_score": home_score,
+        "bases": bases,
+        "current_play": current_play,
+        "players": {}
+    }
     
-    hits_allowed = stats.get('hits', 0)
-    bb_allowed = stats.get('baseOnBalls', 0)
-    hbp_allowed = stats.get('hitByPitch', 0)
+    # --- Parse Boxscore for DFS Points ---
+    boxscore = live_data.get('boxscore', {}).get('teams', {})
     
-    # Complete Game / No Hitter / Shutout bonuses (Rare, but included for DK)
-    cg = stats.get('completeGames', 0)
-    sho = stats.get('shutouts', 0)
-
-    # DraftKings Pitching: Out=0.75, K=2, W=4, ER=-2, Hit=-0.6, BB=-0.6, HBP=-0.6, CG=2.5, CGSO=2.5, NH=2.5 (Skipping NH for simplicity unless 9IP 0H)
-    dk = (outs * 0.75) + (k * 2) + (w * 4) + (er * -2) + (hits_allowed * -0.6) + (bb_allowed * -0.6) + (hbp_allowed * -0.6)
-    if cg > 0: dk += 2.5
-    if sho > 0: dk += 2.5
+    played = []
+    for team_side, abbr in [('away', away_abbr), ('home', home_abbr)]:
+        game_obj["players"][abbr] = {}
+        team_players = boxscore.get(team_side, {}).get('players', {})
+        
+        for pid, p_data in team_players.items():
+            b_stats = p_data.get('stats', {}).get('batting', {})
+            p_stats = p_data.get('stats', {}).get('pitching', {})
+            
+            # Check if they actually played
+            if b_stats.get('plateAppearances', 0) > 0 or p_stats.get('battersFaced', 0) > 0:
+                played.append((abbr, pid, p_data.get('person', {}).get('fullName', 'Unknown'), b_stats, p_stats))
     
-    # FanDuel Pitching: Out=1, K=3, W=6, ER=-3, QS=4
-    fd = (outs * 1) + (k * 3) + (w * 6) + (er * -3)
+    # Score the whole game in one batch (Pitchers get hitting points too if they hit!)
+    points = dfs_scoring.score_players([p[3] for p in played], [p[4] for p in played])
+    for (abbr, pid, name, b_stats, p_stats), dk_pts, fd_pts in zip(played, points["dk"].tolist(), points["fd"].tolist()):
+        game_obj["players"][abbr][pid] = {
+            "name": name,
+            "dk_pts": dk_pts,
+            "fd_pts": fd_pts,
+            "batting": b_stats if b_stats.get('plateAppearances', 0) > 0 else None,
+            "pitching": p_stats if p_stats.get('battersFaced', 0) > 0 else None
+        }
     
-    # FD Quality Start: 6+ IP (18+ outs) and 3 or fewer ER
-    if outs >= 18 and er <= 3:
-        fd += 4
-        
-    return round(dk, 2), round(fd, 2)
+    return game_obj
 
 # ==========================================================
-# --- MAIN LIVE SCRAPER ---
+# --- CONCURRENT FEED FETCHING ---
 # ==========================================================
-def scrape_live_games():
-    ny_tz = zoneinfo.ZoneInfo("America/New_York")
-    now_est = datetime.now(ny_tz)
-    
+def new_session():
+    """One pooled connection set, sized to the worker count, shared by every game's fetch."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.mount("https://", HTTPAdapter(pool_connections=LIVE_WORKERS, pool_maxsize=LIVE_WORKERS))
+    return session
+
+def fetch_game_feed(session, game_pk, known, max_age=live_feed_store.CYCLE_SECONDS):
+    """
+    Full feed through live_feed_store (a diffPatch request when a snapshot exists).
+    Returns (feed, version), with feed None when its timeStamp matches the version
+    the last output was built from. A snapshot younger than max_age is used as is.
+    """
+    loader = lambda url: session.get(url, timeout=FEED_TIMEOUT_SECONDS).json()
+    doc = live_feed_store.get_live_feed(game_pk, loader, max_age=max_age)
+    version = {"timecode": doc.get('metaData', {}).get('timeStamp')}
+    if version["timecode"] and version["timecode"] == known.get("timecode"):
+        return None, version
+    return doc, version
+
+def boxscore_url(game_pk):
+    return f"https://statsapi.mlb.com/api/v1/game/{game_pk}/boxscore"
+
+def linescore_url(game_pk):
+    return f"https://statsapi.mlb.com/api/v1/game/{game_pk}/linescore"
+
+def current_play_url(game_pk):
+    return f"{live_feed_store.live_feed_url(game_pk)}?fields=liveData,plays,currentPlay,result,description"
+
+def fetch_game_lite(session, game_pk, known):
+    """
+    The three small endpoints, assembled into the slice of /feed/live that
+    build_game_obj reads. The ~1 KB linescore goes first as the change probe
+    (sent with If-None-Match when statsapi gave an ETag): count, outs, runners
+    and runs all live there. When it hasn't moved, the box score isn't
+    requested and (None, version) comes back.
+    """
+    headers = {'If-None-Match': known['etag']} if known.get('etag') else {}
+    res = session.get(linescore_url(game_pk), headers=headers, timeout=FEED_TIMEOUT_SECONDS)
+    if res.status_code == 304:
+        return None, known
+    linescore = res.json()
+    version = {"etag": res.headers.get('ETag'), "linescore": fingerprint(linescore)}
+    if version["linescore"] == known.get("linescore"):
+        return None, version
+
+    get = lambda url: session.get(url, timeout=FEED_TIMEOUT_SECONDS).json()
+    boxscore = get(boxscore_url(game_pk))
+    try:
+        plays = get(current_play_url(game_pk)).get('liveData', {}).get('plays', {})
+    except Exception:
+        plays = {}   # The play text is cosmetic; the box score and line still count
+    return {"liveData": {"linescore": linescore, "boxscore": boxscore, "plays": plays}}, version
+
+def fingerprint(obj):
+    return hashlib.sha1(json.dumps(obj, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+def live_source_from_args(argv=None):
+    """--source on the command line wins over the env var, which wins over the full feed."""
+    argv = sys.argv[1:] if argv is None else argv
+    source = os.environ.get(LIVE_SOURCE_ENV_VAR, SOURCE_FEED)
+    if "--source" in argv and argv.index("--source") + 1 < len(argv):
+        source = argv[argv.index("--source") + 1]
+    return source if source in LIVE_SOURCES else SOURCE_FEED
+
+def load_previous_snapshot(file_path):
+    if not os.path.exists(file_path): return {}
+    try:
+        with open(file_path, 'r') as f:
+            return json.load(f) or {}
+    except (json.JSONDecodeError, OSError):
+        return {}
+
+def load_versions():
+    if not os.path.exists(VERSIONS_FILE): return {}
+    try:
+        with open(VERSIONS_FILE, 'r') as f:
+            return json.load(f) or {}
+    except (json.JSONDecodeError, OSError):
+        return {}
+
+def save_versions(versions):
+    os.makedirs(os.path.dirname(VERSIONS_FILE), exist_ok=True)
+    tmp_path = VERSIONS_FILE + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(versions, f, separators=(',', ':'), sort_keys=True)
+    os.replace(tmp_path, VERSIONS_FILE)
+
+def is_frozen(game, previous_obj):
+    """Final in the schedule and already written as Final: nothing about it can change any more."""
+    return (previous_obj or {}).get('status') == 'Final' and game.get('status', {}).get('abstractGameState') == 'Final'
+
+def same_state(game, previous_obj):
+    status = game.get('status', {})
+    return (previous_obj or {}).get('status') == status.get('abstractGameState', 'Preview') and \
+        previous_obj.get('detailed_status') == status.get('detailedState', '')
+
+def save_live_file(file_path, live_data_dict, previous):
+    """Writes the live file atomically unless it's what's already on disk. Returns True when written."""
+    if not live_data_dict or fingerprint(live_data_dict) == fingerprint(previous): return False
+    tmp_path = file_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(live_data_dict, f, indent=2)
+    os.replace(tmp_path, file_path)
+    return True
+
+def sports_day_str(now_est):
     # --- THE FIX: The "Sports Day" Offset ---
     # Subtract 5 hours so the date doesn't roll over until 5:00 AM EST.
     # A game at 1:30 AM EST will still be treated as "yesterday's" schedule.
-    sports_day = now_est - timedelta(hours=5)
-    date_str = sports_day.strftime('%Y-%m-%d')
-    
-    # 1. Get today's schedule to find the gamePks
+    return (now_est - timedelta(hours=SPORTS_DAY_OFFSET_HOURS)).strftime('%Y-%m-%d')
+
+def fetch_schedule_games(session, date_str):
+    """The sports day's schedule entries: [] when nothing is scheduled, None when the request failed."""
     sched_url = f"https://statsapi.mlb.com/api/v1/schedule?sportId=1&date={date_str}"
-    print(f"Fetching schedule for {date_str}...")
-    
     try:
-        sched_res = requests.get(sched_url, headers=HEADERS, timeout=10).json()
+        sched_res = session.get(sched_url, timeout=FEED_TIMEOUT_SECONDS).json()
     except Exception as e:
         print(f"Failed to fetch schedule: {e}")
-        return
-
+        return None
     dates = sched_res.get('dates', [])
-    if not dates:
-        print("No games scheduled today.")
-        return
-        
-    games = dates[0].get('games', [])
+    return dates[0].get('games', []) if dates else []
+
+def has_started(game):
+    # Don't hit the live feed if it hasn't started yet and isn't delayed
+    status = game.get('status', {})
+    return not (status.get('abstractGameState', 'Preview') == 'Preview' and 'Delayed' not in status.get('detailedState', ''))
+
+def game_phase(game, game_obj):
+    """in_play / between_innings / warmup / delayed / final / pregame, from the schedule state and the last output."""
+    status = game.get('status', {})
+    abstract, detailed = status.get('abstractGameState', 'Preview'), status.get('detailedState', '')
+    if abstract == 'Final' or detailed in DONE_STATES: return "final"
+    if 'Delayed' in detailed or 'Suspended' in detailed: return "delayed"
+    if abstract == 'Preview': return "pregame"
+    if detailed in ('Warmup', 'Pre-Game'): return "warmup"
+    if (game_obj or {}).get('outs', 0) >= 3: return "between_innings"
+    return "in_play"
+
+def first_pitch_ts(game):
+    try:
+        return datetime.strptime(game.get('gameDate', ''), "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return None
+
+def day_is_over(games, live_data_dict):
+    """Every game Final in the schedule, and every one that was played already written as Final."""
+    if not all(game_phase(g, None) == "final" for g in games): return False
+    return all((live_data_dict.get(str(g['gamePk'])) or {}).get('status', 'Final') == 'Final' for g in games)
+
+# ==========================================================
+# --- POLL CYCLE ---
+# ==========================================================
+def poll_games(session, source, games, previous, versions, due=None, feed_max_age=live_feed_store.CYCLE_SECONDS, in_flight=None):
+    """
+    One pass over the started games: fetch, parse and score the ones that need it,
+    carry the rest over from previous. due limits the fetches to those gamePks
+    (None fetches every game that isn't frozen). feed_max_age is how old a stored
+    feed snapshot may be and still count as current. in_flight (daemon mode) maps
+    gamePk -> a fetch that missed an earlier cycle's deadline: that game isn't
+    fetched again until it finishes, and its late result is dropped.
+    Returns (live_data_dict, new_versions, counts).
+    """
+    started_games = {str(g['gamePk']): g for g in games if has_started(g)}
+    live_data_dict, new_versions = {}, {}
+    counts = {"frozen": 0, "unchanged": 0, "parsed": 0, "waiting": 0}
+    if in_flight is not None:
+        for game_pk in [pk for pk, f in in_flight.items() if f.done()]:
+            del in_flight[game_pk]
+
+    # Final games already written as Final are copied over as is: no fetch, no scoring
+    to_fetch = {}
+    for game_pk, game in started_games.items():
+        if is_frozen(game, previous.get(game_pk)):
+            live_data_dict[game_pk] = previous[game_pk]
+            counts["frozen"] += 1
+        elif game_pk in previous and ((due is not None and game_pk not in due) or game_pk in (in_flight or {})):
+            # Not due yet, or an earlier cycle's fetch is still running (daemon mode): last cycle's output stands
+            live_data_dict[game_pk] = previous[game_pk]
+            if game_pk in versions: new_versions[game_pk] = versions[game_pk]
+            counts["waiting"] += 1
+        else:
+            to_fetch[game_pk] = game
     
-    live_data_dict = {}
+    # Fetch every remaining game's live data at once; parse + score each one as it lands
+    print(f"  > Fetching live {source} data for {len(to_fetch)} games ({LIVE_WORKERS} at a time, {counts['frozen']} frozen as Final)...")
+    poll_started = time.perf_counter()
+    pool = ThreadPoolExecutor(max_workers=LIVE_WORKERS)
+    futures = {}
+    for game_pk, game in to_fetch.items():
+        is_final = game.get('status', {}).get('abstractGameState') == 'Final'
+        fetch = fetch_game_lite if source == SOURCE_BOXSCORE and not is_final else fetch_game_feed
+        # A version only means "unchanged" when the last output was built in the same game state
+        known = versions.get(game_pk, {}) if same_state(game, previous.get(game_pk)) else {}
+        extra = {"max_age": feed_max_age} if fetch is fetch_game_feed else {}
+        futures[pool.submit(fetch, session, game_pk, known, **extra)] = game_pk
+    try:
+        for future in as_completed(futures, timeout=POLL_DEADLINE_SECONDS):
+            game_pk = futures[future]
+            game = to_fetch[game_pk]
+            try:
+                live_res, version = future.result()
+                if live_res is None:
+                    live_data_dict[game_pk] = previous[game_pk]
+                    counts["unchanged"] += 1
+                else:
+                    live_data_dict[game_pk] = build_game_obj(game, live_res)
+                    counts["parsed"] += 1
+                new_versions[game_pk] = version
+            except Exception as e:
+                print(f"  [!] Error processing {game_pk}: {e}")
+    except FuturesTimeout:
+        late = [futures[f] for f in futures if not f.done()]
+        print(f"  ⏱️ Deadline hit after {POLL_DEADLINE_SECONDS}s; {len(late)} games still loading: {', '.join(late)}")
+        if in_flight is not None:
+            in_flight.update({futures[f]: f for f in futures if not f.done()})
+    finally:
+        # Stragglers finish in the background (bounded by their request timeout); nobody reads their results
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    # A game that missed the deadline or errored keeps its last good snapshot instead of vanishing
+    carried = [pk for pk in started_games if pk not in live_data_dict and pk in previous]
+    for game_pk in carried:
+        live_data_dict[game_pk] = previous[game_pk]
+        if game_pk in versions: new_versions[game_pk] = versions[game_pk]
+    counts["carried"] = len(carried)
+    # Results land in completion order; keep the file in schedule order so diffs stay small
+    live_data_dict = {pk: live_data_dict[pk] for pk in started_games if pk in live_data_dict}
+    print(f"  > {counts['parsed']} games re-scored, {counts['unchanged']} unchanged, {counts['frozen']} frozen in "
+          f"{time.perf_counter() - poll_started:.1f}s" + (f", {counts['waiting']} not due yet" if counts['waiting'] else "")
+          + (f", {len(carried)} carried over from the last snapshot" if carried else ""))
+    return live_data_dict, new_versions, counts
+
+# ==========================================================
+# --- MAIN LIVE SCRAPER ---
+# ==========================================================
+def scrape_live_games(source=SOURCE_FEED):
+    ny_tz = zoneinfo.ZoneInfo("America/New_York")
+    date_str = sports_day_str(datetime.now(ny_tz))
+    file_path = os.path.join(DATA_DIR, f"live_mlb_{date_str}.json")
     
-    # 2. Loop through each game and fetch its live feed
-    for game in games:
-        game_pk = str(game['gamePk'])
-        abstract_state = game.get('status', {}).get('abstractGameState', 'Preview')
-        detailed_state = game.get('status', {}).get('detailedState', '')
-        
-        away_abbr = game['teams']['away']['team'].get('abbreviation', 'AWAY')
-        home_abbr = game['teams']['home']['team'].get('abbreviation', 'HOME')
-        
-        # Don't hit the live feed if it hasn't started yet and isn't delayed
-        if abstract_state == 'Preview' and 'Delayed' not in detailed_state:
+    session = new_session()
+
+    # 1. Get today's schedule to find the gamePks
+    print(f"Fetching schedule for {date_str}...")
+    games = fetch_schedule_games(session, date_str)
+    if games is None: return
+    if not games:
+        print("No games scheduled today.")
+        return
+
+    # 2. Fetch every game's live data at once
+    previous = load_previous_snapshot(file_path)
+    versions = load_versions()
+    live_data_dict, new_versions, _ = poll_games(session, source, games, previous, versions)
+
+    # 3. Save the payload (once, after every game has landed or timed out), unless it's what's already on disk
+    if save_live_file(file_path, live_data_dict, previous):
+        print(f"\n✅ Successfully saved live data for {len(live_data_dict)} games to {file_path}")
+    elif live_data_dict:
+        print(f"\n🛑 Live data unchanged for {len(live_data_dict)} games. Skipped file overwrite.")
+    if new_versions != versions:
+        save_versions(new_versions)
+    statsapi_cache.print_cache_summary()
+    live_feed_store.print_feed_summary()
+
+def _git(*args):
+    return subprocess.run(["git", *args], cwd=REPO_DIR, check=True)
+
+def publish_live_files():
+    """
+    Rebuilds the DFS pages from the live files, then commits and pushes them the way the
+    workflow's commit step does. Returns False on failure; a commit that couldn't be
+    pushed stays local and goes out with the next publish.
+    """
+    try:
+        subprocess.run([sys.executable, os.path.join(SCRIPT_DIR, "generate_dfs_directories.py")], cwd=REPO_DIR, check=True)
+        _git("add", *PUBLISH_PATHS)
+        if subprocess.run(["git", "diff", "--quiet", "--staged"], cwd=REPO_DIR).returncode != 0:
+            _git("commit", "-q", "-m", "⚡ Automated update: MLB Live Stats & DFS Pages [skip ci]")
+        subprocess.run(["git", "pull", "-q", "--rebase", "origin", "main"], cwd=REPO_DIR)
+        if subprocess.run(["git", "push", "-q", "origin", "main"], cwd=REPO_DIR).returncode != 0:
+            _git("pull", "-q", "--rebase", "origin", "main")
+            _git("push", "-q", "origin", "main")
+        return True
+    except (subprocess.CalledProcessError, OSError) as e:
+        print(f"  ⚠️ Publish failed, retrying on a later cycle: {e}")
+        return False
+
+def run_daemon(source=SOURCE_FEED, max_hours=DAEMON_MAX_HOURS, publish=None):
+    """
+    Polls the sports day adaptively from one process until its last game is Final (or
+    max_hours pass). publish(), if given, ships the written files (see PUBLISH_MIN_SECONDS).
+    """
+    ny_tz = zoneinfo.ZoneInfo("America/New_York")
+    date_str = sports_day_str(datetime.now(ny_tz))
+    file_path = os.path.join(DATA_DIR, f"live_mlb_{date_str}.json")
+    session = new_session()
+    stop_at = time.time() + max_hours * 3600
+    previous = load_previous_snapshot(file_path)
+    versions = load_versions()
+    next_poll = {}   # gamePk -> epoch its next fetch is due
+    in_flight = {}   # gamePk -> fetch still running past an earlier cycle's deadline
+    cycles, writes = 0, 0
+    unpublished, last_publish = False, 0.0
+    print(f"👁️ Live daemon for {date_str} ({source} source, stops after {max_hours:g}h at most)")
+
+    while True:
+        now = time.time()
+        if sports_day_str(datetime.now(ny_tz)) != date_str:
+            print(f"🛑 Sports day {date_str} is over. Stopping.")
+            break
+        games = fetch_schedule_games(session, date_str)
+        if games is None:
+            if now + SCHEDULE_RETRY_SECONDS >= stop_at:
+                print(f"⏱️ Schedule still failing at the {max_hours:g}h limit. Stopping.")
+                break
+            time.sleep(SCHEDULE_RETRY_SECONDS)
             continue
-            
-        print(f"  > Fetching live feed for {away_abbr} @ {home_abbr} ({game_pk})...")
-        live_url = f"https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live"
-        
+        if not games:
+            print("No games scheduled today.")
+            break
+
+        # Due: its poll time came up, or its state moved since the last write (e.g. just went Final)
+        due = {str(g['gamePk']) for g in games
+               if next_poll.get(str(g['gamePk']), 0) <= now or not same_state(g, previous.get(str(g['gamePk'])))}
+        cycles += 1
+        print(f"\n🔁 Cycle {cycles} at {datetime.now(ny_tz).strftime('%I:%M:%S %p ET')}")
+        # Polls run faster than the fetch stage's cycle, so a stored feed snapshot is never current enough to reuse
+        live_data_dict, new_versions, counts = poll_games(session, source, games, previous, versions, due=due,
+                                                          feed_max_age=0, in_flight=in_flight)
+
+        if save_live_file(file_path, live_data_dict, previous):
+            writes += 1
+            unpublished = True
+            print(f"  ✅ Saved live data for {len(live_data_dict)} games")
+        if new_versions != versions: save_versions(new_versions)
+        previous, versions = live_data_dict or previous, new_versions
+        if publish and unpublished and time.time() - last_publish >= PUBLISH_MIN_SECONDS:
+            last_publish = time.time()
+            unpublished = not publish()
+
+        if day_is_over(games, previous):
+            print(f"🏁 Every game of {date_str} is Final. Stopping.")
+            break
+
+        # Plan: polled games get their next slot from their phase; unstarted ones wake the loop near first pitch
+        planned = time.time()
+        wake = planned + PREGAME_RECHECK_SECONDS
+        for game in games:
+            game_pk = str(game['gamePk'])
+            phase = game_phase(game, previous.get(game_pk))
+            if phase == "pregame":
+                start = first_pitch_ts(game)
+                if start: wake = min(wake, max(start, planned + MIN_CYCLE_SECONDS))
+                continue
+            if game_pk in due:
+                interval = POLL_SECONDS_BY_PHASE[phase]
+                next_poll[game_pk] = planned + interval if interval else float('inf')
+            if next_poll.get(game_pk, float('inf')) != float('inf'):
+                wake = min(wake, next_poll[game_pk])
+        if wake >= stop_at:
+            print(f"⏱️ Next poll would be past the {max_hours:g}h limit. Stopping.")
+            break
+        time.sleep(max(MIN_CYCLE_SECONDS, wake - time.time()))
+
+    if publish and unpublished: publish()
+    print(f"\n👁️ Live daemon: {cycles} cycles, {writes} writes")
+    statsapi_cache.print_cache_summary()
+    live_feed_store.print_feed_summary()
+
+def daemon_hours_from_args(argv=None):
+    """--max-hours on the command line, else DAEMON_MAX_HOURS."""
+    argv = sys.argv[1:] if argv is None else argv
+    if "--max-hours" in argv and argv.index("--max-hours") + 1 < len(argv):
         try:
-            live_res = requests.get(live_url, headers=HEADERS, timeout=10).json()
-            game_data = live_res.get('gameData', {})
-            live_data = live_res.get('liveData', {})
-            
-            # --- Linescore & Game State ---
-            linescore = live_data.get('linescore', {})
-            plays = live_data.get('plays', {})
-            
-            current_inning = linescore.get('currentInningOrdinal', '')
-            inning_half = linescore.get('inningHalf', '')
-            outs = linescore.get('outs', 0)
-            
-            away_score = linescore.get('teams', {}).get('away', {}).get('runs', 0)
-            home_score = linescore.get('teams', {}).get('home', {}).get('runs', 0)
-            
-            # Base Runners
-            offense = linescore.get('offense', {})
-            bases = {
-                "1B": 'first' in offense,
-                "2B": 'second' in offense,
-                "3B": 'third' in offense
-            }
-            
-            # Current Play Text
-            current_play = plays.get('currentPlay', {}).get('result', {}).get('description', '')
-            
-            # --- Build the Live Object ---
-            game_obj = {
-                "status": abstract_state,
-                "detailed_status": detailed_state,
-                "inning": current_inning,
-                "half": inning_half,
-                "outs": outs,
-                "away_score": away_score,
-                "home_score": home_score,
-                "bases": bases,
-                "current_play": current_play,
-                "players": {}
-            }
-            
-            # --- Parse Boxscore for DFS Points ---
-            boxscore = live_data.get('boxscore', {}).get('teams', {})
-            
-            for team_side, abbr in [('away', away_abbr), ('home', home_abbr)]:
-                game_obj["players"][abbr] = {}
-                team_players = boxscore.get(team_side, {}).get('players', {})
-                
-                for pid, p_data in team_players.items():
-                    name = p_data.get('person', {}).get('fullName', 'Unknown')
-                    b_stats = p_data.get('stats', {}).get('batting', {})
-                    p_stats = p_data.get('stats', {}).get('pitching', {})
-                    
-                    # Check if they actually played
-                    if b_stats.get('plateAppearances', 0) > 0 or p_stats.get('battersFaced', 0) > 0:
-                        hit_dk, hit_fd = calc_hitter_dfs(b_stats)
-                        pitch_dk, pitch_fd = calc_pitcher_dfs(p_stats)
-                        
-                        # Add them together (Pitchers get hitting points too if they hit!)
-                        total_dk = hit_dk + pitch_dk
-                        total_fd = hit_fd + pitch_fd
-                        
-                        game_obj["players"][abbr][pid] = {
-                            "name": name,
-                            "dk_pts": total_dk,
-                            "fd_pts": total_fd,
-                            "batting": b_stats if b_stats.get('plateAppearances', 0) > 0 else None,
-                            "pitching": p_stats if p_stats.get('battersFaced', 0) > 0 else None
-                        }
-            
-            live_data_dict[game_pk] = game_obj
-            
-        except Exception as e:
-            print(f"  [!] Error processing {game_pk}: {e}")
-
-    # 3. Save the payload
-    if live_data_dict:
-        file_path = os.path.join(DATA_DIR, f"live_mlb_{date_str}.json")
-        with open(file_path, 'w') as f:
-            json.dump(live_data_dict, f, indent=2)
-        print(f"\n✅ Successfully saved live data for {len(live_data_dict)} games to {file_path}")
+            return float(argv[argv.index("--max-hours") + 1])
+        except ValueError:
+            pass
+    return DAEMON_MAX_HOURS
 
 if __name__ == "__main__":
-    scrape_live_games()
+    try:
+        if "--daemon" in sys.argv[1:]:
+            run_daemon(live_source_from_args(), daemon_hours_from_args(),
+                       publish=publish_live_files if "--publish" in sys.argv[1:] else None)
+        else:
+            scrape_live_games(live_source_from_args())
+    finally:
+        live_feed_store.prune_old_feeds()
+        statsapi_cache.close()
@@ -0,0 +1,91 @@
+import os
+import json
+import threading
+from datetime import datetime
+
+# ==========================================================
+# --- FROZEN PRIOR-SEASON SPLIT LEDGER ---
+# ==========================================================
+# Last season's platoon splits can never change, so each (player, hand, group)
+# is requested from statsapi exactly once and then read from this file. The
+# 2-year rolling totals in fetch_matchups.py and build_player_master_data.py
+# only need the live current-season request on top of it.
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+LEDGER_FILE = os.path.join(SCRIPT_DIR, '..', 'data', 'prior_season_splits.json')
+
+# Raw counting stats kept per split; enough for both AVG/OPS builders
+LEDGER_STAT_KEYS = [
+    'atBats', 'battersFaced', 'hits', 'doubles', 'triples', 'homeRuns',
+    'baseOnBalls', 'hitByPitch', 'sacFlies', 'strikeOuts'
+]
+
+_LEDGER_LOCK = threading.Lock()
+_LEDGER = None
+_DIRTY = False
+
+def prior_season():
+    return datetime.utcnow().year - 1
+
+def ledger_key(person_id, hand_code, group_type):
+    return f"{person_id}_{hand_code}_{group_type}"
+
+def split_url(person_id, hand_code, group_type, season):
+    return f"https://statsapi.mlb.com/api/v1/people/{person_id}/stats?stats=statSplits&sitCodes={hand_code}&group={group_type}&gameType=R&season={season}"
+
+def _load():
+    global _LEDGER
+    if _LEDGER is None:
+        ledger = {}
+        if os.path.exists(LEDGER_FILE):
+            try:
+                with open(LEDGER_FILE, 'r') as f:
+                    ledger = json.load(f) or {}
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"⚠️ Warning: Split ledger unreadable, rebuilding. Error: {e}")
+                ledger = {}
+        # New year = the old "prior season" is now two seasons back; start over
+        if ledger.get('season') != prior_season():
+            ledger = {'season': prior_season(), 'splits': {}}
+        _LEDGER = ledger
+    return _LEDGER
+
+def get_prior_season_split(person_id, hand_code, group_type, loader):
+    """
+    Returns last season's raw split counting stats for a player ({} when they
+    have no split). loader(url) is only called the first time a key is seen.
+    """
+    global _DIRTY
+    key = ledger_key(person_id, hand_code, group_type)
+    with _LEDGER_LOCK:
+        cached = _load()['splits'].get(key)
+    if cached is not None:
+        return cached
+
+    season = prior_season()
+    res = loader(split_url(person_id, hand_code, group_type, season))
+    # Error payloads have no 'stats' list; leave the key empty so the next run retries
+    if not isinstance(res, dict) or 'stats' not in res:
+        return {}
+
+    splits = (res.get('stats') or [{}])[0].get('splits', [])
+    stat = splits[0].get('stat', {}) if splits else {}
+    entry = {k: stat[k] for k in LEDGER_STAT_KEYS if k in stat}
+
+    with _LEDGER_LOCK:
+        ledger = _load()
+        if ledger['season'] == season:
+            ledger['splits'][key] = entry
+            _DIRTY = True
+    return entry
+
+def save_ledger():
+    """Writes the ledger back to disk if any new splits were frozen this run."""
+    global _DIRTY
+    with _LEDGER_LOCK:
+        if not _DIRTY or _LEDGER is None: return
+        tmp_path = LEDGER_FILE + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(_LEDGER, f, indent=4, sort_keys=True)
+        os.replace(tmp_path, LEDGER_FILE)
+        _DIRTY = False
+        print(f"🧊 Prior-season split ledger saved ({len(_LEDGER['splits'])} frozen splits).")
@@ -0,0 +1,200 @@
+import os
+import json
+import re
+import sqlite3
+import threading
+import time
+import zoneinfo
+from datetime import datetime, timedelta
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+# ==========================================================
+# --- PERSISTENT STATSAPI RESPONSE CACHE ---
+# ==========================================================
+# Shared by fetch_matchups.py, build_player_master_data.py and scrape_mlb_live.py.
+# Responses are stored in SQLite keyed by a normalized URL, with a TTL chosen from
+# the endpoint and season in the URL. The workflows persist the file between runs
+# with actions/cache, so it is never committed.
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(SCRIPT_DIR, '..', 'data', 'cache')
+CACHE_FILE = os.path.join(CACHE_DIR, 'statsapi_cache.sqlite3')
+
+MAX_CACHE_BYTES = 64 * 1024 * 1024   # Evict least-recently-used entries past 64 MB
+EVICTION_CHECK_EVERY = 200           # Size check cadence (in stores)
+# LRU recency only needs day resolution. Touching last_access on every hit would
+# rewrite the file each run, and the workflows save the cache whenever its hash moves.
+LAST_ACCESS_RESOLUTION_SECONDS = 86400
+NIGHTLY_ROLLOVER_HOUR = 3            # Current-season numbers expire at 3 AM ET
+
+LIVE_FEED_TTL = 30
+PEOPLE_TTL = 7 * 86400
+ROSTER_TTL = 6 * 3600
+
+# Query params that only exist to bust CDN caches and never change the payload
+IGNORED_PARAMS = {'v', '_', 'cb', 't'}
+
+CACHE_STATS = {"hits": 0, "misses": 0, "stores": 0, "expired": 0, "evictions": 0, "bypassed": 0}
+
+_CACHE_LOCK = threading.Lock()
+_CONNECTION = None
+_STORES_SINCE_CHECK = 0
+
+# ==========================================================
+# --- KEYS & TTL RULES ---
+# ==========================================================
+def normalize_url(url):
+    """Lowercases the host, drops cache-busters and sorts the query so equivalent URLs share a key."""
+    parsed = urlparse(url)
+    params = sorted((k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True) if k not in IGNORED_PARAMS)
+    return f"{parsed.netloc.lower()}{parsed.path.rstrip('/')}?{urlencode(params)}"
+
+def seconds_until_rollover(now=None):
+    est_tz = zoneinfo.ZoneInfo("America/New_York")
+    now = now or datetime.now(est_tz)
+    rollover = now.replace(hour=NIGHTLY_ROLLOVER_HOUR, minute=0, second=0, microsecond=0)
+    if rollover <= now:
+        rollover += timedelta(days=1)
+    return int((rollover - now).total_seconds())
+
+def ttl_for_url(url):
+    """
+    Returns how long a response may be reused:
+    None = never expires, 0 = do not cache, otherwise seconds.
+    """
+    parsed = urlparse(url)
+    path = parsed.path
+    query = dict(parse_qsl(parsed.query))
+
+    if '/feed/live' in path:
+        return LIVE_FEED_TTL
+
+    if re.search(r'/people/\d+/stats', path):
+        season = query.get('season', '')
+        if season.isdigit() and int(season) < datetime.utcnow().year:
+            return None   # Completed seasons are frozen forever
+        return seconds_until_rollover()   # Current season & career BvP move once per night
+
+    if path.rstrip('/').endswith('/people') and 'personIds' in query:
+        return PEOPLE_TTL
+
+    if '/roster' in path:
+        return ROSTER_TTL
+
+    if path.rstrip('/').endswith('/teams'):
+        return seconds_until_rollover()
+
+    return 0
+
+# ==========================================================
+# --- STORAGE ---
+# ==========================================================
+def _connect():
+    global _CONNECTION
+    if _CONNECTION is None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _CONNECTION = sqlite3.connect(CACHE_FILE, check_same_thread=False, isolation_level=None)
+        _CONNECTION.execute("PRAGMA journal_mode=WAL")
+        _CONNECTION.execute("PRAGMA synchronous=NORMAL")
+        _CONNECTION.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL,
+                last_access REAL NOT NULL
+            )
+        """)
+        _CONNECTION.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)")
+        # Clear anything that went stale while the file sat in the Actions cache
+        _CONNECTION.execute("DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),))
+    return _CONNECTION
+
+def _evict_to_limit(conn):
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+    if total <= MAX_CACHE_BYTES: return
+
+    target = int(MAX_CACHE_BYTES * 0.9)
+    freed, victims = 0, []
+    for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC"):
+        victims.append((key,))
+        freed += size
+        if total - freed <= target: break
+    conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+    CACHE_STATS["evictions"] += len(victims)
+
+def lookup(url):
+    """Returns the cached JSON payload for a URL, or None on a miss/expiry."""
+    key = normalize_url(url)
+    now = time.time()
+    with _CACHE_LOCK:
+        conn = _connect()
+        row = conn.execute("SELECT body, expires_at, last_access FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            CACHE_STATS["misses"] += 1
+            return None
+        body, expires_at, last_access = row
+        if expires_at is not None and expires_at < now:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            CACHE_STATS["expired"] += 1
+            CACHE_STATS["misses"] += 1
+            return None
+        if now - last_access >= LAST_ACCESS_RESOLUTION_SECONDS:
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        CACHE_STATS["hits"] += 1
+    return json.loads(body)
+
+def store(url, payload, ttl):
+    global _STORES_SINCE_CHECK
+    key = normalize_url(url)
+    body = json.dumps(payload, separators=(',', ':'))
+    now = time.time()
+    expires_at = None if ttl is None else now + ttl
+    with _CACHE_LOCK:
+        conn = _connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, body, size, stored_at, expires_at, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, body, len(body), now, expires_at, now)
+        )
+        CACHE_STATS["stores"] += 1
+        _STORES_SINCE_CHECK += 1
+        if _STORES_SINCE_CHECK >= EVICTION_CHECK_EVERY:
+            _STORES_SINCE_CHECK = 0
+            _evict_to_limit(conn)
+
+# ==========================================================
+# --- PUBLIC API ---
+# ==========================================================
+def get_json(url, loader):
+    """
+    Serves a statsapi URL from the on-disk cache, calling loader() (which must
+    return the parsed JSON) only on a miss. Uncacheable URLs always hit the network.
+    """
+    ttl = ttl_for_url(url)
+    if ttl == 0:
+        CACHE_STATS["bypassed"] += 1
+        return loader()
+
+    cached = lookup(url)
+    if cached is not None:
+        return cached
+
+    payload = loader()
+    # Never persist error bodies (e.g. {"messageNumber": ..., "message": ...})
+    if isinstance(payload, dict) and 'messageNumber' not in payload:
+        store(url, payload, ttl)
+    return payload
+
+def close():
+    global _CONNECTION
+    with _CACHE_LOCK:
+        if _CONNECTION is not None:
+            _evict_to_limit(_CONNECTION)
+            _CONNECTION.close()
+            _CONNECTION = None
+
+def print_cache_summary():
+    lookups = CACHE_STATS["hits"] + CACHE_STATS["misses"]
+    hit_rate = (CACHE_STATS["hits"] / lookups * 100) if lookups else 0.0
+    print(f"🗄️  Response Cache: {CACHE_STATS['hits']} hits / {CACHE_STATS['misses']} misses ({hit_rate:.0f}% hit rate), "
+          f"{CACHE_STATS['stores']} stored, {CACHE_STATS['expired']} expired, {CACHE_STATS['evictions']} evicted")
@@ -0,0 +1,166 @@
+import time
+import random
+import threading
+import requests
+
+# ==========================================================
+# --- RESILIENT STATSAPI CLIENT LAYER ---
+# ==========================================================
+# Every statsapi request fetch_matchups.py makes goes through request(), keyed
+# by endpoint (splits, season_stats, bvp, people, live_feed, ...). Each endpoint
+# gets three things:
+#   - A timeout sized from its own recent latency instead of a flat 10 s.
+#   - A few retries with jittered exponential backoff for timeouts, dropped
+#     connections and other transport errors, 429s and 5xx errors.
+#   - A circuit breaker. After BREAKER_FAILURE_THRESHOLD failed requests in a
+#     row the endpoint is "open": calls fail instantly with EndpointUnavailable
+#     until BREAKER_COOLDOWN_SECONDS pass. Then one probe is let through, and a
+#     success closes the breaker again.
+# A sick endpoint therefore costs a handful of timeouts per run, not hundreds.
+# The callers fall back to the cached data they already hold.
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_COOLDOWN_SECONDS = 60
+
+MIN_TIMEOUT_SECONDS = 2.0
+TIMEOUT_LATENCY_MULTIPLIER = 4      # Timeout = 4x the endpoint's recent p95, clamped to [min, caller's max]
+LATENCY_WINDOW = 50                 # Successful calls remembered per endpoint
+LATENCY_WARMUP = 5                  # Use the caller's timeout until this many samples exist
+
+MAX_RETRIES = 2
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_CAP_SECONDS = 4.0
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class EndpointUnavailable(Exception):
+    """The endpoint's breaker is open, or every attempt failed."""
+    pass
+
+class _RetryableStatus(Exception):
+    pass
+
+class CircuitBreaker:
+    def __init__(self, threshold=BREAKER_FAILURE_THRESHOLD, cooldown=BREAKER_COOLDOWN_SECONDS):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None: return "closed"
+        return "half-open" if time.monotonic() - self.opened_at >= self.cooldown else "open"
+
+    def allow(self):
+        """True when a request may go out. Only one probe at a time while half-open."""
+        with self._lock:
+            if self.opened_at is None: return True
+            if time.monotonic() - self.opened_at < self.cooldown or self.probing: return False
+            self.probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def release_probe(self):
+        """The probe ended without a verdict (the caller raised something else): let the next one through."""
+        with self._lock:
+            self.probing = False
+
+    def record_failure(self):
+        """Returns True when this failure tripped (or re-tripped) the breaker."""
+        with self._lock:
+            self.failures += 1
+            was_probe, self.probing = self.probing, False
+            if was_probe or (self.opened_at is None and self.failures >= self.threshold):
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+class Endpoint:
+    def __init__(self, name):
+        self.name = name
+        self.breaker = CircuitBreaker()
+        self.latencies = []
+        self.stats = {"calls": 0, "failures": 0, "retries": 0, "short_circuited": 0, "trips": 0}
+        self._lock = threading.Lock()
+
+    def timeout(self, max_timeout):
+        with self._lock:
+            samples = sorted(self.latencies)
+        if len(samples) < LATENCY_WARMUP: return max_timeout
+        p95 = samples[min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))]
+        return max(MIN_TIMEOUT_SECONDS, min(max_timeout, p95 * TIMEOUT_LATENCY_MULTIPLIER))
+
+    def record_latency(self, seconds):
+        with self._lock:
+            self.latencies.append(seconds)
+            if len(self.latencies) > LATENCY_WINDOW: self.latencies.pop(0)
+
+    def count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+_ENDPOINTS = {}
+_ENDPOINTS_LOCK = threading.Lock()
+
+def endpoint(name):
+    with _ENDPOINTS_LOCK:
+        return _ENDPOINTS.setdefault(name, Endpoint(name))
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2^attempt)]."""
+    return random.uniform(0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)))
+
+def request(name, send, max_timeout=10, retries=MAX_RETRIES, wait=None):
+    """
+    Sends one logical request to an endpoint. send(timeout) performs a single
+    attempt and returns a requests.Response. wait(), if given, runs before each
+    attempt's clock starts (a host rate limiter), so time spent queued never
+    feeds the endpoint's latency window. Returns the response (4xx included,
+    since statsapi answers "no data" that way too). Raises EndpointUnavailable
+    when the breaker is open or every attempt failed.
+    """
+    ep = endpoint(name)
+    last_error = None
+    for attempt in range(retries + 1):
+        if not ep.breaker.allow():
+            ep.count("short_circuited")
+            raise EndpointUnavailable(f"{name}: circuit open" + (f" after {last_error}" if last_error else ""))
+        ep.count("calls" if attempt == 0 else "retries")
+        try:
+            if wait is not None: wait()
+            started = time.monotonic()
+            res = send(ep.timeout(max_timeout))
+            if res.status_code in RETRY_STATUS_CODES:
+                raise _RetryableStatus(f"HTTP {res.status_code}")
+        except (requests.exceptions.RequestException, _RetryableStatus) as e:
+            last_error = e
+            ep.count("failures")
+            if ep.breaker.record_failure():
+                ep.count("trips")
+                print(f"   🔌 Circuit OPEN for {name} ({e}); failing fast for {BREAKER_COOLDOWN_SECONDS}s.")
+            if attempt < retries:
+                time.sleep(backoff_delay(attempt))
+            continue
+        except BaseException:
+            # Not a transport failure, so no verdict on the endpoint; a held probe slot would keep it open all run
+            ep.breaker.release_probe()
+            raise
+        ep.record_latency(time.monotonic() - started)
+        ep.breaker.record_success()
+        return res
+    raise EndpointUnavailable(f"{name}: {last_error}")
+
+def print_client_summary():
+    if not _ENDPOINTS: return
+    parts = []
+    for name, ep in sorted(_ENDPOINTS.items()):
+        s = ep.stats
+        if not (s["failures"] or s["short_circuited"] or s["retries"]): continue
+        parts.append(f"{name} {s['failures']} failed / {s['retries']} retried / {s['short_circuited']} short-circuited ({ep.breaker.state})")
+    print(f"🔌 Endpoint Health: {'; '.join(parts) if parts else 'all healthy'}")
@@ -3,8 +3,12 @@ import pandas as pd
 import requests
 import json
 import os
+import sys
 from datetime import datetime, timedelta
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+import live_feed_store
+
 # Enable caching to prevent re-fetching the same data on retries
 pyb.cache.enable()
 
@@ -60,8 +64,12 @@ def build_umpire_json():
     print(f"Mapping {len(game_data)} games to umpires...")
     for game_pk in game_data['game_pk'].unique():
         try:
-            url = f"https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live"
-            res = requests.get(url, timeout=10).json()
+            # Recent games are usually already in the shared live feed store. Only a Final
+            # snapshot has the game's real run total; anything earlier is fetched in full.
+            res = live_feed_store.read_feed(game_pk)
+            if not live_feed_store.is_final(res):
+                url = f"https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live"
+                res = requests.get(url, timeout=10).json()
             
             officials = res.get('liveData', {}).get('boxscore', {}).get('officials', [])
             hp_umpire = next((o['official']['fullName'] for o in officials if o['officialType'] == 'Home Plate'), None)